@@ -3,32 +3,29 @@
 AdaLove CLI - Interface Interativa Navegável para Extração e Consulta de Cards
 """
 
+from __future__ import annotations
+
 import sys
-import asyncio
-import json
 import logging
 import re
-import questionary
 from datetime import datetime, timedelta
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich import print as rprint
+from typing import TYPE_CHECKING
 
 # Add src directory to path for package imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from adalove_extractor.api import AdaLoveAPIClient
+# Imports leves apenas. questionary, rich, icalendar, o cliente HTTP (e com ele
+# o Playwright), a IA, o pydantic e o próprio asyncio são importados dentro das
+# funções que os usam, para que cada subcomando pague só o que precisa —
+# `--list` local não importa nenhum deles. Meça com: python -X importtime adalove_cli.py --list
 from adalove_extractor.api.endpoints import Endpoints
 from adalove_extractor.api.exceptions import AuthenticationError
-from adalove_extractor.config.settings import Settings
-from adalove_extractor.extractors.turma_completa import extrair_turma_completa
+from adalove_extractor.cli.console import console, menu_style, rprint
 from adalove_extractor.cli.icons import icons
-from adalove_extractor.io.calendar import ICalendarExport
-from adalove_extractor.ai.context_builder import ContextBuilder
-from adalove_extractor.ai.system_prompt import SystemPromptLoader
-from adalove_extractor.ai.answer_generator import AnswerGenerator, ClaudeNotFoundError
+
+if TYPE_CHECKING:
+    from adalove_extractor.api import AdaLoveAPIClient
 
 # Configure basic logging to file only to not mess up TUI
 # No Windows o console e os arquivos usam a codepage local (cp1252 em pt-BR).
@@ -55,23 +52,9 @@ logging.basicConfig(
     force=True
 )
 
-console = Console()
-
 OUTPUT_DIR = Path(__file__).parent / "output" / "api_extraction"
 RASCUNHOS_SUBDIR = "rascunhos"
 
-# Estilo global para menus questionary
-MENU_STYLE = questionary.Style([
-    ('qmark', 'fg:#E91E63 bold'),
-    ('question', 'fg:#673AB7 bold'),
-    ('answer', 'fg:#2196f3 bold'),
-    ('pointer', 'fg:#E91E63 bold'),
-    ('highlighted', 'fg:#E91E63 bold'),
-    ('selected', 'fg:#2196f3'),
-    ('separator', 'fg:#6C6C6C'),
-    ('instruction', 'fg:#6C6C6C'),
-])
-
 
 # ═══════════════════════════════════════════════════════════════
 # Utilidades
@@ -79,6 +62,9 @@ MENU_STYLE = questionary.Style([
 
 def show_banner():
     """Exibe o banner inicial."""
+    from rich.panel import Panel
+    from rich.text import Text
+
     title = Text(f"{icons.rocket}{icons.robot} ADALOVE EXTRACTOR by 0xftb", style="bold magenta")
     subtitle = Text("Ferramenta CLI para extração de cards e materiais", style="cyan")
     panel = Panel(
@@ -105,9 +91,49 @@ def _turma_dir(turma_nome: str) -> Path:
     return OUTPUT_DIR / _turma_slug(turma_nome)
 
 
+_manifesto_cache = None
+
+
+def _manifesto():
+    """Manifesto de output/ (instância única; a leitura é memorizada por mtime)."""
+    global _manifesto_cache
+    if _manifesto_cache is None:
+        from adalove_extractor.io.manifest import ExtractionManifest
+
+        _manifesto_cache = ExtractionManifest(OUTPUT_DIR)
+    return _manifesto_cache
+
+
+_outbox_cache = None
+
+
+def _outbox():
+    """Outbox de submissões (instância única: worker e envio imediato não se sobrepõem)."""
+    global _outbox_cache
+    if _outbox_cache is None:
+        from adalove_extractor.api.outbox import OUTBOX_FILENAME, SubmissionOutbox
+
+        _outbox_cache = SubmissionOutbox(OUTPUT_DIR / OUTBOX_FILENAME, ao_enviar=_marcar_respondida)
+    return _outbox_cache
+
+
+def _marcar_respondida(entrada: dict) -> None:
+    """Após um envio confirmado, marca a ponderada como respondida no ponderadas.json local."""
+    from adalove_extractor.io.ponderadas import atualizar_avaliacoes
+
+    turma = entrada.get("turma")
+    if not turma:
+        return
+    for pond in carregar_ponderadas_turma(turma) or []:
+        if pond.get("student_activity_uuid") == entrada["uuid"]:
+            avaliacao = {**pond.get("avaliacao", {}), "resposta": entrada["resposta"], "respondida": True}
+            atualizar_avaliacoes(_turma_dir(turma), {entrada["uuid"]: avaliacao})
+            return
+
+
 def is_turma_extraida(turma_nome: str) -> bool:
-    """Verifica se uma turma já foi extraída."""
-    return (_turma_dir(turma_nome) / "extracao_completa.json").exists()
+    """Verifica se uma turma já foi extraída (consulta só o manifesto)."""
+    return _turma_slug(turma_nome) in _manifesto()
 
 
 def limpar_html(html: str) -> str:
@@ -143,32 +169,6 @@ def truncar_texto(texto: str, max_lines: int = 3, max_chars_per_line: int = 80)
     return '\n'.join(result)
 
 
-def calcular_prazo_ponderada(data_encontro: str) -> datetime | None:
-    """
-    Calcula o prazo de entrega de uma ponderada.
-    Regra: sexta-feira 23:59 da mesma semana do encontro.
-    
-    Args:
-        data_encontro: Data do encontro no formato 'YYYY-MM-DD'
-    
-    Returns:
-        datetime do prazo ou None se data inválida
-    """
-    if not data_encontro or data_encontro == "sem data":
-        return None
-    try:
-        dt = datetime.strptime(data_encontro, "%Y-%m-%d")
-        # weekday(): 0=segunda, 4=sexta
-        dias_ate_sexta = 4 - dt.weekday()
-        if dias_ate_sexta < 0:
-            # Encontro é sábado/domingo → sexta da PRÓXIMA semana
-            dias_ate_sexta += 7
-        sexta = dt + timedelta(days=dias_ate_sexta)
-        return sexta.replace(hour=23, minute=59, second=59)
-    except ValueError:
-        return None
-
-
 def status_prazo(data_encontro: str, respondida: bool) -> tuple[str, str]:
     """
     Determina o status de prazo de uma ponderada.
@@ -176,6 +176,8 @@ def status_prazo(data_encontro: str, respondida: bool) -> tuple[str, str]:
     Returns:
         Tupla (icone, label) com o status
     """
+    from adalove_extractor.io.ponderadas import calcular_prazo_ponderada
+
     if respondida:
         return icons.success, "Entregue"
     
@@ -199,169 +201,99 @@ def status_prazo(data_encontro: str, respondida: bool) -> tuple[str, str]:
         return icons.status_ok, f"Prazo: {prazo.strftime('%d/%m')} ({diferenca.days}d)"
 
 
+_extracoes_cache = None
+
+
+def _extracoes():
+    """Cache de extrações da sessão (LRU validado por mtime e tamanho)."""
+    global _extracoes_cache
+    if _extracoes_cache is None:
+        from adalove_extractor.io.extraction_cache import ExtractionCache
+
+        _extracoes_cache = ExtractionCache()
+    return _extracoes_cache
+
+
+def _extracao_sharded(turma_nome: str):
+    """Extração da turma como shards semanais + visão consolidada (via cache da sessão)."""
+    from adalove_extractor.io.uuid_index import ShardedExtraction
+
+    return ShardedExtraction(_turma_dir(turma_nome), cache=_extracoes())
+
+
 def carregar_extracao(turma_nome: str) -> dict | None:
-    """Carrega o JSON de extração de uma turma."""
-    filepath = _turma_dir(turma_nome) / "extracao_completa.json"
-    if not filepath.exists():
-        return None
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """
+    Carrega o JSON de extração de uma turma (re-parseia só se o arquivo mudou).
+    Semanas atualizadas parcialmente desde a última leitura são consolidadas aqui.
+    """
+    extracao = _extracao_sharded(turma_nome)
+    consolidou = bool(extracao.pendentes())
+    data = extracao.carregar()
+    if consolidou and data is not None:
+        _manifesto().marcar(_turma_slug(turma_nome), arquivo_bytes=extracao.extracao_path.stat().st_size)
+    return data
 
 
-def extrair_ponderadas(data: dict) -> list[dict]:
+def carregar_ponderadas_turma(turma_nome: str) -> list[dict] | None:
     """
-    Extrai todas as atividades ponderadas do JSON de extração,
-    organizadas por semana com informações do encontro ancorado.
+    Lista de ponderadas da turma, lida de ponderadas.json (gravado na extração).
+    Extrações anteriores ao índice o geram aqui, uma vez, a partir da árvore.
     """
-    ponderadas = []
+    from adalove_extractor.io.ponderadas import carregar_ponderadas, salvar_ponderadas
 
-    for semana_key, semana_data in data.get("semanas", {}).items():
-        if not isinstance(semana_data, dict):
+    ponderadas = carregar_ponderadas(_turma_dir(turma_nome))
+    if ponderadas is not None:
+        return ponderadas
+
+    data = carregar_extracao(turma_nome)
+    if not data:
+        return None
+    return salvar_ponderadas(_turma_dir(turma_nome), data)
+
+
+def _status_ponderadas_recente(turma_nome: str, ttl_minutes: int) -> bool:
+    """True se o status das ponderadas foi verificado (ou extraído) há menos de `ttl_minutes`."""
+    entry = _manifesto().get(_turma_slug(turma_nome)) or {}
+    marcas = [entry.get("status_verificado_em"), entry.get("extracao_timestamp")]
+    limite = datetime.now() - timedelta(minutes=ttl_minutes)
+    for marca in marcas:
+        try:
+            if marca and datetime.fromisoformat(marca) > limite:
+                return True
+        except ValueError:
             continue
+    return False
+
 
-        encontros = semana_data.get("encontros", {})
-        for data_encontro, encontro in encontros.items():
-            # Ponderadas do próprio encontro
-            if encontro.get("is_ponderada") and "avaliacao" in encontro:
-                ponderadas.append({
-                    "semana": semana_key,
-                    "data_encontro": data_encontro,
-                    "encontro_titulo": encontro.get("titulo", ""),
-                    "titulo": encontro.get("titulo", ""),
-                    "professor": encontro.get("professor", ""),
-                    "descricao": "",
-                    "avaliacao": encontro.get("avaliacao", {}),
-                    "tipo": "encontro",
-                    "student_activity_uuid": encontro.get("student_activity_uuid"),
-                })
-
-            # Ponderadas dos autoestudos ancorados neste encontro
-            for auto_titulo, auto_data in encontro.get("autoestudos", {}).items():
-                if auto_data.get("is_ponderada") and "avaliacao" in auto_data:
-                    ponderadas.append({
-                        "semana": semana_key,
-                        "data_encontro": data_encontro,
-                        "encontro_titulo": encontro.get("titulo", ""),
-                        "titulo": auto_titulo,
-                        "professor": auto_data.get("professor", ""),
-                        "descricao": auto_data.get("descricao", ""),
-                        "avaliacao": auto_data.get("avaliacao", {}),
-                        "tipo": "autoestudo",
-                        "student_activity_uuid": auto_data.get("student_activity_uuid"),
-                    })
-
-        # Ponderadas sem âncora
-        for card in semana_data.get("sem_ancora", []):
-            if card.get("is_ponderada") and "avaliacao" in card:
-                ponderadas.append({
-                    "semana": semana_key,
-                    "data_encontro": "sem data",
-                    "encontro_titulo": "(sem âncora)",
-                    "titulo": card.get("titulo", ""),
-                    "professor": card.get("professor", ""),
-                    "descricao": card.get("descricao", ""),
-                    "avaliacao": card.get("avaliacao", {}),
-                    "tipo": "sem_ancora",
-                    "student_activity_uuid": card.get("student_activity_uuid"),
-                })
-
-    return ponderadas
-
-
-async def atualizar_status_ponderadas(client: AdaLoveAPIClient, turma_nome: str, turma_uuid: str) -> bool:
+async def atualizar_status_ponderadas(client: AdaLoveAPIClient, turma_nome: str, turma_uuid: str) -> int | None:
     """
     Atualiza status das ponderadas (resposta, avaliação) sem refazer extração completa.
-    Busca apenas userdata e atualiza os campos de avaliação no JSON existente.
+    Busca apenas userdata e, pelo índice de UUIDs, regrava só os arquivos das
+    semanas cujas avaliações mudaram e as entradas de ponderadas.json;
+    extracao_completa.json é consolidado na próxima leitura (`carregar_extracao`).
     
     Returns:
-        True se atualização bem-sucedida, False caso contrário
+        Número de ponderadas alteradas (0 = nada mudou), ou None se falhou
     """
-    filepath = _turma_dir(turma_nome) / "extracao_completa.json"
-    if not filepath.exists():
-        return False
+    if not (_turma_dir(turma_nome) / "extracao_completa.json").exists():
+        return None
     
     try:
+        from adalove_extractor.extractors.turma_completa import aplicar_status_ponderadas
+
         # Buscar userdata atual
-        from adalove_extractor.api.endpoints import Endpoints
         userdata = await client.get(Endpoints.section_userdata(turma_uuid))
-        activities = userdata.get("activities", [])
-        
-        # Mapear por studentActivityUuid
-        activity_map = {}
-        for act in activities:
-            uuid = act.get("studentActivityUuid")
-            if uuid:
-                activity_map[uuid] = act
-        
-        # Carregar JSON existente
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Função helper para atualizar avaliacao de um card
-        def atualizar_avaliacao(card_or_autoestudo: dict):
-            uuid = card_or_autoestudo.get("student_activity_uuid")
-            if not uuid or uuid not in activity_map:
-                return
-            
-            act = activity_map[uuid]
-            if not card_or_autoestudo.get("is_ponderada"):
-                return
-            
-            # Atualizar campos de avaliação
-            study_question = act.get("studyQuestion", "") or ""
-            study_answer = act.get("studyAnswer", "") or ""
-            grade_result_raw = act.get("gradeResult", "-1.0")
-            
-            try:
-                grade_result = float(grade_result_raw)
-            except (ValueError, TypeError):
-                grade_result = -1.0
-            
-            from adalove_extractor.utils.text import decode_html_entities
-            
-            card_or_autoestudo["avaliacao"] = {
-                "peso": act.get("gradeWeight", 0) or 0,
-                "pergunta": decode_html_entities(study_question),
-                "resposta": decode_html_entities(study_answer) if study_answer else None,
-                "respondida": bool(study_answer.strip()),
-                "nota": grade_result if grade_result >= 0 else None,
-                "avaliada": act.get("evaluated", 0) == 1,
-                "bloqueada": act.get("blocked", 0) == 1,
-            }
-        
-        # Percorrer estrutura e atualizar
-        updated_count = 0
-        for semana_key, semana_data in data.get("semanas", {}).items():
-            if not isinstance(semana_data, dict):
-                continue
-            
-            for data_key, encontro in semana_data.get("encontros", {}).items():
-                # Encontros ponderados
-                if encontro.get("is_ponderada"):
-                    atualizar_avaliacao(encontro)
-                    updated_count += 1
-                
-                # Autoestudos
-                for auto_titulo, auto_data in encontro.get("autoestudos", {}).items():
-                    if auto_data.get("is_ponderada"):
-                        atualizar_avaliacao(auto_data)
-                        updated_count += 1
-            
-            # Sem âncora
-            for card in semana_data.get("sem_ancora", []):
-                if card.get("is_ponderada"):
-                    atualizar_avaliacao(card)
-                    updated_count += 1
+        updated_count = aplicar_status_ponderadas(
+            _turma_dir(turma_nome), userdata.get("activities", []), cache=_extracoes(),
+        )
         
-        # Salvar JSON atualizado
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _manifesto().marcar(_turma_slug(turma_nome), status_verificado_em=datetime.now().isoformat())
         
-        return True
+        return updated_count
         
     except Exception as e:
         logging.error(f"Erro ao atualizar status ponderadas: {e}")
-        return False
+        return None
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -373,6 +305,8 @@ async def menu_principal(client: AdaLoveAPIClient, sections_list: list):
     Menu principal: lista de turmas com status de extração.
     Loop até o usuário sair.
     """
+    import questionary
+
     while True:
         # Ordena por nome (descendente = mais recente primeiro)
         sorted_sections = sorted(
@@ -381,10 +315,11 @@ async def menu_principal(client: AdaLoveAPIClient, sections_list: list):
             reverse=True
         )
 
+        extraidas = _manifesto().turmas()
         choices = []
         for section in sorted_sections:
             name = section.get('caption', section.get('name', 'N/A'))
-            extraida = is_turma_extraida(name)
+            extraida = _turma_slug(name) in extraidas
             icon = icons.check if extraida else icons.folder
             choices.append(questionary.Choice(
                 title=f"{icon} {name}",
@@ -397,7 +332,7 @@ async def menu_principal(client: AdaLoveAPIClient, sections_list: list):
         selected = await questionary.select(
             "Selecione uma turma:",
             choices=choices,
-            style=MENU_STYLE,
+            style=menu_style(),
             instruction="(Use ↑↓ para navegar, Enter para selecionar)"
         ).ask_async()
 
@@ -419,6 +354,8 @@ async def menu_turma(client: AdaLoveAPIClient, turma_nome: str, turma_uuid: str)
     """
     Sub-menu de uma turma: opções de ação.
     """
+    import questionary
+
     while True:
         extraida = is_turma_extraida(turma_nome)
         status = f"[green]{icons.check} Já extraída[/green]" if extraida else f"[dim]{icons.uncheck} Não extraída[/dim]"
@@ -443,7 +380,7 @@ async def menu_turma(client: AdaLoveAPIClient, turma_nome: str, turma_uuid: str)
         selected = await questionary.select(
             "O que deseja fazer?",
             choices=choices,
-            style=MENU_STYLE,
+            style=menu_style(),
         ).ask_async()
 
         if not selected or selected == "__BACK__":
@@ -461,6 +398,11 @@ async def menu_turma(client: AdaLoveAPIClient, turma_nome: str, turma_uuid: str)
 
 async def executar_extracao(turma_nome: str):
     """Executa extração, com aviso se já existir."""
+    import questionary
+    from rich.panel import Panel
+
+    from adalove_extractor.extractors.turma_completa import extrair_turma_completa
+
     if is_turma_extraida(turma_nome):
         rprint(Panel(
             f"[yellow]{icons.warning} Esta turma já foi extraída anteriormente.[/yellow]\n"
@@ -505,6 +447,11 @@ async def executar_extracao(turma_nome: str):
 
 async def exportar_calendario(turma_nome: str):
     """Exporta os encontros da extração para formato .ics."""
+    import questionary
+    from rich.panel import Panel
+
+    from adalove_extractor.io.calendar_incremental import IncrementalCalendarExport
+
     data = carregar_extracao(turma_nome)
     if not data:
         rprint(f"[red]{icons.error} Dados de extração não encontrados para a turma {turma_nome}.[/red]")
@@ -536,12 +483,15 @@ async def exportar_calendario(turma_nome: str):
         duracao_padrao = 2
 
     with console.status("[bold cyan]Gerando arquivo de calendário...[/bold cyan]", spinner="dots"):
-        exporter = ICalendarExport(horario_padrao=horario_padrao, duracao_padrao=duracao_padrao)
+        exporter = IncrementalCalendarExport(horario_padrao=horario_padrao, duracao_padrao=duracao_padrao)
         sucesso = exporter.gerar_calendario(data, output_path)
         
     if sucesso:
+        stats = exporter.ultimas_estatisticas
         rprint(Panel(
             f"[bold green]{icons.success} Calendário gerado com sucesso![/bold green]\n\n"
+            f"Eventos: {stats['eventos']} "
+            f"[dim]({stats['reconstruidos']} atualizados, {stats['reaproveitados']} sem mudança)[/dim]\n\n"
             f"Arquivo salvo em:\n[blue]{output_path}[/blue]",
             title="Exportação Concluída"
         ))
@@ -558,92 +508,148 @@ async def ver_ponderadas(client: AdaLoveAPIClient, turma_nome: str, turma_uuid:
     """
     Viewer de atividades ponderadas: lista agrupada por semana,
     com preview de descrição e pergunta.
-    Atualiza status antes de exibir.
+
+    Stale-while-revalidate: a lista aparece na hora com os dados locais e o
+    status (resposta, nota) é atualizado por uma tarefa em background, pulada
+    se a última verificação tiver menos de `ponderadas_ttl_minutes`. Quando
+    chegam dados novos, a lista é redesenhada.
     """
-    # Atualizar status das ponderadas
-    with console.status("[bold cyan]Atualizando status das ponderadas...[/bold cyan]", spinner="dots"):
-        sucesso = await atualizar_status_ponderadas(client, turma_nome, turma_uuid)
-        if not sucesso:
-            rprint(f"[yellow]{icons.warning} Não foi possível atualizar status. Mostrando dados do cache.[/yellow]")
-    
-    data = carregar_extracao(turma_nome)
-    if not data:
+    import asyncio
+
+    from adalove_extractor.cli.ponderadas_view import (
+        ANTERIOR, FILTRO_PENDENTES, FILTRO_SEMANA, PROXIMA, VOLTAR, PonderadasView,
+    )
+    from adalove_extractor.config.settings import get_settings
+
+    ponderadas = carregar_ponderadas_turma(turma_nome)
+    if ponderadas is None:
         rprint(f"[red]{icons.error} Dados de extração não encontrados.[/red]")
         return
 
-    ponderadas = extrair_ponderadas(data)
-
     if not ponderadas:
         rprint("[yellow]Nenhuma atividade ponderada encontrada nesta turma.[/yellow]")
         return
 
-    while True:
-        rprint(f"\n[bold]📝 Atividades Ponderadas — {turma_nome}[/bold]")
-        rprint(f"[dim]Total: {len(ponderadas)} atividades[/dim]\n")
+    # Tarefa de revalidação + select em exibição (para redesenhar ao fim dela)
+    estado = {"pergunta": None}
+    revalidacao = None
+    if not _status_ponderadas_recente(turma_nome, get_settings().ponderadas_ttl_minutes):
+        revalidacao = asyncio.create_task(atualizar_status_ponderadas(client, turma_nome, turma_uuid))
 
-        choices = []
-        semana_atual = ""
-
-        for i, pond in enumerate(ponderadas):
-            # Separador por semana (com espaçamento)
-            if pond["semana"] != semana_atual:
-                semana_atual = pond["semana"]
-                if i > 0:
-                    choices.append(questionary.Separator(" "))
-                choices.append(questionary.Separator(
-                    f"━━━━━━━━━━ {icons.calendar} {semana_atual} ━━━━━━━━━━"
-                ))
-                choices.append(questionary.Separator(" "))
+        def _ao_revalidar(task: asyncio.Task):
+            if task.cancelled() or not task.result():
+                return
+            # Dados novos: encerra o select em exibição para redesenhar a lista
+            pergunta = estado["pergunta"]
+            if pergunta is not None and pergunta.application.is_running:
+                pergunta.application.exit(result="__REFRESH__")
 
-            # Montar label do item
-            aval = pond.get("avaliacao", {})
-            peso = aval.get("peso", "?")
-            is_respondida = aval.get("respondida", False)
-            tem_conteudo = aval.get("resposta") is not None
+        revalidacao.add_done_callback(_ao_revalidar)
 
-            # Indicadores de status
-            ico_resp = icons.file_edit if tem_conteudo else icons.file_empty
-            ico_entrega = icons.check if is_respondida else icons.uncheck
-            ico_prazo, lbl_prazo = status_prazo(pond["data_encontro"], is_respondida)
+    view = PonderadasView(ponderadas, render=_label_ponderada)
 
-            desc_preview = truncar_texto(pond.get("descricao", ""), max_lines=1, max_chars_per_line=60)
-            perg_preview = truncar_texto(aval.get("pergunta", ""), max_lines=1, max_chars_per_line=60)
+    try:
+        while True:
+            if revalidacao is not None and revalidacao.done():
+                if revalidacao.result() is None:
+                    rprint(f"[yellow]{icons.warning} Não foi possível atualizar status. Mostrando dados do cache.[/yellow]")
+                elif revalidacao.result():
+                    # Dados novos: só agora os rótulos em cache são descartados
+                    view.atualizar(carregar_ponderadas_turma(turma_nome) or view.ponderadas)
+                revalidacao = None
+
+            rprint(f"\n[bold]📝 Atividades Ponderadas — {turma_nome}[/bold]")
+            sufixo = " · atualizando status em segundo plano..." if revalidacao is not None else ""
+            rprint(f"[dim]{view.resumo()}{sufixo}[/dim]\n")
+
+            selected = await _selecionar_ponderada(view, estado)
+
+            if selected == "__REFRESH__":
+                continue
 
-            titulo_curto = pond["titulo"]
-            if len(titulo_curto) > 50:
-                titulo_curto = titulo_curto[:47] + "..."
+            if selected is None or selected == VOLTAR:
+                return
 
-            line1 = f"{ico_entrega} {ico_resp} {titulo_curto}"
-            prof = pond.get('professor') or '?'
-            line2 = f"   {icons.calendar} {pond['data_encontro']} · {icons.teacher} {prof[:25]} · {icons.weight} Peso {peso}"
-            line3 = f"   {ico_prazo} {lbl_prazo} · {icons.document} {desc_preview}"
-            line4 = f"   {icons.question} {perg_preview}"
+            if selected == PROXIMA:
+                view.proxima()
+            elif selected == ANTERIOR:
+                view.anterior()
+            elif selected == FILTRO_PENDENTES:
+                view.filtrar(pendentes=not view.somente_pendentes)
+            elif selected == FILTRO_SEMANA:
+                await _escolher_semana(view)
+            elif isinstance(selected, int):
+                # A árvore completa só é necessária para o contexto da IA
+                data = carregar_extracao(turma_nome)
+                if not data:
+                    rprint(f"[red]{icons.error} Dados de extração não encontrados.[/red]")
+                    return
+                await menu_ponderada(view.ponderadas[selected], client, turma_nome, data)
+    finally:
+        if revalidacao is not None and not revalidacao.done():
+            revalidacao.cancel()
 
-            label = f"{line1}\n{line2}\n{line3}\n{line4}"
 
-            choices.append(questionary.Choice(
-                title=label,
-                value=i
-            ))
+def _label_ponderada(pond: dict) -> str:
+    """Rótulo de 4 linhas de uma ponderada no viewer (status, prazo, previews)."""
+    aval = pond.get("avaliacao", {})
+    peso = aval.get("peso", "?")
+    is_respondida = aval.get("respondida", False)
+    tem_conteudo = aval.get("resposta") is not None
 
-            # Espaçamento entre ponderadas
-            if i < len(ponderadas) - 1:
-                choices.append(questionary.Separator(" "))
+    # Indicadores de status
+    ico_resp = icons.file_edit if tem_conteudo else icons.file_empty
+    ico_entrega = icons.check if is_respondida else icons.uncheck
+    ico_prazo, lbl_prazo = status_prazo(pond["data_encontro"], is_respondida)
 
-        choices.append(questionary.Separator())
-        choices.append(questionary.Choice(title=f"{icons.back} Voltar", value="__BACK__"))
+    desc_preview = truncar_texto(pond.get("descricao", ""), max_lines=1, max_chars_per_line=60)
+    perg_preview = truncar_texto(aval.get("pergunta", ""), max_lines=1, max_chars_per_line=60)
 
-        selected = await questionary.select(
-            "Navegue pelas ponderadas (↑↓) ou selecione para ver detalhes:",
-            choices=choices,
-            style=MENU_STYLE,
-        ).ask_async()
+    titulo_curto = pond["titulo"]
+    if len(titulo_curto) > 50:
+        titulo_curto = titulo_curto[:47] + "..."
 
-        if selected is None or selected == "__BACK__":
-            return
+    line1 = f"{ico_entrega} {ico_resp} {titulo_curto}"
+    prof = pond.get('professor') or '?'
+    line2 = f"   {icons.calendar} {pond['data_encontro']} · {icons.teacher} {prof[:25]} · {icons.weight} Peso {peso}"
+    line3 = f"   {ico_prazo} {lbl_prazo} · {icons.document} {desc_preview}"
+    line4 = f"   {icons.question} {perg_preview}"
 
-        if isinstance(selected, int):
-            await menu_ponderada(ponderadas[selected], client, turma_nome, data)
+    return f"{line1}\n{line2}\n{line3}\n{line4}"
+
+
+async def _selecionar_ponderada(view, estado: dict):
+    """Exibe a página atual do viewer e devolve a escolha (índice, navegação, __REFRESH__ ou None).
+
+    O select em exibição fica em `estado["pergunta"]` para que a revalidação
+    em background possa encerrá-lo quando chegarem dados novos.
+    """
+    import questionary
+
+    pergunta = questionary.select(
+        "Navegue pelas ponderadas (↑↓) ou selecione para ver detalhes:",
+        choices=view.choices(),
+        style=menu_style(),
+    )
+    estado["pergunta"] = pergunta
+    try:
+        return await pergunta.ask_async()
+    finally:
+        estado["pergunta"] = None
+
+
+async def _escolher_semana(view) -> None:
+    """Pergunta a semana do filtro (ou todas) e aplica no viewer."""
+    import questionary
+
+    escolha = await questionary.select(
+        "Filtrar por semana:",
+        choices=[questionary.Choice(title="Todas as semanas", value="__TODAS__")]
+        + [questionary.Choice(title=semana, value=semana) for semana in view.semanas()],
+        style=menu_style(),
+    ).ask_async()
+    if escolha is not None:
+        view.filtrar(semana=None if escolha == "__TODAS__" else escolha)
 
 
 def salvar_rascunho(turma_nome: str, pond: dict, resposta: str) -> Path:
@@ -674,6 +680,117 @@ def salvar_rascunho(turma_nome: str, pond: dict, resposta: str) -> Path:
     return filepath
 
 
+def _criar_gerador(max_concurrent: int | None = None):
+    """AnswerGenerator com comando, timeout e concorrência vindos do Settings."""
+    import shlex
+
+    from adalove_extractor.ai.answer_generator import AnswerGenerator
+    from adalove_extractor.config.settings import get_settings
+
+    settings = get_settings()
+    return AnswerGenerator(
+        timeout=settings.ai_timeout_seconds,
+        command=shlex.split(settings.ai_command),
+        max_concurrent=max_concurrent or settings.ai_max_concurrent,
+    )
+
+
+def _criar_cache_ia():
+    """Cache em disco das gerações, em output/api_extraction/cache_ia."""
+    from adalove_extractor.ai.answer_cache import AnswerCache
+    from adalove_extractor.config.settings import get_settings
+
+    return AnswerCache(OUTPUT_DIR / "cache_ia", max_entries=get_settings().ai_cache_max_entries)
+
+
+def _criar_context_builder():
+    """ContextBuilder com o orçamento de prompt e o índice de busca do Settings."""
+    from adalove_extractor.ai.context_builder import ContextBuilder
+    from adalove_extractor.config.settings import get_settings
+
+    settings = get_settings()
+    retriever = None
+    if settings.ai_retrieval_k > 0:
+        from adalove_extractor.ai.retrieval import abrir_indice
+
+        try:
+            # Incremental: só turmas com extração nova são reindexadas
+            retriever = abrir_indice(OUTPUT_DIR)
+        except Exception as e:
+            logging.warning(f"Índice de busca indisponível ({e}); seguindo sem material relacionado")
+    return ContextBuilder(
+        budget_chars=settings.ai_context_budget_chars or None,
+        retriever=retriever,
+        retrieval_k=settings.ai_retrieval_k,
+    )
+
+
+def _resumo_prompt(context_builder) -> None:
+    """Uma linha com o tamanho do último prompt e o que foi cortado pelo orçamento."""
+    stats = context_builder.last_stats
+    linha = f"Prompt: {stats['chars']} chars (~{stats['tokens_estimados']} tokens)"
+    incluidos, total = stats["trechos_transcricao"]
+    if total > incluidos:
+        linha += f" · transcrição: {incluidos}/{total} trechos mais relevantes"
+    incluidos, total = stats["autoestudos"]
+    if total > incluidos:
+        linha += f" · autoestudos: {incluidos}/{total}"
+    if stats["relacionados"]:
+        linha += f" · {stats['relacionados']} material(is) relacionado(s)"
+    rprint(f"[dim]{linha}[/dim]")
+
+
+def _avisar_claude_ausente() -> None:
+    rprint(
+        f"[bold red]{icons.error} claude CLI não encontrado.[/bold red]\n"
+        "Instale com: npm install -g @anthropic-ai/claude-code"
+    )
+
+
+async def _gerar_com_streaming(
+    generator,
+    titulo: str,
+    border_style: str,
+    user_prompt: str,
+    system_prompt: str,
+    cache=None,
+    usar_cache: bool = True,
+) -> str:
+    """
+    Gera texto exibindo um painel que cresce conforme o stdout chega.
+
+    Com `cache`, um prompt já gerado volta na hora; `usar_cache=False`
+    (regenerar) ignora a entrada existente e grava o texto novo no lugar.
+    """
+    from rich.live import Live
+    from rich.panel import Panel
+
+    from adalove_extractor.ai.answer_cache import cache_key, generator_config
+
+    def painel(texto: str) -> Panel:
+        return Panel(texto or "[dim]Aguardando resposta...[/dim]", title=titulo, border_style=border_style)
+
+    chave = None
+    if cache is not None:
+        chave = cache_key(system_prompt, user_prompt, generator_config(generator.command))
+        texto = cache.get(chave) if usar_cache else None
+        if texto is not None:
+            rprint(Panel(texto, title=f"{titulo} [dim](cache)[/dim]", border_style=border_style))
+            return texto
+
+    with Live(painel(""), refresh_per_second=8, vertical_overflow="visible") as live:
+        texto = await generator.generate_async(
+            user_prompt=user_prompt,
+            system_prompt=system_prompt,
+            on_chunk=lambda parcial: live.update(painel(parcial)),
+        )
+        live.update(painel(texto))
+
+    if chave is not None:
+        cache.put(chave, texto, titulo=titulo)
+    return texto
+
+
 async def gerar_resposta_ia(
     client: AdaLoveAPIClient,
     turma_nome: str,
@@ -684,9 +801,16 @@ async def gerar_resposta_ia(
     import os
     import subprocess as sp
 
-    context_builder = ContextBuilder()
+    import questionary
+    from rich.panel import Panel
+
+    from adalove_extractor.ai.answer_generator import ClaudeNotFoundError
+    from adalove_extractor.ai.system_prompt import SystemPromptLoader
+
+    context_builder = _criar_context_builder()
     prompt_loader = SystemPromptLoader()
-    generator = AnswerGenerator()
+    generator = _criar_gerador()
+    cache = _criar_cache_ia()
 
     # Passo 1: Exibir contexto disponível
     aval = pond.get("avaliacao", {})
@@ -702,7 +826,7 @@ async def gerar_resposta_ia(
     transcript_path = await questionary.text(
         f"{icons.folder} Caminho para arquivo .txt de transcrição (Enter para pular):",
         default="",
-        style=MENU_STYLE,
+        style=menu_style(),
     ).ask_async()
 
     transcript = None
@@ -717,7 +841,7 @@ async def gerar_resposta_ia(
     user_notes_raw = await questionary.text(
         f"{icons.document} Instruções extras ou notas (Enter para pular):",
         default="",
-        style=MENU_STYLE,
+        style=menu_style(),
     ).ask_async()
     user_notes = user_notes_raw.strip() if user_notes_raw else None
 
@@ -726,35 +850,32 @@ async def gerar_resposta_ia(
     sp_additions_raw = await questionary.text(
         f"{icons.robot} Adicionar instruções ao system prompt desta geração (Enter para pular):",
         default="",
-        style=MENU_STYLE,
+        style=menu_style(),
     ).ask_async()
     sp_additions = sp_additions_raw.strip() if sp_additions_raw else None
     system_prompt = prompt_loader.load(session_additions=sp_additions)
 
-    # Passo 5a: Gerar esqueleto
-    with console.status("[bold cyan]Gerando esqueleto da resposta...[/bold cyan]", spinner="dots"):
-        skeleton_prompt = context_builder.build(
-            pond, extracao_data,
-            transcript=transcript,
-            user_notes=user_notes,
-            skeleton_mode=True,
+    # Passo 5: Gerar esqueleto (exibido conforme é gerado)
+    skeleton_prompt = context_builder.build(
+        pond, extracao_data,
+        transcript=transcript,
+        user_notes=user_notes,
+        skeleton_mode=True,
+    )
+    _resumo_prompt(context_builder)
+    try:
+        await _gerar_com_streaming(
+            generator, "Esqueleto da Resposta", "yellow",
+            user_prompt=skeleton_prompt, system_prompt=system_prompt, cache=cache,
         )
-        try:
-            skeleton = generator.generate(user_prompt=skeleton_prompt, system_prompt=system_prompt)
-        except ClaudeNotFoundError:
-            rprint(
-                f"[bold red]{icons.error} claude CLI não encontrado.[/bold red]\n"
-                "Instale com: npm install -g @anthropic-ai/claude-code"
-            )
-            return
-        except RuntimeError as e:
-            rprint(f"[bold red]{icons.error} Erro ao gerar esqueleto:[/bold red] {e}")
-            return
-
-    # Passo 5b: Exibir esqueleto
-    rprint(Panel(skeleton, title="Esqueleto da Resposta", border_style="yellow"))
+    except ClaudeNotFoundError:
+        _avisar_claude_ausente()
+        return
+    except RuntimeError as e:
+        rprint(f"[bold red]{icons.error} Erro ao gerar esqueleto:[/bold red] {e}")
+        return
 
-    # Passo 5c: Aprovação do esqueleto
+    # Passo 5b: Aprovação do esqueleto
     esqueleto_ok = await questionary.select(
         "O esqueleto está correto?",
         choices=[
@@ -762,7 +883,7 @@ async def gerar_resposta_ia(
             questionary.Choice(title=f"{icons.document} Ajustar com instrução adicional", value="ajustar"),
             questionary.Choice(title=f"{icons.exit} Cancelar", value="cancelar"),
         ],
-        style=MENU_STYLE,
+        style=menu_style(),
     ).ask_async()
 
     if not esqueleto_ok or esqueleto_ok == "cancelar":
@@ -772,29 +893,33 @@ async def gerar_resposta_ia(
     if esqueleto_ok == "ajustar":
         ajuste = await questionary.text(
             "Instrução adicional para corrigir o esqueleto:",
-            style=MENU_STYLE,
+            style=menu_style(),
         ).ask_async()
         if ajuste and ajuste.strip():
             user_notes = (user_notes or "") + f"\n\nCORREÇÃO DE ESQUELETO: {ajuste.strip()}"
 
-    # Passo 6: Gerar resposta completa
-    with console.status("[bold cyan]Gerando resposta completa...[/bold cyan]", spinner="dots"):
-        full_prompt = context_builder.build(
-            pond, extracao_data,
-            transcript=transcript,
-            user_notes=user_notes,
-            skeleton_mode=False,
+    # Passo 6: Gerar resposta completa (exibida conforme é gerada)
+    full_prompt = context_builder.build(
+        pond, extracao_data,
+        transcript=transcript,
+        user_notes=user_notes,
+        skeleton_mode=False,
+    )
+    _resumo_prompt(context_builder)
+    try:
+        resposta = await _gerar_com_streaming(
+            generator, "Rascunho Gerado", "green",
+            user_prompt=full_prompt, system_prompt=system_prompt, cache=cache,
         )
-        try:
-            resposta = generator.generate(user_prompt=full_prompt, system_prompt=system_prompt)
-        except RuntimeError as e:
-            rprint(f"[bold red]{icons.error} Erro ao gerar resposta:[/bold red] {e}")
-            return
-
-    # Passo 7: Exibir rascunho
-    rprint(Panel(resposta, title="Rascunho Gerado", border_style="green"))
+    except ClaudeNotFoundError:
+        # Com o esqueleto vindo do cache, esta é a primeira chamada ao CLI
+        _avisar_claude_ausente()
+        return
+    except RuntimeError as e:
+        rprint(f"[bold red]{icons.error} Erro ao gerar resposta:[/bold red] {e}")
+        return
 
-    # Passo 8: Menu de ação
+    # Passo 7: Menu de ação
     uuid = pond.get("student_activity_uuid")
     while True:
         acao = await questionary.select(
@@ -806,7 +931,7 @@ async def gerar_resposta_ia(
                 questionary.Choice(title=f"{icons.folder} Salvar rascunho (sem submeter)", value="salvar"),
                 questionary.Choice(title=f"{icons.exit} Cancelar", value="cancelar"),
             ],
-            style=MENU_STYLE,
+            style=menu_style(),
         ).ask_async()
 
         if not acao or acao == "cancelar":
@@ -840,19 +965,27 @@ async def gerar_resposta_ia(
         if acao == "regenerar":
             nota_extra = await questionary.text(
                 "Instrução adicional para regenerar:",
-                style=MENU_STYLE,
+                style=menu_style(),
             ).ask_async()
             if nota_extra and nota_extra.strip():
                 user_notes = (user_notes or "") + f"\n\nREGENERAÇÃO: {nota_extra.strip()}"
-            with console.status("[bold cyan]Regenerando...[/bold cyan]", spinner="dots"):
-                full_prompt = context_builder.build(
-                    pond, extracao_data,
-                    transcript=transcript,
-                    user_notes=user_notes,
-                    skeleton_mode=False,
+            full_prompt = context_builder.build(
+                pond, extracao_data,
+                transcript=transcript,
+                user_notes=user_notes,
+                skeleton_mode=False,
+            )
+            _resumo_prompt(context_builder)
+            try:
+                resposta = await _gerar_com_streaming(
+                    generator, "Rascunho Regenerado", "green",
+                    user_prompt=full_prompt, system_prompt=system_prompt,
+                    cache=cache, usar_cache=False,
                 )
-                resposta = generator.generate(user_prompt=full_prompt, system_prompt=system_prompt)
-            rprint(Panel(resposta, title="Rascunho Regenerado", border_style="green"))
+            except ClaudeNotFoundError:
+                _avisar_claude_ausente()
+            except RuntimeError as e:
+                rprint(f"[bold red]{icons.error} Erro ao regenerar:[/bold red] {e}")
             continue
 
         if acao == "submeter":
@@ -865,27 +998,24 @@ async def gerar_resposta_ia(
                 rprint(f"[dim]Rascunho salvo em: {filepath}[/dim]")
                 return
 
+            # Gravada no outbox antes da tentativa: uma falha não perde a resposta
+            outbox = _outbox()
+            entrada = outbox.enfileirar(uuid, resposta, section_uuid=extracao_data.get("uuid"), turma=turma_nome)
             with console.status("[bold cyan]Submetendo via API...[/bold cyan]", spinner="dots"):
-                sucesso = await client.submit_answer(uuid, resposta)
+                resultado = await outbox.drenar(client, ids=[entrada])
 
-            if sucesso:
+            if entrada in resultado["enviadas"] or entrada in resultado["ja_enviadas"]:
                 rprint(Panel(
                     f"[bold green]{icons.success} Resposta submetida com sucesso![/bold green]",
                     title="Submissão Concluída",
                 ))
-                return
             else:
-                rprint(f"[yellow]{icons.warning} Falha na submissão via API.[/yellow]")
-                salvar = await questionary.confirm(
-                    "Deseja salvar o rascunho em arquivo como alternativa?"
-                ).ask_async()
-                if salvar:
-                    filepath = salvar_rascunho(turma_nome, pond, resposta)
-                    rprint(
-                        f"[green]{icons.success} Rascunho salvo em: "
-                        f"[blue]{filepath}[/blue][/green]"
-                    )
-                return
+                rprint(
+                    f"[yellow]{icons.warning} Falha na submissão via API. A resposta ficou na fila "
+                    f"e será reenviada automaticamente ({resultado['restantes']} pendente(s)).[/yellow]\n"
+                    "[dim]Para forçar o envio depois: python adalove_cli.py --enviar-pendentes[/dim]"
+                )
+            return
 
 
 async def menu_ponderada(pond: dict, client: AdaLoveAPIClient, turma_nome: str, extracao_data: dict):
@@ -893,6 +1023,9 @@ async def menu_ponderada(pond: dict, client: AdaLoveAPIClient, turma_nome: str,
     Sub-menu de uma atividade ponderada individual.
     Mostra detalhes completos e opções de ação.
     """
+    import questionary
+    from rich.panel import Panel
+
     while True:
         aval = pond.get("avaliacao", {})
 
@@ -952,7 +1085,7 @@ async def menu_ponderada(pond: dict, client: AdaLoveAPIClient, turma_nome: str,
         selected = await questionary.select(
             "Opções:",
             choices=choices,
-            style=MENU_STYLE,
+            style=menu_style(),
         ).ask_async()
 
         if not selected or selected == "__BACK__":
@@ -967,6 +1100,11 @@ async def menu_ponderada(pond: dict, client: AdaLoveAPIClient, turma_nome: str,
 # ═══════════════════════════════════════════════════════════════
 
 async def main():
+    import questionary
+
+    from adalove_extractor.api import AdaLoveAPIClient
+    from adalove_extractor.config.settings import Settings
+
     show_banner()
 
     settings = Settings()
@@ -996,7 +1134,7 @@ async def main():
                     sections_resp = await client.get(Endpoints.SECTIONS)
             except AuthenticationError:
                 rprint("[yellow]⚠️ Token expirado. Renovando autenticação...[/yellow]")
-                client.auth.token = None
+                client.auth.invalidate_token()
                 await client.authenticate(settings.login, settings.senha)
                 with console.status("[bold green]Buscando turmas...[/bold green]", spinner="dots"):
                     sections_resp = await client.get(Endpoints.SECTIONS)
@@ -1012,8 +1150,20 @@ async def main():
                 rprint("[bold red]❌ Nenhuma turma encontrada![/bold red]")
                 return
 
+            # Respostas pendentes de sessões anteriores saem em background
+            import asyncio
+
+            outbox = _outbox()
+            if outbox.pendentes():
+                rprint(f"[dim]{len(outbox.pendentes())} resposta(s) na fila de envio; tentando em background.[/dim]")
+            envio_pendentes = asyncio.create_task(outbox.executar(client))
+
             # Entrar no menu principal (loop)
-            await menu_principal(client, sections_list)
+            try:
+                await menu_principal(client, sections_list)
+            finally:
+                envio_pendentes.cancel()
+                await asyncio.gather(envio_pendentes, return_exceptions=True)
 
         except AuthenticationError as e:
             # Falha de login é condição esperada, não defeito: traceback aqui só
@@ -1038,8 +1188,11 @@ async def main():
 # Modo não-interativo (CLI flags) — para ambientes sem TTY ou automação
 # ============================================================================
 
-async def _carregar_sections_via_api():
-    """Autentica e retorna a lista de sections da API. Reusa cache de token."""
+async def _cliente_autenticado():
+    """Abre um AdaLoveAPIClient autenticado (reusa cache de token). Quem chama fecha."""
+    from adalove_extractor.api import AdaLoveAPIClient
+    from adalove_extractor.config.settings import Settings
+
     settings = Settings()
     if not settings.login or not settings.senha:
         print("ERRO: .env sem LOGIN/SENHA", file=sys.stderr)
@@ -1048,10 +1201,20 @@ async def _carregar_sections_via_api():
     await client.__aenter__()
     try:
         await client.authenticate(settings.login, settings.senha)
+    except Exception:
+        await client.__aexit__(None, None, None)
+        raise
+    return client, settings
+
+
+async def _carregar_sections_via_api():
+    """Autentica e retorna a lista de sections da API. Reusa cache de token."""
+    client, settings = await _cliente_autenticado()
+    try:
         try:
             resp = await client.get(Endpoints.SECTIONS)
         except AuthenticationError:
-            client.auth.token = None
+            client.auth.invalidate_token()
             await client.authenticate(settings.login, settings.senha)
             resp = await client.get(Endpoints.SECTIONS)
         sections = resp.get("sections", []) if isinstance(resp, dict) else resp
@@ -1061,27 +1224,33 @@ async def _carregar_sections_via_api():
         raise
 
 
+def _listar_local():
+    """Lista as turmas extraídas a partir do manifesto. Síncrono: sem asyncio nem rede."""
+    if not OUTPUT_DIR.exists():
+        print("(nenhuma turma extraída localmente em output/api_extraction/)")
+        return
+    turmas = _manifesto().turmas()
+    if not turmas:
+        print("(nenhuma turma extraída)")
+        return
+    print(f"{'STATUS':6} {'TURMA':50} TIMESTAMP")
+    for slug, entry in turmas.items():
+        print(f"{'EXTR':6} {slug:50} {entry.get('extracao_timestamp') or '?'}")
+
+
+def _reconstruir_manifesto_cli():
+    """Regenera output/api_extraction/manifest.json a partir das pastas no disco."""
+    turmas = _manifesto().rebuild()
+    print(f"Manifesto reconstruído: {len(turmas)} turma(s) em {_manifesto().path}")
+    for slug, entry in turmas.items():
+        print(f"  {slug:50} {entry.get('total_atividades', 0):4} atividades · "
+              f"{entry.get('total_ponderadas', 0):3} ponderadas · {entry.get('arquivo_bytes', 0) // 1024} KiB")
+
+
 async def _listar_cli(remote: bool):
     """Lista turmas em formato tabular. --remote=True consulta API; senão usa output/."""
     if not remote:
-        if not OUTPUT_DIR.exists():
-            print("(nenhuma turma extraída localmente em output/api_extraction/)")
-            return
-        rows = []
-        for d in sorted(OUTPUT_DIR.iterdir()):
-            arq = d / "extracao_completa.json"
-            if arq.exists():
-                try:
-                    ts = json.loads(arq.read_text(encoding="utf-8")).get("extração_timestamp", "?")
-                except Exception:
-                    ts = "?"
-                rows.append((d.name, ts))
-        if not rows:
-            print("(nenhuma turma extraída)")
-            return
-        print(f"{'STATUS':6} {'TURMA':50} TIMESTAMP")
-        for nome, ts in rows:
-            print(f"{'EXTR':6} {nome:50} {ts}")
+        _listar_local()
         return
 
     sections, client = await _carregar_sections_via_api()
@@ -1091,18 +1260,36 @@ async def _listar_cli(remote: bool):
             key=lambda x: x.get("caption", x.get("name", "zzz")),
             reverse=True,
         )
+        extraidas = _manifesto().turmas()
         print(f"{'STATUS':6} {'TURMA':50} UUID")
         for s in ordenadas:
             nome = s.get("caption", s.get("name", "N/A"))
             uuid = s.get("uuid", "")
-            status = "EXTR" if is_turma_extraida(nome) else "--"
+            status = "EXTR" if _turma_slug(nome) in extraidas else "--"
             print(f"{status:6} {nome:50} {uuid}")
     finally:
         await client.__aexit__(None, None, None)
 
 
-async def _extrair_cli(nomes: list[str], force: bool, dry_run: bool, todas: bool, paralelo: int = 1):
-    """Extrai uma ou mais turmas (ou todas via API). Honra --force, --dry-run, --paralelo."""
+async def _extrair_cli(nomes: list[str], force: bool, dry_run: bool, todas: bool, paralelo: int = 1,
+                       progress_fd: int | None = None):
+    """
+    Extrai uma ou mais turmas (ou todas via API). Honra --force, --dry-run, --paralelo.
+    Com `progress_fd`, emite eventos de progresso em JSON lines nesse descritor.
+    """
+    from adalove_extractor.io.progress import ProgressReporter
+
+    with ProgressReporter(progress_fd) as progresso:
+        await _extrair_com_progresso(nomes, force, dry_run, todas, paralelo, progresso)
+
+
+async def _extrair_com_progresso(nomes: list[str], force: bool, dry_run: bool, todas: bool, paralelo: int,
+                                 progresso):
+    """Corpo de `_extrair_cli`, com o reporter de progresso já aberto."""
+    import asyncio
+
+    from adalove_extractor.extractors.turma_completa import extrair_turma_completa
+
     sections, client = await _carregar_sections_via_api()
     nomes_disponiveis = {s.get("caption", s.get("name", "")): s for s in sections}
 
@@ -1131,6 +1318,8 @@ async def _extrair_cli(nomes: list[str], force: bool, dry_run: bool, todas: bool
     print("Plano de execução:")
     for nome, acao in plano:
         print(f"  [{acao}] {nome}")
+    progresso.emit("plano", turmas=[{"turma": nome, "acao": acao.split(" ")[0]} for nome, acao in plano],
+                   dry_run=dry_run)
 
     if dry_run:
         print("\n--dry-run: nada foi executado.")
@@ -1151,14 +1340,22 @@ async def _extrair_cli(nomes: list[str], force: bool, dry_run: bool, todas: bool
             idx = contador["feitas"] + 1
             contador["feitas"] = idx
             print(f"=== [{idx}/{len(a_executar)}] iniciando: {nome} ===", flush=True)
+            progresso.emit("turma_inicio", turma=nome, indice=idx, total=len(a_executar))
             try:
-                await extrair_turma_completa(nome)
+                if await extrair_turma_completa(nome, progresso=progresso) is None:
+                    # O rastreio da extração já emitiu turma_fim com sucesso=False
+                    print(f"❌ Falhou {nome}: extração não concluída", file=sys.stderr, flush=True)
+                    falhas.append((nome, "extração não concluída"))
+                    return
                 print(f"✅ {nome}", flush=True)
             except Exception as e:
                 print(f"❌ Falhou {nome}: {e}", file=sys.stderr, flush=True)
+                progresso.emit("turma_fim", turma=nome, sucesso=False, erro=str(e))
                 falhas.append((nome, str(e)))
 
     await asyncio.gather(*[_executar_uma(n) for n in a_executar])
+    progresso.emit("fim", turmas=len(a_executar), sucesso=len(a_executar) - len(falhas),
+                   falhas=[nome for nome, _ in falhas])
 
     print(f"\n{'=' * 60}")
     print(f"Concluído: {len(a_executar) - len(falhas)}/{len(a_executar)} sucesso(s)")
@@ -1169,6 +1366,250 @@ async def _extrair_cli(nomes: list[str], force: bool, dry_run: bool, todas: bool
         sys.exit(1)
 
 
+def _calendario_todas_cli(horario: str, duracao: int, saida: str | None):
+    """Gera um .ics único com os encontros de todas as turmas extraídas localmente."""
+    from adalove_extractor.io.calendar import ICalendarExport
+    from adalove_extractor.io.calendar_combined import gerar_calendario_combinado
+    from adalove_extractor.io.uuid_index import ShardedExtraction
+
+    extracoes = sorted(OUTPUT_DIR.glob("*/extracao_completa.json")) if OUTPUT_DIR.exists() else []
+    if not extracoes:
+        print("(nenhuma turma extraída em output/api_extraction/)", file=sys.stderr)
+        sys.exit(1)
+
+    # Semanas atualizadas parcialmente entram antes de ler as extrações
+    for extracao_path in extracoes:
+        ShardedExtraction(extracao_path.parent).consolidar()
+
+    output_path = Path(saida) if saida else OUTPUT_DIR / "calendario_todas.ics"
+    exporter = ICalendarExport(horario_padrao=horario, duracao_padrao=duracao)
+    stats = gerar_calendario_combinado(extracoes, output_path, exporter)
+
+    print(f"Calendário combinado: {output_path}")
+    print(f"  Turmas: {stats['turmas']} · Eventos: {stats['eventos']} · Duplicados ignorados: {stats['duplicados']}")
+    if stats["turmas_com_erro"]:
+        print(f"  Extrações ilegíveis (puladas): {stats['turmas_com_erro']}", file=sys.stderr)
+    if stats["eventos"] == 0:
+        sys.exit(1)
+
+
+async def _servir_cli(host: str, porta: int, horario: str, duracao: int):
+    """Serve os calendários das turmas extraídas via HTTP até Ctrl+C."""
+    from adalove_extractor.io.calendar_server import CalendarFeedServer
+
+    server = CalendarFeedServer(
+        OUTPUT_DIR, host=host, port=porta, horario_padrao=horario, duracao_padrao=duracao,
+    )
+    await server.start()
+    print(f"Servindo calendários em http://{host}:{server.port}/ (Ctrl+C para parar)")
+    for nome in sorted(server.feeds):
+        print(f"  http://{host}:{server.port}/{nome}.ics")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def _linhas_relatorio_ponderadas(turmas: dict, todas: bool) -> list[dict]:
+    """Linhas do relatório de ponderadas (pendentes ou todas), ordenadas por prazo."""
+    from adalove_extractor.io.ponderadas import calcular_prazo_ponderada
+
+    linhas = []
+    for slug, entry in turmas.items():
+        nome = entry.get("turma") or slug
+        for pond in carregar_ponderadas_turma(nome) or []:
+            aval = pond.get("avaliacao", {})
+            respondida = bool(aval.get("respondida"))
+            if respondida and not todas:
+                continue
+            prazo = calcular_prazo_ponderada(pond["data_encontro"])
+            _, status = status_prazo(pond["data_encontro"], respondida)
+            linhas.append({
+                "turma": nome,
+                "semana": pond["semana"],
+                "titulo": pond["titulo"],
+                "tipo": pond.get("tipo"),
+                "data_encontro": pond["data_encontro"],
+                "prazo": prazo.isoformat() if prazo else None,
+                "status": status,
+                "respondida": respondida,
+                "nota": aval.get("nota"),
+                "peso": aval.get("peso"),
+                "student_activity_uuid": pond.get("student_activity_uuid"),
+            })
+
+    # Sem prazo por último; empate por turma e título
+    linhas.sort(key=lambda l: (l["prazo"] is None, l["prazo"] or "", l["turma"], l["titulo"]))
+    return linhas
+
+
+async def _ponderadas_cli(todas: bool, como_json: bool, atualizar: bool, paralelo: int | None):
+    """
+    Relatório de ponderadas de todas as turmas extraídas.
+
+    Com `atualizar`, o status (resposta, nota) de cada turma é revalidado antes,
+    em paralelo e com um único client autenticado: uma requisição de userdata
+    por turma, todas em voo ao mesmo tempo (limitadas por --paralelo). Turmas
+    verificadas há menos de `ponderadas_ttl_minutes` são puladas.
+    """
+    import asyncio
+    import json
+
+    turmas = _manifesto().turmas()
+    if not turmas:
+        print("(nenhuma turma extraída em output/api_extraction/)", file=sys.stderr)
+        sys.exit(1)
+
+    if atualizar:
+        from adalove_extractor.config.settings import get_settings
+
+        ttl = get_settings().ponderadas_ttl_minutes
+        alvos = [
+            (entry.get("turma") or slug, entry["uuid"])
+            for slug, entry in turmas.items()
+            if entry.get("uuid") and not _status_ponderadas_recente(entry.get("turma") or slug, ttl)
+        ]
+        if alvos:
+            client, _ = await _cliente_autenticado()
+            sem = asyncio.Semaphore(max(1, paralelo or len(alvos)))
+
+            async def _atualizar_uma(nome: str, uuid: str):
+                async with sem:
+                    return await atualizar_status_ponderadas(client, nome, uuid)
+
+            try:
+                resultados = await asyncio.gather(*[_atualizar_uma(nome, uuid) for nome, uuid in alvos])
+            finally:
+                await client.__aexit__(None, None, None)
+            for (nome, _), resultado in zip(alvos, resultados):
+                if resultado is None:
+                    print(f"AVISO: status de {nome} não atualizado; usando dados locais", file=sys.stderr)
+
+    linhas = _linhas_relatorio_ponderadas(turmas, todas)
+
+    if como_json:
+        print(json.dumps(linhas, ensure_ascii=False, indent=2))
+        return
+
+    if not linhas:
+        print("(nenhuma ponderada pendente)" if not todas else "(nenhuma ponderada)")
+        return
+    print(f"{'PRAZO':16} {'STATUS':22} {'TURMA':20} {'SEMANA':10} PONDERADA")
+    for l in linhas:
+        prazo = l["prazo"][:16].replace("T", " ") if l["prazo"] else "-"
+        print(f"{prazo:16} {l['status'][:22]:22} {l['turma'][:20]:20} {l['semana'][:10]:10} {l['titulo']}")
+    print(f"\n{len(linhas)} ponderada(s){'' if todas else ' pendente(s)'} em {len(turmas)} turma(s)")
+
+
+async def _rascunhos_cli(turmas_filtro: list[str], paralelo: int | None):
+    """
+    Gera rascunhos (esqueleto + resposta) de todas as ponderadas pendentes, sem prompts.
+
+    Os jobs rodam em paralelo (--paralelo, default `ai_max_concurrent`) e o
+    progresso fica em output/api_extraction/rascunhos_lote.jsonl: rodar de novo
+    após uma interrupção retoma de onde parou.
+    """
+    from adalove_extractor.ai.answer_generator import ClaudeNotFoundError
+    from adalove_extractor.ai.batch import LEDGER_FILENAME, JobLedger, gerar_rascunhos
+    from adalove_extractor.ai.system_prompt import SystemPromptLoader
+    from adalove_extractor.config.settings import get_settings
+
+    turmas = _manifesto().turmas()
+    nomes = [entry.get("turma") or slug for slug, entry in turmas.items()]
+    if turmas_filtro:
+        nomes = [n for n in nomes if n in turmas_filtro or _turma_slug(n) in turmas_filtro]
+    if not nomes:
+        print("(nenhuma turma extraída em output/api_extraction/)", file=sys.stderr)
+        sys.exit(1)
+
+    jobs = [
+        {"turma": nome, "ponderada": pond}
+        for nome in nomes
+        for pond in carregar_ponderadas_turma(nome) or []
+        if not pond.get("avaliacao", {}).get("respondida")
+    ]
+    if not jobs:
+        print("(nenhuma ponderada pendente)")
+        return
+
+    concorrencia = paralelo or get_settings().ai_max_concurrent
+    generator = _criar_gerador(max_concurrent=concorrencia)
+    ledger = JobLedger(OUTPUT_DIR / LEDGER_FILENAME)
+
+    def _progresso(evento: dict) -> None:
+        detalhe = evento.get("rascunho") or evento.get("erro") or ""
+        print(f"[{evento['estado']:10}] {evento['job']} {detalhe}".rstrip(), file=sys.stderr)
+
+    print(f"Gerando rascunhos de {len(jobs)} ponderada(s) pendente(s), {concorrencia} por vez", file=sys.stderr)
+    try:
+        contagem = await gerar_rascunhos(
+            jobs,
+            carregar_extracao=carregar_extracao,
+            salvar=salvar_rascunho,
+            generator=generator,
+            system_prompt=SystemPromptLoader().load(),
+            ledger=ledger,
+            concorrencia=concorrencia,
+            cache=_criar_cache_ia(),
+            builder=_criar_context_builder(),
+            emitir=_progresso,
+        )
+    except ClaudeNotFoundError as e:
+        print(f"ERRO: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(
+        f"{contagem['concluidos']} rascunho(s) gerado(s), {contagem['pulados']} já prontos, "
+        f"{contagem['erros']} erro(s). Ledger: {ledger.path}"
+    )
+    if contagem["erros"]:
+        sys.exit(1)
+
+
+async def _enviar_pendentes_cli(paralelo: int | None):
+    """Envia agora (ignorando o backoff) as respostas na fila do outbox."""
+    outbox = _outbox()
+    if not outbox.pendentes():
+        print("(nenhuma resposta pendente de envio)")
+        return
+
+    client, _ = await _cliente_autenticado()
+    try:
+        resultado = await outbox.drenar(client, concorrencia=paralelo or 2, forcar=True)
+    finally:
+        await client.__aexit__(None, None, None)
+
+    print(
+        f"{len(resultado['enviadas'])} enviada(s), {len(resultado['ja_enviadas'])} já registrada(s) na API, "
+        f"{len(resultado['falhas'])} falha(s); {resultado['restantes']} pendente(s)"
+    )
+    if resultado["restantes"]:
+        sys.exit(1)
+
+
+async def _watch_cli(intervalo: float, paralelo: int | None = None):
+    """Observa as turmas extraídas e imprime mudanças como JSON lines até Ctrl+C."""
+    from adalove_extractor.extractors.watch import DETALHES_PARALELO, ChangeWatcher
+
+    turmas = {
+        entry.get("turma") or slug: entry["uuid"]
+        for slug, entry in _manifesto().turmas().items()
+        if entry.get("uuid")
+    }
+    if not turmas:
+        print("(nenhuma turma extraída em output/api_extraction/)", file=sys.stderr)
+        sys.exit(1)
+
+    client, _ = await _cliente_autenticado()
+    try:
+        print(f"Observando {len(turmas)} turma(s) a cada ~{intervalo:g}s (Ctrl+C para parar)", file=sys.stderr)
+        await ChangeWatcher(
+            client, turmas, OUTPUT_DIR, intervalo=intervalo, detalhes_paralelo=paralelo or DETALHES_PARALELO,
+        ).run()
+    finally:
+        await client.__aexit__(None, None, None)
+
+
 def _parse_args(argv: list[str]):
     """Argparse — retorna (args, modo_interativo: bool)."""
     import argparse
@@ -1182,28 +1623,104 @@ def _parse_args(argv: list[str]):
     parser.add_argument("--extrair-todas", action="store_true", help="Extrai todas as turmas listadas pela API.")
     parser.add_argument("--force", action="store_true", help="Sobrescreve extrações existentes.")
     parser.add_argument("--dry-run", action="store_true", help="Mostra o plano de extração sem executar.")
-    parser.add_argument("--paralelo", type=int, default=1, metavar="N",
+    parser.add_argument("--paralelo", type=int, default=None, metavar="N",
                         help="Número de extrações concorrentes (asyncio.Semaphore). Default=1 (sequencial). "
-                             "Recomendado: 3-5. Maior risco de rate-limit acima disso.")
+                             "Recomendado: 3-5. Maior risco de rate-limit acima disso. "
+                             "Para --ponderadas: turmas atualizadas ao mesmo tempo (default: todas). "
+                             "Para --watch: detalhes de atividades buscados ao mesmo tempo (default: 4).")
+    parser.add_argument("--progress-json", type=int, default=None, metavar="FD",
+                        help="Para --extrair/--extrair-todas: emite eventos de progresso (etapas, lotes, arquivos) "
+                             "como JSON lines no file descriptor FD (>= 3, já aberto; stdout e stderr levam a saída "
+                             "legível). Ex.: --progress-json 3 3>prog.jsonl")
+    parser.add_argument("--calendario-todas", action="store_true",
+                        help="Gera um .ics único com os encontros de todas as turmas extraídas localmente.")
+    parser.add_argument("--reconstruir-manifesto", action="store_true",
+                        help="Regenera output/api_extraction/manifest.json a partir das extrações no disco.")
+    parser.add_argument("--servir", action="store_true",
+                        help="Serve os calendários (.ics) das turmas extraídas via HTTP, com ETag e gzip. "
+                             "Regenera sozinho quando uma extração muda.")
+    parser.add_argument("--host", default="127.0.0.1", help="Para --servir: interface de escuta. Default=127.0.0.1.")
+    parser.add_argument("--porta", type=int, default=8765, help="Para --servir: porta TCP. Default=8765.")
+    parser.add_argument("--horario", default="10:00", metavar="HH:MM",
+                        help="Para --calendario-todas/--servir: horário de início dos encontros. Default=10:00.")
+    parser.add_argument("--duracao", type=int, default=2, metavar="HORAS",
+                        help="Para --calendario-todas/--servir: duração dos encontros em horas. Default=2.")
+    parser.add_argument("--ponderadas", action="store_true",
+                        help="Relatório de ponderadas pendentes de todas as turmas extraídas, ordenado por prazo. "
+                             "Atualiza o status de todas as turmas em paralelo antes.")
+    parser.add_argument("--todas", action="store_true", help="Para --ponderadas: inclui as já entregues.")
+    parser.add_argument("--json", action="store_true", help="Para --ponderadas: saída em JSON.")
+    parser.add_argument("--sem-atualizar", action="store_true",
+                        help="Para --ponderadas: usa só os dados locais (sem rede).")
+    parser.add_argument("--rascunhos", action="store_true",
+                        help="Gera rascunhos com IA de todas as ponderadas pendentes (em lote, retomável; paralelismo via --paralelo).")
+    parser.add_argument("--turma", action="append", default=[], metavar="NOME",
+                        help="Para --rascunhos: limita a uma turma. Pode repetir.")
+    parser.add_argument("--enviar-pendentes", action="store_true",
+                        help="Envia as respostas que ficaram na fila de submissão (outbox). Paralelismo via --paralelo.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Observa as turmas extraídas (userdata + notificações) e imprime mudanças como "
+                             "JSON lines em stdout. Uma requisição por turma por intervalo.")
+    parser.add_argument("--intervalo", type=float, default=300.0, metavar="SEG",
+                        help="Para --watch: segundos entre verificações (com jitter; backoff em erros). Default=300.")
+    parser.add_argument("--saida", metavar="ARQUIVO",
+                        help="Para --calendario-todas: caminho do .ics. Default=output/api_extraction/calendario_todas.ics.")
     args = parser.parse_args(argv)
-    modo_interativo = not (args.list or args.extrair or args.extrair_todas)
+    if args.progress_json is not None:
+        import os
+        if args.progress_json < 3:
+            parser.error("--progress-json: use um file descriptor próprio (>= 3); stdout e stderr levam a saída legível")
+        try:
+            os.fstat(args.progress_json)
+        except OSError:
+            parser.error(f"--progress-json: file descriptor {args.progress_json} não está aberto "
+                         f"(ex.: --progress-json 3 3>prog.jsonl)")
+    modo_interativo = not (args.list or args.extrair or args.extrair_todas or args.calendario_todas or args.servir
+                           or args.reconstruir_manifesto or args.ponderadas or args.watch or args.rascunhos
+                           or args.enviar_pendentes)
     return args, modo_interativo
 
 
 if __name__ == "__main__":
     args, interativo = _parse_args(sys.argv[1:])
     try:
-        if interativo:
-            asyncio.run(main())
-        elif args.list:
-            asyncio.run(_listar_cli(remote=args.remote))
+        if args.list and not args.remote:
+            # Caminho rápido (cron, prompt do shell): sem asyncio, rede ou TUI
+            _listar_local()
+        elif args.reconstruir_manifesto:
+            _reconstruir_manifesto_cli()
+        elif args.calendario_todas:
+            _calendario_todas_cli(horario=args.horario, duracao=args.duracao, saida=args.saida)
         else:
-            asyncio.run(_extrair_cli(
-                nomes=args.extrair,
-                force=args.force,
-                dry_run=args.dry_run,
-                todas=args.extrair_todas,
-                paralelo=args.paralelo,
-            ))
+            import asyncio
+
+            if interativo:
+                asyncio.run(main())
+            elif args.list:
+                asyncio.run(_listar_cli(remote=args.remote))
+            elif args.servir:
+                asyncio.run(_servir_cli(host=args.host, porta=args.porta, horario=args.horario, duracao=args.duracao))
+            elif args.watch:
+                asyncio.run(_watch_cli(intervalo=args.intervalo, paralelo=args.paralelo))
+            elif args.enviar_pendentes:
+                asyncio.run(_enviar_pendentes_cli(paralelo=args.paralelo))
+            elif args.rascunhos:
+                asyncio.run(_rascunhos_cli(turmas_filtro=args.turma, paralelo=args.paralelo))
+            elif args.ponderadas:
+                asyncio.run(_ponderadas_cli(
+                    todas=args.todas,
+                    como_json=args.json,
+                    atualizar=not args.sem_atualizar,
+                    paralelo=args.paralelo,
+                ))
+            else:
+                asyncio.run(_extrair_cli(
+                    nomes=args.extrair,
+                    force=args.force,
+                    dry_run=args.dry_run,
+                    todas=args.extrair_todas,
+                    paralelo=args.paralelo or 1,
+                    progress_fd=args.progress_json,
+                ))
     except KeyboardInterrupt:
         rprint("\n[yellow]Interrompido pelo usuário[/yellow]")
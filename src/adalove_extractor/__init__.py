@@ -8,11 +8,30 @@ com enriquecimento inteligente de dados.
 __version__ = "3.0.0"
 __author__ = "Fernando Bertholdo"
 
-from .models.card import Card
-from .models.enriched_card import EnrichedCard
-
 __all__ = ["Card", "EnrichedCard", "__version__"]
 
+# Os modelos (pydantic) são carregados sob demanda (PEP 562): importar qualquer
+# subpacote executa este __init__, e o CLI não deve pagar o import do pydantic
+# em comandos que só leem arquivos locais (ex.: --list).
+_LAZY_ATTRS = {
+    "Card": ".models.card",
+    "EnrichedCard": ".models.enriched_card",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
 
 
 
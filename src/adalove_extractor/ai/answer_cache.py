@@ -0,0 +1,128 @@
+"""
+Cache persistente de esqueletos e respostas gerados.
+
+Cada geração leva dezenas de segundos, e reabrir uma ponderada (ou uma nova
+sessão) costuma montar exatamente o mesmo prompt. `AnswerCache` guarda o texto
+gerado sob um digest de (system prompt, user prompt, configuração do gerador);
+um prompt igual devolve o texto na hora, e qualquer mudança no contexto, nas
+notas ou no comando gera outra chave.
+
+Uma entrada por arquivo JSON em `<cache_dir>/<digest>.json`. O mtime do
+arquivo marca o último uso, e as entradas menos usadas recentemente são
+removidas quando o cache passa de `max_entries`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from adalove_extractor.utils.fs import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def cache_key(system_prompt: str, user_prompt: str, generator_config: Dict[str, Any]) -> str:
+    """Digest SHA-256 de (system prompt, user prompt, configuração do gerador)."""
+    payload = json.dumps(
+        {"v": CACHE_VERSION, "system": system_prompt, "user": user_prompt, "gerador": generator_config},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def generator_config(command: Sequence[str]) -> Dict[str, Any]:
+    """Parte da configuração do gerador que muda o texto produzido."""
+    return {"command": list(command)}
+
+
+class AnswerCache:
+    """
+    Cache LRU em disco de textos gerados, indexado por digest do prompt.
+
+    Example:
+        >>> cache = AnswerCache(output_dir / "cache_ia")
+        >>> chave = cache_key(system_prompt, user_prompt, generator_config(gen.command))
+        >>> texto = cache.get(chave)
+        >>> if texto is None:
+        ...     texto = await gen.generate_async(user_prompt, system_prompt)
+        ...     cache.put(chave, texto, tipo="esqueleto")
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 200):
+        """
+        Inicializa o cache (o diretório é criado na primeira gravação).
+
+        Args:
+            cache_dir: Diretório das entradas
+            max_entries: Máximo de entradas mantidas (LRU)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Texto em cache para a chave, ou None (marca a entrada como usada)."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entrada = json.load(f)
+            texto = entrada["texto"]
+        except FileNotFoundError:
+            texto = None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Entrada de cache ilegível ({path.name}): {e}")
+            texto = None
+
+        if texto is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        logger.info(f"Cache de IA: {'hit' if texto is not None else 'miss'} ({self.resumo()})")
+        return texto
+
+    def put(self, key: str, texto: str, **meta: Any) -> None:
+        """Grava (ou substitui) a entrada e aplica o limite de tamanho."""
+        atomic_write_json(
+            self._path(key),
+            {"texto": texto, "criado_em": datetime.now().isoformat(timespec="seconds"), **meta},
+            indent=None,
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        entradas = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entradas.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        excesso = len(entradas) - self.max_entries
+        if excesso <= 0:
+            return
+        entradas.sort()
+        for _, path in entradas[:excesso]:
+            path.unlink(missing_ok=True)
+        logger.debug(f"Cache de IA: {excesso} entrada(s) antiga(s) removida(s)")
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def resumo(self) -> str:
+        return f"{self.hits} hits / {self.misses} misses, taxa {self.hit_rate:.0%}"
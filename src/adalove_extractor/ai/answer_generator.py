@@ -1,21 +1,72 @@
 """Gera respostas usando o claude CLI como subprocess."""
 
 from __future__ import annotations
+import asyncio
+import codecs
 import subprocess
 import logging
+from typing import AsyncIterator, Callable, List, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_COMMAND = ("claude", "-p")
+
+# Tamanho das leituras do stdout no modo streaming
+_CHUNK_BYTES = 1024
+
 
 class ClaudeNotFoundError(Exception):
     """Levantada quando o claude CLI não está instalado/disponível."""
 
 
+def _not_found() -> ClaudeNotFoundError:
+    return ClaudeNotFoundError(
+        "claude CLI não encontrado no PATH. "
+        "Instale via: npm install -g @anthropic-ai/claude-code"
+    )
+
+
 class AnswerGenerator:
-    """Chama o claude CLI em modo não-interativo e retorna o texto gerado."""
+    """
+    Chama o claude CLI em modo não-interativo e retorna o texto gerado.
+
+    `generate` é síncrono (scripts e testes). Nos handlers async do CLI use
+    `generate_async`/`stream`: o subprocess roda via asyncio, o texto chega em
+    pedaços conforme é produzido, cancelar a task encerra o processo, e um
+    semáforo limita quantas gerações rodam ao mesmo tempo.
+
+    Example:
+        >>> gen = AnswerGenerator(max_concurrent=2)
+        >>> async for parte in gen.stream(user_prompt, system_prompt):
+        ...     print(parte, end="")
+    """
 
-    def __init__(self, timeout: int = 180):
+    def __init__(
+        self,
+        timeout: int = 180,
+        command: Optional[Sequence[str]] = None,
+        max_concurrent: int = 2,
+    ):
+        """
+        Args:
+            timeout: Limite em segundos por geração.
+            command: Executável + argumentos; o prompt vai como último argumento
+                (default: `claude -p`).
+            max_concurrent: Gerações simultâneas em `generate_async`/`stream`.
+        """
         self.timeout = timeout
+        self.command: List[str] = list(command or DEFAULT_COMMAND)
+        self.max_concurrent = max(1, max_concurrent)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _build_cmd(self, user_prompt: str, system_prompt: str) -> List[str]:
+        # Embute o system prompt no início do prompt para compatibilidade
+        # com qualquer versão do claude CLI
+        full_prompt = (
+            f"<system>\n{system_prompt}\n</system>\n\n"
+            f"<user>\n{user_prompt}\n</user>"
+        )
+        return [*self.command, full_prompt]
 
     def generate(self, user_prompt: str, system_prompt: str) -> str:
         """
@@ -32,14 +83,7 @@ class AnswerGenerator:
             ClaudeNotFoundError: Se claude CLI não estiver no PATH.
             RuntimeError: Se claude retornar código de erro.
         """
-        # Embute o system prompt no início do prompt para compatibilidade
-        # com qualquer versão do claude CLI
-        full_prompt = (
-            f"<system>\n{system_prompt}\n</system>\n\n"
-            f"<user>\n{user_prompt}\n</user>"
-        )
-
-        cmd = ["claude", "-p", full_prompt]
+        cmd = self._build_cmd(user_prompt, system_prompt)
 
         logger.debug("Chamando claude CLI...")
         try:
@@ -50,10 +94,7 @@ class AnswerGenerator:
                 timeout=self.timeout,
             )
         except FileNotFoundError as e:
-            raise ClaudeNotFoundError(
-                "claude CLI não encontrado no PATH. "
-                "Instale via: npm install -g @anthropic-ai/claude-code"
-            ) from e
+            raise _not_found() from e
 
         if result.returncode != 0:
             error_msg = result.stderr or "erro desconhecido"
@@ -62,3 +103,106 @@ class AnswerGenerator:
             )
 
         return result.stdout.strip()
+
+    # ------------------------------------------------------------------
+    # Async
+    # ------------------------------------------------------------------
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Criado sob demanda: o semáforo se liga ao event loop em uso
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def stream(self, user_prompt: str, system_prompt: str) -> AsyncIterator[str]:
+        """
+        Gera texto via claude CLI, entregando o stdout em pedaços.
+
+        Se a task for cancelada (ou o consumidor parar de iterar) o processo é
+        encerrado. Erros seguem a mesma semântica de `generate`; estourar o
+        `timeout` levanta RuntimeError.
+
+        Yields:
+            Pedaços do texto gerado, na ordem em que chegam (sem strip).
+
+        Raises:
+            ClaudeNotFoundError: Se claude CLI não estiver no PATH.
+            RuntimeError: Se claude retornar código de erro ou exceder o timeout.
+        """
+        cmd = self._build_cmd(user_prompt, system_prompt)
+
+        async with self.semaphore:
+            logger.debug("Chamando claude CLI (streaming)...")
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            except FileNotFoundError as e:
+                raise _not_found() from e
+
+            # stderr é drenado em paralelo para o processo nunca travar no pipe
+            stderr_task = asyncio.ensure_future(proc.stderr.read())
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timeout
+            try:
+                while True:
+                    restante = deadline - loop.time()
+                    if restante <= 0:
+                        raise asyncio.TimeoutError
+                    chunk = await asyncio.wait_for(proc.stdout.read(_CHUNK_BYTES), restante)
+                    if not chunk:
+                        break
+                    texto = decoder.decode(chunk)
+                    if texto:
+                        yield texto
+                texto = decoder.decode(b"", final=True)
+                if texto:
+                    yield texto
+
+                returncode = await asyncio.wait_for(proc.wait(), max(deadline - loop.time(), 0.1))
+                stderr = (await stderr_task).decode("utf-8", errors="replace")
+            except asyncio.TimeoutError:
+                raise RuntimeError(
+                    f"claude CLI excedeu o tempo limite de {self.timeout}s"
+                ) from None
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+                    logger.debug("claude CLI encerrado antes de terminar")
+                if not stderr_task.done():
+                    stderr_task.cancel()
+
+        if returncode != 0:
+            raise RuntimeError(
+                f"claude CLI retornou código {returncode}: {stderr or 'erro desconhecido'}"
+            )
+
+    async def generate_async(
+        self,
+        user_prompt: str,
+        system_prompt: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Versão async de `generate`, sem bloquear o event loop.
+
+        Args:
+            user_prompt: Contexto + tarefa montados pelo ContextBuilder.
+            system_prompt: Instruções de estilo carregadas pelo SystemPromptLoader.
+            on_chunk: Chamado com o texto acumulado a cada pedaço recebido.
+
+        Returns:
+            Texto gerado pelo Claude (com strip).
+        """
+        partes: List[str] = []
+        async for parte in self.stream(user_prompt, system_prompt):
+            partes.append(parte)
+            if on_chunk is not None:
+                on_chunk("".join(partes))
+        return "".join(partes).strip()
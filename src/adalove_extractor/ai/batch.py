@@ -0,0 +1,207 @@
+"""
+Geração de rascunhos em lote para as ponderadas pendentes.
+
+O fluxo interativo gera uma ponderada por vez. `gerar_rascunhos` recebe a lista
+de ponderadas pendentes (de `ponderadas.json`), monta o contexto de cada uma e
+roda esqueleto + resposta completa num pool de workers limitado. O esqueleto
+entra como nota da geração completa, no mesmo formato das correções do fluxo
+interativo. Cada rascunho é gravado pelo `salvar` recebido (no CLI,
+`salvar_rascunho`).
+
+O progresso fica num ledger JSON lines (`JobLedger`): cada transição de um job
+é uma linha acrescentada ao arquivo. Se o lote for interrompido, a próxima
+execução pula os jobs concluídos e reaproveita os esqueletos já gerados.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .answer_cache import AnswerCache, cache_key, generator_config
+from .answer_generator import AnswerGenerator, ClaudeNotFoundError
+from .context_builder import ContextBuilder
+
+logger = logging.getLogger(__name__)
+
+LEDGER_FILENAME = "rascunhos_lote.jsonl"
+
+# Estados de um job no ledger
+PENDENTE = "pendente"
+ESQUELETO = "esqueleto"
+CONCLUIDO = "concluido"
+ERRO = "erro"
+
+
+def job_id(turma: str, ponderada: Dict[str, Any]) -> str:
+    """Identificador estável do job: turma + UUID da atividade (ou título)."""
+    return f"{turma}:{ponderada.get('student_activity_uuid') or ponderada['titulo']}"
+
+
+class JobLedger:
+    """
+    Ledger append-only (JSON lines) do estado dos jobs de um lote.
+
+    Example:
+        >>> ledger = JobLedger(output_dir / LEDGER_FILENAME)
+        >>> ledger.registrar("T13:uuid", ESQUELETO, esqueleto="...")
+        >>> ledger.estado("T13:uuid")["estado"]
+        'esqueleto'
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._estados: Dict[str, Dict[str, Any]] = {}
+        self._carregar()
+
+    def _carregar(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for numero, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    registro = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha cortada por uma interrupção no meio da escrita
+                    logger.warning(f"Ledger {self.path.name}: linha {numero} ilegível ignorada")
+                    continue
+                anterior = self._estados.get(registro["job"], {})
+                self._estados[registro["job"]] = {**anterior, **registro}
+
+    def estado(self, job: str) -> Dict[str, Any]:
+        """Estado acumulado do job (vazio se nunca registrado)."""
+        return self._estados.get(job, {})
+
+    def registrar(self, job: str, estado: str, **campos: Any) -> None:
+        """Acrescenta uma transição ao ledger (gravada na hora)."""
+        registro = {"job": job, "estado": estado, "ts": datetime.now().isoformat(timespec="seconds"), **campos}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self._estados[job] = {**self._estados.get(job, {}), **registro}
+
+
+async def gerar_rascunhos(
+    jobs: List[Dict[str, Any]],
+    carregar_extracao: Callable[[str], Optional[Dict[str, Any]]],
+    salvar: Callable[[str, Dict[str, Any], str], Path],
+    generator: AnswerGenerator,
+    system_prompt: str,
+    ledger: JobLedger,
+    concorrencia: int = 2,
+    cache: Optional[AnswerCache] = None,
+    builder: Optional[ContextBuilder] = None,
+    emitir: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, int]:
+    """
+    Gera esqueleto + resposta de cada job num pool de workers.
+
+    Args:
+        jobs: Dicts {"turma": nome, "ponderada": dict de ponderadas.json}
+        carregar_extracao: Nome da turma → extração completa (contexto)
+        salvar: (turma, ponderada, resposta) → caminho do rascunho gravado
+        generator: Gerador (o semáforo dele também limita as gerações)
+        system_prompt: System prompt carregado pelo SystemPromptLoader
+        ledger: Ledger do lote (jobs concluídos são pulados)
+        concorrencia: Número de workers
+        cache: Cache de gerações (opcional)
+        builder: ContextBuilder (default: novo)
+        emitir: Recebe um evento por transição de job (progresso)
+
+    Returns:
+        Contagens {"concluidos", "pulados", "erros"}
+
+    Raises:
+        ClaudeNotFoundError: Se o gerador não estiver instalado (aborta o lote).
+    """
+    builder = builder or ContextBuilder()
+    extracoes: Dict[str, Optional[Dict[str, Any]]] = {}
+    contagem = {"concluidos": 0, "pulados": 0, "erros": 0}
+    fila: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    def _emitir(job: str, estado: str, **campos: Any) -> None:
+        if emitir is not None:
+            emitir({"job": job, "estado": estado, **campos})
+
+    async def _gerar(user_prompt: str) -> str:
+        chave = None
+        if cache is not None:
+            chave = cache_key(system_prompt, user_prompt, generator_config(generator.command))
+            texto = cache.get(chave)
+            if texto is not None:
+                return texto
+        texto = await generator.generate_async(user_prompt=user_prompt, system_prompt=system_prompt)
+        if chave is not None:
+            cache.put(chave, texto)
+        return texto
+
+    async def _processar(item: Dict[str, Any]) -> None:
+        turma, pond = item["turma"], item["ponderada"]
+        job = job_id(turma, pond)
+        anterior = ledger.estado(job)
+        if anterior.get("estado") == CONCLUIDO:
+            contagem["pulados"] += 1
+            _emitir(job, "pulado", rascunho=anterior.get("rascunho"))
+            return
+
+        if turma not in extracoes:
+            extracoes[turma] = carregar_extracao(turma)
+        extracao = extracoes[turma]
+        if extracao is None:
+            raise RuntimeError(f"extração de {turma} não encontrada")
+
+        esqueleto = anterior.get("esqueleto")
+        if not esqueleto:
+            ledger.registrar(job, PENDENTE, turma=turma, titulo=pond["titulo"])
+            esqueleto = await _gerar(builder.build(pond, extracao, skeleton_mode=True))
+            ledger.registrar(job, ESQUELETO, esqueleto=esqueleto)
+            _emitir(job, ESQUELETO)
+
+        resposta = await _gerar(builder.build(
+            pond, extracao,
+            user_notes=f"ESQUELETO APROVADO:\n{esqueleto}",
+            skeleton_mode=False,
+        ))
+        caminho = salvar(turma, pond, resposta)
+        ledger.registrar(job, CONCLUIDO, rascunho=str(caminho))
+        contagem["concluidos"] += 1
+        _emitir(job, CONCLUIDO, rascunho=str(caminho))
+
+    async def _worker() -> None:
+        while True:
+            item = await fila.get()
+            try:
+                await _processar(item)
+            except ClaudeNotFoundError:
+                raise
+            except Exception as e:
+                job = job_id(item["turma"], item["ponderada"])
+                logger.error(f"Rascunho de {job} falhou: {e}")
+                ledger.registrar(job, ERRO, erro=str(e))
+                contagem["erros"] += 1
+                _emitir(job, ERRO, erro=str(e))
+            finally:
+                fila.task_done()
+
+    for item in jobs:
+        fila.put_nowait(item)
+
+    workers = [asyncio.create_task(_worker()) for _ in range(max(1, min(concorrencia, len(jobs))))]
+    fila_vazia = asyncio.create_task(fila.join())
+    try:
+        # Termina quando a fila esvazia ou quando um worker morre (ClaudeNotFoundError)
+        await asyncio.wait([fila_vazia, *workers], return_when=asyncio.FIRST_COMPLETED)
+        for worker in workers:
+            if worker.done() and worker.exception() is not None:
+                raise worker.exception()
+    finally:
+        for tarefa in [fila_vazia, *workers]:
+            tarefa.cancel()
+        await asyncio.gather(fila_vazia, *workers, return_exceptions=True)
+
+    return contagem
@@ -1,10 +1,64 @@
-"""Monta o contexto completo para geração de resposta de ponderada."""
+"""
+Monta o contexto completo para geração de resposta de ponderada.
+
+O prompt tem um orçamento de caracteres (`budget_chars`). Metadados, pergunta,
+notas e tarefa entram sempre; autoestudos e transcrição disputam o restante.
+A transcrição é dividida em trechos ranqueados por BM25 contra a pergunta e os
+títulos dos autoestudos (`ranking.py`), e só os trechos mais relevantes que
+cabem no orçamento entram, na ordem original.
+"""
 
 from __future__ import annotations
 
+import logging
+
+from ..utils.text import normalize_title
+from .ranking import dividir_trechos, ranquear
+
+logger = logging.getLogger(__name__)
+
+# ~6k tokens: cobre pergunta, autoestudos e uma boa parte de uma aula
+DEFAULT_BUDGET_CHARS = 24_000
+CHUNK_CHARS = 1200
+# Estimativa grosseira de tokens para texto em português
+CHARS_POR_TOKEN = 4
+
+# Material relacionado vindo do índice de busca (outras semanas e turmas)
+RETRIEVAL_K = 5
+RETRIEVAL_CHARS = 4000
+_DESCRICAO_RELACIONADO_CHARS = 500
+_CABECALHO_RELACIONADOS = "\n## MATERIAIS RELACIONADOS (OUTRAS SEMANAS E TURMAS)"
+
+_SEPARADOR_TRECHOS = "\n[...]\n"
+
 
 class ContextBuilder:
-    """Constrói o prompt de usuário com todo o contexto disponível."""
+    """Constrói o prompt de usuário com o contexto disponível, dentro do orçamento."""
+
+    def __init__(
+        self,
+        budget_chars: int | None = DEFAULT_BUDGET_CHARS,
+        chunk_chars: int = CHUNK_CHARS,
+        retriever=None,
+        retrieval_k: int = RETRIEVAL_K,
+        retrieval_chars: int = RETRIEVAL_CHARS,
+    ):
+        """
+        Args:
+            budget_chars: Tamanho máximo do prompt em caracteres (None = sem limite).
+            chunk_chars: Tamanho dos trechos em que a transcrição é dividida.
+            retriever: `RetrievalIndex` para buscar material relacionado de
+                outras semanas/turmas (opcional).
+            retrieval_k: Máximo de itens relacionados.
+            retrieval_chars: Parte do orçamento reservada aos itens relacionados.
+        """
+        self.budget_chars = budget_chars
+        self.chunk_chars = chunk_chars
+        self.retriever = retriever
+        self.retrieval_k = retrieval_k
+        self.retrieval_chars = retrieval_chars
+        # Tamanho e cortes do último prompt montado (para exibir/logar)
+        self.last_stats: dict = {}
 
     def build(
         self,
@@ -45,30 +99,79 @@ class ContextBuilder:
         if pergunta:
             sections.append(f"\n## PERGUNTA DA ATIVIDADE\n{pergunta}")
 
-        # 3. Autoestudos relacionados
+        # 5. Notas do usuário (opcional) — montadas antes para entrar no orçamento fixo
+        notas = []
+        if user_notes and user_notes.strip():
+            notas.append(f"\n## INSTRUÇÕES E NOTAS ADICIONAIS\n{user_notes.strip()}")
+
+        tarefa = self._tarefa(skeleton_mode)
+        restante = None
+        if self.budget_chars is not None:
+            fixo = len("\n".join(sections + notas + [tarefa]))
+            restante = max(0, self.budget_chars - fixo)
+
+        # 3. Autoestudos relacionados (os mais relevantes, se não couberem todos)
         autoestudos = self._extract_autoestudos(ponderada, extracao_data)
-        if autoestudos:
-            sections.append("\n## MATERIAIS E AUTOESTUDOS RELACIONADOS")
-            for titulo, auto in autoestudos.items():
-                sections.append(f"\n### {titulo}")
-                if auto.get("descricao"):
-                    sections.append(auto["descricao"])
-                conteudos = auto.get("conteudos_relacionados") or []
-                if conteudos:
-                    links = "\n".join(f"- {c}" for c in conteudos)
-                    sections.append(f"**Links:**\n{links}")
-
-        # 4. Transcrição (opcional)
+        blocos = [self._bloco_autoestudo(titulo, auto) for titulo, auto in autoestudos.items()]
+        consulta_base = f"{ponderada.get('titulo', '')} {pergunta}"
+        cabecalho = "\n## MATERIAIS E AUTOESTUDOS RELACIONADOS"
+        incluidos, sobra = self._selecionar(
+            blocos, consulta_base, None if restante is None else restante - len(cabecalho) - 1, "\n"
+        )
+        if incluidos:
+            sections.append(cabecalho)
+            sections.extend(blocos[i] for i in incluidos)
+            restante = sobra
+
+        # 3b. Material relacionado de outras semanas/turmas (índice de busca)
+        relacionados = self._relacionados(ponderada, autoestudos, restante)
+        if relacionados:
+            sections.append(_CABECALHO_RELACIONADOS)
+            sections.extend(relacionados)
+            if restante is not None:
+                restante -= sum(len(t) + 1 for t in [_CABECALHO_RELACIONADOS, *relacionados])
+
+        # 4. Transcrição (opcional): trechos ranqueados contra pergunta + autoestudos
+        trechos_total = trechos_incluidos = 0
         if transcript and transcript.strip():
-            sections.append(f"\n## TRANSCRIÇÃO DA AULA\n{transcript.strip()}")
+            texto = transcript.strip()
+            cabecalho = "\n## TRANSCRIÇÃO DA AULA\n"
+            if restante is None or len(cabecalho) + len(texto) <= restante:
+                sections.append(f"{cabecalho}{texto}")
+                trechos_total = trechos_incluidos = 1
+            else:
+                trechos = dividir_trechos(texto, self.chunk_chars)
+                consulta = f"{consulta_base} {' '.join(autoestudos)}"
+                escolhidos, _ = self._selecionar(
+                    trechos, consulta, restante - len(cabecalho), _SEPARADOR_TRECHOS
+                )
+                trechos_total, trechos_incluidos = len(trechos), len(escolhidos)
+                if escolhidos:
+                    sections.append(cabecalho + self._juntar_trechos(trechos, escolhidos))
 
-        # 5. Notas do usuário (opcional)
-        if user_notes and user_notes.strip():
-            sections.append(f"\n## INSTRUÇÕES E NOTAS ADICIONAIS\n{user_notes.strip()}")
+        sections.extend(notas)
+        sections.append(tarefa)
+        prompt = "\n".join(sections)
 
-        # 6. Instrução final
+        self.last_stats = {
+            "chars": len(prompt),
+            "tokens_estimados": len(prompt) // CHARS_POR_TOKEN,
+            "budget_chars": self.budget_chars,
+            "autoestudos": (len(incluidos), len(blocos)),
+            "relacionados": len(relacionados),
+            "trechos_transcricao": (trechos_incluidos, trechos_total),
+        }
+        logger.info(
+            f"Prompt montado: {len(prompt)} chars (~{len(prompt) // CHARS_POR_TOKEN} tokens), "
+            f"autoestudos {len(incluidos)}/{len(blocos)}, relacionados {len(relacionados)}, "
+            f"trechos da transcrição {trechos_incluidos}/{trechos_total}"
+        )
+        return prompt
+
+    def _tarefa(self, skeleton_mode: bool) -> str:
+        """Seção final com a instrução (esqueleto ou resposta completa)."""
         if skeleton_mode:
-            sections.append(
+            return (
                 "\n## TAREFA\n"
                 "Com base no contexto acima, gere APENAS o **esqueleto/estrutura** da resposta. "
                 "Inclua:\n"
@@ -78,15 +181,95 @@ class ContextBuilder:
                 "4. Fontes de contexto que serão usadas\n\n"
                 "NÃO escreva a resposta completa ainda. Apenas a estrutura para validação."
             )
-        else:
-            sections.append(
-                "\n## TAREFA\n"
-                "Com base em todo o contexto acima, escreva a resposta completa para a "
-                "atividade ponderada. Siga as instruções de estilo do system prompt e "
-                "priorize o conteúdo do contexto fornecido."
-            )
+        return (
+            "\n## TAREFA\n"
+            "Com base em todo o contexto acima, escreva a resposta completa para a "
+            "atividade ponderada. Siga as instruções de estilo do system prompt e "
+            "priorize o conteúdo do contexto fornecido."
+        )
+
+    @staticmethod
+    def _bloco_autoestudo(titulo: str, auto: dict) -> str:
+        linhas = [f"\n### {titulo}"]
+        if auto.get("descricao"):
+            linhas.append(auto["descricao"])
+        conteudos = auto.get("conteudos_relacionados") or []
+        if conteudos:
+            links = "\n".join(f"- {c}" for c in conteudos)
+            linhas.append(f"**Links:**\n{links}")
+        return "\n".join(linhas)
+
+    def _relacionados(self, ponderada: dict, autoestudos: dict, restante: int | None) -> list[str]:
+        """Blocos dos itens do índice de busca mais relevantes, dentro da reserva do orçamento."""
+        if self.retriever is None:
+            return []
+        aval = ponderada.get("avaliacao", {})
+        consulta = " ".join([
+            ponderada.get("titulo", ""), aval.get("pergunta", ""), ponderada.get("descricao") or "",
+        ])
+        excluir = {ponderada.get("student_activity_uuid")}
+        excluir.update(auto.get("student_activity_uuid") for auto in autoestudos.values())
+        vistos = {normalize_title(t) for t in [*autoestudos, ponderada.get("titulo", ""), ponderada.get("encontro_titulo", "")]}
+
+        limite = self.retrieval_chars if restante is None else min(self.retrieval_chars, restante)
+        limite -= len(_CABECALHO_RELACIONADOS) + 1
+        blocos = []
+        # Folga no k: o mesmo material se repete entre turmas e é deduplicado pelo título
+        for doc, _ in self.retriever.buscar(consulta, k=self.retrieval_k * 3, excluir=excluir - {None}):
+            chave = normalize_title(doc["titulo"]) or doc["titulo"]
+            if chave in vistos:
+                continue
+            bloco = self._bloco_relacionado(doc)
+            if len(bloco) + 1 > limite:
+                continue
+            vistos.add(chave)
+            blocos.append(bloco)
+            limite -= len(bloco) + 1
+            if len(blocos) >= self.retrieval_k:
+                break
+        return blocos
+
+    @staticmethod
+    def _bloco_relacionado(doc: dict) -> str:
+        linhas = [f"\n### {doc['titulo']}", f"_{doc['turma']} · {doc['semana']}_"]
+        descricao = doc.get("descricao") or ""
+        if descricao:
+            if len(descricao) > _DESCRICAO_RELACIONADO_CHARS:
+                descricao = descricao[:_DESCRICAO_RELACIONADO_CHARS].rstrip() + "..."
+            linhas.append(descricao)
+        if doc.get("assuntos"):
+            linhas.append(f"**Assuntos:** {', '.join(doc['assuntos'])}")
+        if doc.get("links"):
+            links = "\n".join(f"- {c}" for c in doc["links"][:5])
+            linhas.append(f"**Links:**\n{links}")
+        return "\n".join(linhas)
+
+    @staticmethod
+    def _selecionar(textos: list[str], consulta: str, restante: int | None, separador: str):
+        """
+        Escolhe os textos mais relevantes que cabem em `restante` caracteres.
+
+        Returns:
+            (índices escolhidos em ordem original, orçamento que sobrou)
+        """
+        if restante is None:
+            return list(range(len(textos))), None
+        escolhidos = []
+        for indice, _ in ranquear(textos, consulta):
+            custo = len(textos[indice]) + len(separador)
+            if custo <= restante:
+                escolhidos.append(indice)
+                restante -= custo
+        return sorted(escolhidos), restante
 
-        return "\n".join(sections)
+    @staticmethod
+    def _juntar_trechos(trechos: list[str], indices: list[int]) -> str:
+        """Junta trechos escolhidos, marcando com [...] os saltos na transcrição."""
+        partes = [trechos[indices[0]]]
+        for anterior, atual in zip(indices, indices[1:]):
+            partes.append("\n" if atual == anterior + 1 else _SEPARADOR_TRECHOS)
+            partes.append(trechos[atual])
+        return "".join(partes)
 
     def _extract_autoestudos(self, ponderada: dict, extracao_data: dict) -> dict:
         """Extrai autoestudos do encontro ancorado à ponderada."""
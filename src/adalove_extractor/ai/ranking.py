@@ -0,0 +1,129 @@
+"""
+Ranqueamento lexical local (BM25) de trechos de contexto.
+
+Transcrições de aula longas não cabem inteiras no prompt sem inflar tempo e
+custo de geração. Aqui o texto é dividido em trechos (`dividir_trechos`) e cada
+trecho recebe uma pontuação BM25 contra a consulta — pergunta da ponderada e
+títulos dos autoestudos —, sem rede nem dependências externas.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Palavras muito frequentes em português que não ajudam a diferenciar trechos
+STOPWORDS = frozenset("""
+a ao aos as ate com como da das de dela dele deles do dos e ela elas ele eles em entre era eram
+essa esse esta estao este eu foi foram ha isso isto ja la lhe mais mas me mesmo meu minha muito
+na nao nas nem no nos nossa nosso num numa o os ou para pela pelas pelo pelos por qual quando que
+quem se sem ser seu sua sao so tambem te tem tu tua um uma umas uns voce voces vai vamos entao aqui
+""".split())
+
+_TOKEN_RE = re.compile(r"\w+")
+_SENTENCA_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Tokens minúsculos, sem acentos e sem stopwords (para pontuação lexical)."""
+    if not texto:
+        return []
+    sem_acento = unicodedata.normalize("NFKD", texto.lower()).encode("ascii", "ignore").decode("ascii")
+    return [t for t in _TOKEN_RE.findall(sem_acento) if len(t) > 1 and t not in STOPWORDS]
+
+
+def dividir_trechos(texto: str, max_chars: int = 1200) -> List[str]:
+    """
+    Divide um texto em trechos de até `max_chars`, respeitando parágrafos.
+
+    Parágrafos curtos são agrupados; parágrafos longos são quebrados em
+    sentenças e, em último caso, no limite de caracteres.
+
+    Args:
+        texto: Texto completo (ex.: transcrição)
+        max_chars: Tamanho máximo de cada trecho
+
+    Returns:
+        Trechos na ordem original
+    """
+    max_chars = max(1, max_chars)
+    unidades: List[str] = []
+    for paragrafo in re.split(r"\n\s*\n", texto.strip()):
+        paragrafo = paragrafo.strip()
+        if not paragrafo:
+            continue
+        if len(paragrafo) <= max_chars:
+            unidades.append(paragrafo)
+            continue
+        for sentenca in _SENTENCA_RE.split(paragrafo):
+            while len(sentenca) > max_chars:
+                unidades.append(sentenca[:max_chars])
+                sentenca = sentenca[max_chars:]
+            if sentenca.strip():
+                unidades.append(sentenca.strip())
+
+    trechos: List[str] = []
+    atual = ""
+    for unidade in unidades:
+        if atual and len(atual) + 1 + len(unidade) > max_chars:
+            trechos.append(atual)
+            atual = unidade
+        else:
+            atual = f"{atual}\n{unidade}" if atual else unidade
+    if atual:
+        trechos.append(atual)
+    return trechos
+
+
+class BM25:
+    """
+    Okapi BM25 sobre uma coleção pequena de documentos já tokenizados.
+
+    Example:
+        >>> bm25 = BM25([tokenizar(t) for t in trechos])
+        >>> bm25.pontuar(tokenizar("Como usar FastAPI?"))
+        [0.0, 2.31, ...]
+    """
+
+    def __init__(self, documentos: Sequence[Sequence[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.frequencias: List[Counter] = [Counter(doc) for doc in documentos]
+        self.tamanhos = [len(doc) for doc in documentos]
+        self.media_tamanho = (sum(self.tamanhos) / len(self.tamanhos)) if self.tamanhos else 0.0
+
+        df: Counter = Counter()
+        for freq in self.frequencias:
+            df.update(freq.keys())
+        n = len(self.frequencias)
+        self.idf: Dict[str, float] = {
+            termo: math.log(1 + (n - qtd + 0.5) / (qtd + 0.5)) for termo, qtd in df.items()
+        }
+
+    def pontuar(self, consulta: Iterable[str]) -> List[float]:
+        """Pontuação de cada documento para a consulta (mesma ordem da coleção)."""
+        termos = [t for t in set(consulta) if t in self.idf]
+        pontuacoes = []
+        for freq, tamanho in zip(self.frequencias, self.tamanhos):
+            norma = self.k1 * (1 - self.b + self.b * tamanho / (self.media_tamanho or 1))
+            total = 0.0
+            for termo in termos:
+                tf = freq.get(termo, 0)
+                if tf:
+                    total += self.idf[termo] * tf * (self.k1 + 1) / (tf + norma)
+            pontuacoes.append(total)
+        return pontuacoes
+
+
+def ranquear(textos: Sequence[str], consulta: str) -> List[Tuple[int, float]]:
+    """
+    Índices de `textos` ordenados por relevância para a consulta.
+
+    Empates (inclusive pontuação zero) mantêm a ordem original.
+
+    Returns:
+        Lista de (índice, pontuação), do mais relevante ao menos relevante
+    """
+    pontuacoes = BM25([tokenizar(t) for t in textos]).pontuar(tokenizar(consulta))
+    return sorted(enumerate(pontuacoes), key=lambda par: (-par[1], par[0]))
@@ -0,0 +1,344 @@
+"""
+Índice de busca local (BM25) sobre todo o material extraído.
+
+`ContextBuilder` só enxerga os autoestudos ancorados ao encontro da ponderada.
+Material relevante de outras semanas, ou de turmas anteriores, fica de fora.
+`RetrievalIndex` indexa encontros, autoestudos e cards sem âncora de todas as
+extrações em `output/api_extraction/*`. Cada item vira um documento com título,
+descrição, assuntos e links. `buscar` devolve os k mais relevantes para uma
+consulta.
+
+Layout em `<output_dir>/indice_busca/`:
+
+    turmas/<slug>.json       documentos tokenizados de uma turma + assinatura
+    meta.json                geração atual, vocabulário (termo → offset, df), avgdl
+    postings.<g>.bin         pares uint32 (doc, tf), contíguos por termo
+    doclen.<g>.bin           uint32 por documento
+    docs.<g>.bin             documentos em JSON, concatenados
+    docs_off.<g>.bin         uint64 por documento (+1): offsets em docs.<g>.bin
+
+A atualização é incremental: só turmas cuja extração mudou (mtime/tamanho de
+`extracao_completa.json` e do marcador de pendências) são relidas e
+re-tokenizadas; as demais vêm de `turmas/<slug>.json`. As consultas leem os
+arquivos binários via mmap, sem reparsear JSON de extração: só o vocabulário
+(meta.json) é carregado, e só os documentos do top-k são decodificados.
+
+Cada reconstrução grava uma nova geração `<g>` e troca `meta.json` por último,
+então leitores com o índice aberto continuam vendo a geração anterior.
+"""
+
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from adalove_extractor.io.uuid_index import EXTRACTION_FILENAME, PENDING_FILENAME, ShardedExtraction
+from adalove_extractor.utils.fs import atomic_write_json, atomic_writer
+
+from .ranking import tokenizar
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIRNAME = "indice_busca"
+INDEX_VERSION = 1
+META_FILENAME = "meta.json"
+
+K1 = 1.5
+B = 0.75
+
+
+# ---------------------------------------------------------------------------
+# Documentos
+# ---------------------------------------------------------------------------
+
+def documentos_extracao(turma: str, extracao: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Documentos indexáveis de uma extração (encontros, autoestudos, sem âncora).
+
+    Returns:
+        Dicts com uuid, turma, semana, data, tipo, titulo, descricao, assuntos e links
+    """
+    docs = []
+
+    def _doc(semana: str, data: Optional[str], titulo: str, no: Dict[str, Any], tipo: str) -> None:
+        docs.append({
+            "uuid": no.get("student_activity_uuid"),
+            "turma": turma,
+            "semana": semana,
+            "data": data,
+            "tipo": tipo,
+            "titulo": titulo or "",
+            "descricao": no.get("descricao") or "",
+            "assuntos": [a for a in no.get("assuntos_relacionados") or [] if a],
+            "links": [str(c) for c in no.get("conteudos_relacionados") or [] if c],
+        })
+
+    for semana, semana_data in (extracao.get("semanas") or {}).items():
+        for data, encontro in (semana_data.get("encontros") or {}).items():
+            _doc(semana, data, encontro.get("titulo"), encontro, encontro.get("tipo") or "encontro")
+            for titulo, auto in (encontro.get("autoestudos") or {}).items():
+                _doc(semana, data, titulo, auto, "autoestudo")
+        for card in semana_data.get("sem_ancora") or []:
+            _doc(semana, (card.get("data_hora") or "")[:10] or None, card.get("titulo"), card,
+                 card.get("card_type") or "atividade")
+    return docs
+
+
+def texto_documento(doc: Dict[str, Any]) -> str:
+    """Texto indexado de um documento (título com peso dobrado)."""
+    return " ".join([doc["titulo"], doc["titulo"], doc["descricao"], *doc["assuntos"], *doc["links"]])
+
+
+def _assinatura(turma_dir: Path) -> List[int]:
+    """Muda sempre que a extração (ou um shard pendente) da turma muda."""
+    partes: List[int] = []
+    for nome in (EXTRACTION_FILENAME, PENDING_FILENAME):
+        try:
+            st = (turma_dir / nome).stat()
+            partes += [st.st_mtime_ns, st.st_size]
+        except FileNotFoundError:
+            partes += [0, 0]
+    return partes
+
+
+# ---------------------------------------------------------------------------
+# Índice
+# ---------------------------------------------------------------------------
+
+class RetrievalIndex:
+    """
+    Índice BM25 persistente (mmap) sobre as extrações de todas as turmas.
+
+    Example:
+        >>> indice = RetrievalIndex(OUTPUT_DIR / INDEX_DIRNAME)
+        >>> indice.atualizar(OUTPUT_DIR)       # incremental; barato se nada mudou
+        >>> for doc, score in indice.buscar("testes unitários com pytest", k=5):
+        ...     print(doc["turma"], doc["titulo"], score)
+    """
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = Path(index_dir)
+        self.turmas_dir = self.index_dir / "turmas"
+        self.meta_path = self.index_dir / META_FILENAME
+        self._meta: Optional[Dict[str, Any]] = None
+        self._mmaps: List[Tuple[mmap.mmap, memoryview]] = []
+        self._views: Dict[str, memoryview] = {}
+
+    # ------------------------------------------------------------------
+    # Construção
+    # ------------------------------------------------------------------
+
+    def atualizar(self, output_dir: Path) -> bool:
+        """
+        Sincroniza o índice com as extrações em `output_dir`.
+
+        Returns:
+            True se o índice foi reconstruído (alguma turma mudou)
+        """
+        output_dir = Path(output_dir)
+        meta = self._ler_meta()
+        anteriores: Dict[str, List[int]] = (meta or {}).get("turmas", {})
+
+        atuais: Dict[str, List[int]] = {}
+        for turma_dir in sorted(p.parent for p in output_dir.glob(f"*/{EXTRACTION_FILENAME}")):
+            atuais[turma_dir.name] = _assinatura(turma_dir)
+
+        if meta is not None and atuais == anteriores:
+            return False
+
+        self.turmas_dir.mkdir(parents=True, exist_ok=True)
+        for slug, assinatura in atuais.items():
+            if anteriores.get(slug) != assinatura or not (self.turmas_dir / f"{slug}.json").exists():
+                self._indexar_turma(output_dir / slug, assinatura)
+        for slug in anteriores.keys() - atuais.keys():
+            (self.turmas_dir / f"{slug}.json").unlink(missing_ok=True)
+
+        self._reconstruir(atuais)
+        return True
+
+    def _indexar_turma(self, turma_dir: Path, assinatura: List[int]) -> None:
+        extracao = ShardedExtraction(turma_dir).carregar(persistir=False) or {}
+        turma = extracao.get("turma") or turma_dir.name
+        docs = documentos_extracao(turma, extracao)
+        for doc in docs:
+            tokens = tokenizar(texto_documento(doc))
+            doc["_len"] = len(tokens)
+            doc["_tf"] = dict(Counter(tokens))
+        atomic_write_json(
+            self.turmas_dir / f"{turma_dir.name}.json",
+            {"assinatura": assinatura, "docs": docs},
+            indent=None,
+        )
+        logger.info(f"Índice de busca: {turma} reindexada ({len(docs)} documentos)")
+
+    def _reconstruir(self, turmas: Dict[str, List[int]]) -> None:
+        """Junta os documentos de todas as turmas numa nova geração dos arquivos binários."""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doclen = array("I")
+        docs_off = array("Q", [0])
+        geracao = ((self._ler_meta() or {}).get("geracao", 0) + 1)
+        docs_path = self.index_dir / f"docs.{geracao}.bin"
+
+        with atomic_writer(docs_path) as f_docs:
+            for slug in turmas:
+                with open(self.turmas_dir / f"{slug}.json", "r", encoding="utf-8") as f:
+                    docs = json.load(f)["docs"]
+                for doc in docs:
+                    doc_id = len(doclen)
+                    doclen.append(doc.pop("_len"))
+                    for termo, tf in doc.pop("_tf").items():
+                        postings.setdefault(termo, []).append((doc_id, tf))
+                    dados = json.dumps(doc, ensure_ascii=False).encode("utf-8")
+                    f_docs.write(dados)
+                    docs_off.append(docs_off[-1] + len(dados))
+
+        vocab: Dict[str, List[int]] = {}
+        plano = array("I")
+        for termo, lista in postings.items():
+            vocab[termo] = [len(plano) // 2, len(lista)]
+            for doc_id, tf in lista:
+                plano.append(doc_id)
+                plano.append(tf)
+
+        for nome, dados in (("postings", plano), ("doclen", doclen), ("docs_off", docs_off)):
+            with atomic_writer(self.index_dir / f"{nome}.{geracao}.bin") as f:
+                dados.tofile(f)
+
+        n_docs = len(doclen)
+        atomic_write_json(self.meta_path, {
+            "versao": INDEX_VERSION,
+            "geracao": geracao,
+            "turmas": turmas,
+            "n_docs": n_docs,
+            "avgdl": (sum(doclen) / n_docs) if n_docs else 0.0,
+            "vocab": vocab,
+        }, indent=None)
+        self._fechar()
+        self._meta = None
+
+        # Gerações antigas: no Linux, mmaps já abertos continuam válidos
+        for path in self.index_dir.glob("*.bin"):
+            if not path.name.endswith(f".{geracao}.bin"):
+                path.unlink(missing_ok=True)
+        logger.info(f"Índice de busca reconstruído: {n_docs} documentos, {len(vocab)} termos")
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def _ler_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Índice de busca ilegível ({e}); será reconstruído")
+            return None
+        return meta if meta.get("versao") == INDEX_VERSION else None
+
+    def _abrir(self) -> Optional[Dict[str, Any]]:
+        if self._meta is not None:
+            return self._meta
+        meta = self._ler_meta()
+        if meta is None or not meta["n_docs"]:
+            return None
+        geracao = meta["geracao"]
+        formatos = {"postings": "I", "doclen": "I", "docs_off": "Q", "docs": "B"}
+        for nome, formato in formatos.items():
+            with open(self.index_dir / f"{nome}.{geracao}.bin", "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    # mmap não aceita arquivo vazio (ex.: nenhum termo indexável)
+                    self._views[nome] = memoryview(b"").cast(formato)
+                    continue
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            base = memoryview(mm)
+            self._mmaps.append((mm, base))
+            self._views[nome] = base.cast(formato)
+        self._meta = meta
+        return meta
+
+    def _documento(self, doc_id: int) -> Dict[str, Any]:
+        inicio, fim = self._views["docs_off"][doc_id], self._views["docs_off"][doc_id + 1]
+        return json.loads(bytes(self._views["docs"][inicio:fim]).decode("utf-8"))
+
+    def buscar(
+        self,
+        consulta: str,
+        k: int = 5,
+        excluir: Iterable[str] = (),
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Os k documentos mais relevantes para a consulta (BM25).
+
+        Args:
+            consulta: Texto livre (pergunta, título...)
+            k: Máximo de resultados
+            excluir: UUIDs de atividades a ignorar (ex.: já presentes no prompt)
+
+        Returns:
+            Lista de (documento, pontuação), do mais relevante ao menos relevante
+        """
+        meta = self._abrir()
+        if meta is None:
+            return []
+        n_docs, avgdl = meta["n_docs"], meta["avgdl"] or 1.0
+        postings, doclen = self._views["postings"], self._views["doclen"]
+
+        pontuacoes: Dict[int, float] = {}
+        for termo in set(tokenizar(consulta)):
+            entrada = meta["vocab"].get(termo)
+            if entrada is None:
+                continue
+            offset, df = entrada
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for i in range(offset, offset + df):
+                doc_id, tf = postings[2 * i], postings[2 * i + 1]
+                norma = K1 * (1 - B + B * doclen[doc_id] / avgdl)
+                pontuacoes[doc_id] = pontuacoes.get(doc_id, 0.0) + idf * tf * (K1 + 1) / (tf + norma)
+
+        excluir = set(excluir)
+        resultados = []
+        # Pega uma folga para compensar exclusões sem decodificar todos os candidatos
+        for doc_id, score in heapq.nlargest(k + len(excluir), pontuacoes.items(), key=lambda par: par[1]):
+            doc = self._documento(doc_id)
+            if doc.get("uuid") in excluir:
+                continue
+            resultados.append((doc, score))
+            if len(resultados) >= k:
+                break
+        return resultados
+
+    def _fechar(self) -> None:
+        # As views precisam ser liberadas antes de fechar o mmap
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        for mm, base in self._mmaps:
+            base.release()
+            mm.close()
+        self._mmaps.clear()
+
+    def close(self) -> None:
+        """Libera os mmaps."""
+        self._fechar()
+        self._meta = None
+
+    def __enter__(self) -> "RetrievalIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def abrir_indice(output_dir: Path) -> RetrievalIndex:
+    """Índice de busca de `output_dir`, sincronizado com as extrações atuais."""
+    indice = RetrievalIndex(Path(output_dir) / INDEX_DIRNAME)
+    indice.atualizar(output_dir)
+    return indice
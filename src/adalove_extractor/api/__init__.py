@@ -5,8 +5,6 @@ Este módulo fornece um cliente HTTP para interagir com a API REST do AdaLove,
 eliminando a necessidade de automação de navegador para extração de dados.
 """
 
-from .client import AdaLoveAPIClient
-from .auth import CognitoAuthenticator
 from .endpoints import Endpoints
 from .exceptions import (
     APIError,
@@ -26,3 +24,24 @@ __all__ = [
     "EndpointNotFoundError",
     "RateLimitError",
 ]
+
+# Cliente (httpx) e autenticador são carregados sob demanda (PEP 562), para que
+# `from adalove_extractor.api.endpoints import Endpoints` não pague esse import.
+_LAZY_ATTRS = {
+    "AdaLoveAPIClient": ".client",
+    "CognitoAuthenticator": ".auth",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
@@ -7,15 +7,27 @@ e obtenção de tokens do AWS Cognito para acesso à API do AdaLove.
 Estratégia de sessão (3 níveis, do mais barato ao mais caro):
 
 1. Token Cognito em cache (.token_cache) ainda válido  → nenhum browser abre
+   1b. accessToken vencido, mas refresh token salvo     → grant `refresh_token`
+       direto no endpoint OAuth2 do Cognito (httpx), ~1s, sem browser
 2. Perfil persistente (.auth_profile) com sessão Google → browser headless, ~5s
 3. Login interativo                                     → janela visível, o
    usuário assume o controle e a janela permanece aberta até concluir
 
+Vários processos (cron + CLI interativo, lotes em paralelo) compartilham
+`.token_cache` e `.auth_profile`, e o perfil do Chrome não aceita dois logins
+ao mesmo tempo. Por isso renovação e login acontecem sob um lock entre
+processos (`.token_cache.lock`): um processo renova, os demais esperam e
+relêem o cache antes de tentar por conta própria.
+
 O princípio central deste módulo é **esperar por condição, nunca por tempo
 fixo**: o sucesso é definido por "o accessToken apareceu no localStorage",
-não por "já se passaram N segundos".
+não por "já se passaram N segundos". A condição chega por evento: um init
+script avisa o Python (binding exposto) no instante em que o Amplify grava o
+token, e a navegação do frame principal dispara a reclassificação da tela.
 """
 
+from __future__ import annotations
+
 import asyncio
 import base64
 import json
@@ -26,13 +38,19 @@ import sys
 import time
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from playwright.async_api import Page, async_playwright
-from rich.console import Console
+from adalove_extractor.utils.fs import atomic_write_json
+from adalove_extractor.utils.lock import FileLock
 
+from .endpoints import Endpoints
 from .exceptions import AuthenticationError, TokenExpiredError
 
+# Playwright (~80 ms de import) e rich só são carregados quando um browser
+# precisa abrir de fato; com token em cache válido nenhum dos dois é importado.
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
 # ── Tempos ────────────────────────────────────────────────────────────────
 # Login interativo cobre: digitar e-mail, senha, pegar o celular e aprovar 2FA.
 AUTH_TIMEOUT_SECONDS = int(os.getenv("ADALOVE_AUTH_TIMEOUT", "300"))
@@ -46,8 +64,19 @@ AUTOFILL_BUDGET_SECONDS = 60
 SPA_SETTLE_SECONDS = 15
 # Margem para não iniciar uma extração com token prestes a vencer.
 TOKEN_EXPIRY_SKEW_SECONDS = 120
-# Intervalo de polling da condição de sucesso.
+# Intervalo de polling da condição de sucesso (sem os eventos do browser).
 POLL_INTERVAL_MS = 500
+# Com eventos, o polling vira só rede de segurança (ex.: SPA que grava o token
+# sem passar por localStorage.setItem).
+EVENT_FALLBACK_POLL_SECONDS = 5
+# O Amplify grava o accessToken antes do refreshToken: o primeiro aviso chega
+# sem o refresh token, que vem no setItem seguinte.
+REFRESH_TOKEN_GRACE_SECONDS = 1.0
+# Troca do refresh token no Cognito: uma requisição; se travar, o login resolve.
+REFRESH_TIMEOUT_SECONDS = 15
+# Um lock de re-autenticação mais velho que o login mais longo possível
+# (headless + interativo + abertura do Chrome) é de um processo travado.
+AUTH_LOCK_STALE_SECONDS = HEADLESS_TIMEOUT_SECONDS + AUTH_TIMEOUT_SECONDS + 180
 
 # Diretório do perfil persistente do Chrome (sessão Google fica aqui).
 AUTH_PROFILE_DIR = Path(".auth_profile")
@@ -88,6 +117,33 @@ WRONG_PASSWORD_MARKERS = (
     "incorrect password",
 )
 
+# Binding chamado pelo init script quando o accessToken é gravado.
+TOKEN_BINDING_NAME = "__adaloveTokenWritten"
+# Intercepta localStorage.setItem em todas as páginas do contexto. Também avisa
+# no carregamento, se a sessão do perfil já deixou o token lá.
+TOKEN_WATCH_SCRIPT = """
+(() => {
+    const notify = () => {
+        try {
+            const keys = Object.keys(window.localStorage);
+            const access = keys.find(k => k.includes('accessToken'));
+            if (!access) return;
+            const refresh = keys.find(k => k.includes('refreshToken'));
+            window.%(binding)s({
+                accessToken: window.localStorage.getItem(access),
+                refreshToken: refresh ? window.localStorage.getItem(refresh) : null,
+            });
+        } catch (e) {}
+    };
+    const setItem = Storage.prototype.setItem;
+    Storage.prototype.setItem = function (key, value) {
+        setItem.apply(this, arguments);
+        if (this === window.localStorage && /accessToken|refreshToken/.test(String(key))) notify();
+    };
+    notify();
+})();
+""" % {"binding": TOKEN_BINDING_NAME}
+
 BROWSER_BLOCKED_MARKERS = (
     "this browser or app may not be secure",
     "browser or app may not be secure",
@@ -108,6 +164,42 @@ class LoginState(str, Enum):
     UNKNOWN = "unknown"
 
 
+class LoginEvents:
+    """Sinais do browser para a espera por condição.
+
+    Recebe os tokens do binding do init script e as navegações do frame
+    principal; `wait` acorda a espera assim que qualquer um chega.
+    """
+
+    def __init__(self):
+        self.changed = asyncio.Event()
+        self.tokens: Optional[dict] = None
+
+    def on_token(self, source, tokens) -> None:
+        """Callback do binding: (source, {"accessToken", "refreshToken"})."""
+        if isinstance(tokens, dict) and tokens.get("accessToken"):
+            self.tokens = tokens
+            self.changed.set()
+
+    def on_navigation(self, frame) -> None:
+        if getattr(frame, "parent_frame", None) is None:
+            self.changed.set()
+
+    def take_tokens(self) -> Optional[dict]:
+        tokens, self.tokens = self.tokens, None
+        return tokens
+
+    async def wait(self, timeout: float) -> bool:
+        """Espera um sinal por até `timeout` segundos; False se nada chegou."""
+        try:
+            await asyncio.wait_for(self.changed.wait(), timeout=max(0.0, timeout))
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.changed.clear()
+
+
 # ── Lógica pura (testável sem browser) ────────────────────────────────────
 
 
@@ -220,6 +312,32 @@ def classify_login_state(url: str, content: str = "") -> LoginState:
     return LoginState.UNKNOWN
 
 
+def parse_token_cache(text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Lê o conteúdo de `.token_cache`.
+
+    O formato atual é JSON ({"access_token", "refresh_token", "client_id"});
+    caches antigos contêm só o accessToken em texto puro e continuam válidos.
+
+    Returns:
+        (accessToken, refreshToken, client_id) — ausentes viram None.
+    """
+    text = (text or "").strip()
+    if not text.startswith("{"):
+        return (text or None), None, None
+
+    try:
+        dados = json.loads(text)
+    except ValueError:
+        return None, None, None
+    if not isinstance(dados, dict):
+        return None, None, None
+    return (
+        dados.get("access_token") or None,
+        dados.get("refresh_token") or None,
+        dados.get("client_id") or None,
+    )
+
+
 # ── Autenticador ──────────────────────────────────────────────────────────
 
 
@@ -231,14 +349,31 @@ class CognitoAuthenticator:
     - Usa Playwright APENAS para autenticação (obter token)
     - Token é reutilizado para todas as requisições HTTP
     - Perfil persistente evita repetir 2FA a cada execução
+    - Refresh token renova o accessToken sem abrir browser
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        token_file: Optional[Path] = None,
+        token_endpoint: Optional[str] = None,
+    ):
+        """
+        Args:
+            token_file: Cache de tokens (default: .token_cache no diretório atual)
+            token_endpoint: Endpoint OAuth2 de token (default: o do Cognito;
+                nos testes, um servidor local)
+        """
         self.cognito_url = "https://adalove.auth.us-east-2.amazoncognito.com"
         self.adalove_url = "https://adalove.inteli.edu.br"
+        self.token_endpoint = token_endpoint or Endpoints.OAUTH_TOKEN
         self.token: Optional[str] = None
         self.refresh_token: Optional[str] = None
-        self.token_file = Path(".token_cache")
+        # App client do Cognito (claim `client_id` do accessToken), exigido no grant
+        self.client_id: Optional[str] = None
+        # Token recusado pela API: não pode voltar do cache numa re-autenticação
+        self._rejected_token: Optional[str] = None
+        self.token_file = Path(token_file) if token_file else Path(".token_cache")
+        self.lock_file = self.token_file.with_name(self.token_file.name + ".lock")
         self.logger = logging.getLogger(__name__)
 
         # Tentar carregar token existente
@@ -255,8 +390,9 @@ class CognitoAuthenticator:
         """
         Autentica via Google OAuth e obtém token Cognito.
 
-        Tenta, em ordem: token em cache → perfil salvo (headless) →
-        login interativo em janela visível.
+        Tenta, em ordem: token em cache → refresh token → perfil salvo
+        (headless) → login interativo em janela visível. Do refresh em diante,
+        um processo por vez (lock em `.token_cache.lock`).
 
         Args:
             login: Email do usuário
@@ -269,13 +405,51 @@ class CognitoAuthenticator:
         Raises:
             AuthenticationError: Se a autenticação não for concluída
         """
-        console = Console()
-
         # Nível 1: token em cache ainda vigente — nenhum browser abre.
         if is_token_valid(self.token):
             self.logger.info("🔑 Token em cache ainda válido; browser não será aberto")
             return self.token
 
+        async with self._cache_lock():
+            # Enquanto esperava o lock, outro processo pode ter concluído o login.
+            self.load_token()
+            if is_token_valid(self.token):
+                self.logger.info("🔑 Token renovado por outro processo; reaproveitando")
+                return self.token
+
+            # Nível 1b: refresh token salvo — troca direta no Cognito, sem browser.
+            if self.refresh_token:
+                try:
+                    return await self._exchange_refresh_token()
+                except TokenExpiredError as e:
+                    self.logger.info(f"🔄 Renovação sem browser indisponível ({e})")
+
+            return await self._login_with_hard_limit(login, senha, timeout_seconds)
+
+    def is_authenticated(self) -> bool:
+        """Verifica se há token válido e não expirado."""
+        return is_token_valid(self.token)
+
+    def invalidate_token(self) -> None:
+        """Descarta o token atual (recusado pela API) para forçar nova autenticação.
+
+        Outro processo pode ter gravado um token novo no cache, então ele é
+        relido na re-autenticação — mas o token recusado nunca é readotado.
+        """
+        if self.token:
+            self._rejected_token = self.token
+        self.token = None
+
+    def _cache_lock(self) -> FileLock:
+        """Lock entre processos da renovação/login (um processo por vez)."""
+        return FileLock(self.lock_file, stale_after=AUTH_LOCK_STALE_SECONDS)
+
+    # ── Orquestração do login ─────────────────────────────────────────────
+
+    async def _login_with_hard_limit(
+        self, login: str, senha: str, timeout_seconds: int
+    ) -> str:
+        """Login via browser sob o limite de tempo externo."""
         self.logger.info("🔐 Iniciando autenticação via Google OAuth...")
 
         # Guarda externa: só deve disparar se o Playwright travar de forma anômala.
@@ -289,21 +463,19 @@ class CognitoAuthenticator:
                 timeout=hard_limit,
             )
         except asyncio.TimeoutError:
+            from rich.console import Console
+
             msg = f"Autenticação excedeu o limite de {hard_limit}s."
             self.logger.error(f"⏰ {msg}")
-            console.print(f"[bold red]⏰ TIMEOUT:[/bold red] {msg}")
+            Console().print(f"[bold red]⏰ TIMEOUT:[/bold red] {msg}")
             raise AuthenticationError(msg)
 
-    def is_authenticated(self) -> bool:
-        """Verifica se há token válido e não expirado."""
-        return is_token_valid(self.token)
-
-    # ── Orquestração do login ─────────────────────────────────────────────
-
     async def _perform_oauth_login(
         self, login: str, senha: str, timeout_seconds: int
     ) -> str:
         """Executa o fluxo OAuth escalando do modo barato para o interativo."""
+        from rich.console import Console
+
         console = Console()
         forced_headless = os.getenv("ADALOVE_HEADLESS", "").lower() in ("true", "1", "yes")
         non_interactive = os.getenv("ADALOVE_INTERACTIVE", "").lower() in ("false", "0", "no")
@@ -366,6 +538,9 @@ class CognitoAuthenticator:
         Returns:
             Token Cognito, ou None se não concluído.
         """
+        from playwright.async_api import async_playwright
+        from rich.console import Console
+
         console = Console()
         AUTH_PROFILE_DIR.mkdir(parents=True, exist_ok=True)
         deadline = time.monotonic() + timeout_seconds
@@ -374,6 +549,8 @@ class CognitoAuthenticator:
             context = await self._launch_context(p, headless=headless)
             try:
                 page = context.pages[0] if context.pages else await context.new_page()
+                # Antes do primeiro goto: o init script vale a partir da navegação.
+                events = await self._watch_login_events(context, page)
 
                 # O auto-preenchimento recebe teto próprio para não devorar o
                 # orçamento da fase antes de o polling começar.
@@ -392,6 +569,7 @@ class CognitoAuthenticator:
 
                 token = await self._wait_for_authentication(
                     page,
+                    events=events,
                     deadline=deadline,
                     interactive=interactive,
                     console=console,
@@ -407,6 +585,22 @@ class CognitoAuthenticator:
             finally:
                 await context.close()
 
+    async def _watch_login_events(self, context, page) -> Optional[LoginEvents]:
+        """Liga os eventos de token e navegação; None se o browser recusar.
+
+        Sem eventos, `_wait_for_authentication` volta ao polling de
+        `POLL_INTERVAL_MS`.
+        """
+        events = LoginEvents()
+        try:
+            await context.expose_binding(TOKEN_BINDING_NAME, events.on_token)
+            await context.add_init_script(TOKEN_WATCH_SCRIPT)
+        except Exception as e:
+            self.logger.info(f"Eventos de login indisponíveis ({e}); usando polling")
+            return None
+        page.on("framenavigated", events.on_navigation)
+        return events
+
     async def _launch_context(self, playwright, *, headless: bool):
         """Abre contexto persistente, preferindo o Chrome real.
 
@@ -554,6 +748,7 @@ class CognitoAuthenticator:
         deadline: float,
         interactive: bool,
         console,
+        events: Optional[LoginEvents] = None,
     ) -> Optional[str]:
         """Aguarda a CONDIÇÃO de sucesso: o accessToken aparecer no navegador.
 
@@ -561,22 +756,33 @@ class CognitoAuthenticator:
         ~21s quando o 2FA ainda não tinha sido *detectado* — inclusive
         enquanto o usuário ainda digitava o e-mail.
 
+        Com `events`, a espera dorme até o token ser gravado ou a página
+        navegar: nada de `page.evaluate` a cada 500 ms. O localStorage só é
+        lido na primeira volta e nos ticks de segurança.
+
         Args:
             deadline: Instante (time.monotonic) em que a espera acaba. É
                 absoluto, e não uma duração, para que o tempo já gasto na
                 abertura do browser e no auto-preenchimento seja descontado
                 deste mesmo orçamento.
             interactive: Se há um humano capaz de agir na janela
+            events: Sinais do browser (None = polling)
 
         Returns:
             Token, ou None se o tempo acabar.
         """
         announced: set[LoginState] = set()
         last_progress = time.monotonic()
+        # O token pode ter sido gravado antes de a espera começar
+        read_storage = True
 
         while time.monotonic() < deadline:
             # A condição de sucesso tem precedência sobre qualquer heurística.
-            token = await self._extract_token_from_page(page, strict=True)
+            token = None
+            if events is not None and events.tokens:
+                token = await self._accept_event_tokens(page, events)
+            elif events is None or read_storage:
+                token = await self._extract_token_from_page(page, strict=True)
             if token and is_token_valid(token):
                 self.token = token
                 self.save_token(token)
@@ -638,7 +844,11 @@ class CognitoAuthenticator:
                     flush=True,
                 )
 
-            await asyncio.sleep(POLL_INTERVAL_MS / 1000)
+            if events is None:
+                await asyncio.sleep(POLL_INTERVAL_MS / 1000)
+            else:
+                restante = deadline - time.monotonic()
+                read_storage = not await events.wait(min(EVENT_FALLBACK_POLL_SECONDS, restante))
 
         # Última tentativa com estratégias mais permissivas antes de desistir.
         token = await self._extract_token_from_page(page, strict=False)
@@ -649,6 +859,23 @@ class CognitoAuthenticator:
 
         return None
 
+    async def _accept_event_tokens(self, page: Page, events: LoginEvents) -> Optional[str]:
+        """accessToken entregue pelo binding, sem perder o refresh token.
+
+        Sem o refresh token no aviso, espera o próximo setItem por até
+        `REFRESH_TOKEN_GRACE_SECONDS` e, se ainda faltar, lê o localStorage
+        uma vez. Concluir só com o accessToken faria todo vencimento voltar
+        ao login pelo browser.
+        """
+        tokens = events.take_tokens()
+        if not tokens.get("refreshToken"):
+            await events.wait(REFRESH_TOKEN_GRACE_SECONDS)
+            tokens = events.take_tokens() or tokens
+        token = self._accept_page_tokens(tokens)
+        if not tokens.get("refreshToken"):
+            token = await self._extract_token_from_page(page, strict=True) or token
+        return token
+
     async def _read_state(self, page: Page) -> Tuple[LoginState, str]:
         """Lê o estado atual da página de forma resiliente a navegações.
 
@@ -696,28 +923,67 @@ class CognitoAuthenticator:
             self.logger.debug(f"Não foi possível marcar a sessão: {e}")
 
     def save_token(self, token: str):
-        """Salva token em arquivo de cache com permissão restrita."""
+        """Salva token (e refresh token, se houver) no cache com permissão restrita."""
+        dados = {"access_token": token}
+        if self.refresh_token:
+            dados["refresh_token"] = self.refresh_token
+        if self.client_id:
+            dados["client_id"] = self.client_id
         try:
-            self.token_file.write_text(token, encoding="utf-8")
-            try:
-                os.chmod(self.token_file, 0o600)  # no-op efetivo no Windows
-            except OSError:
-                pass
+            # 0600 explícito (no-op efetivo no Windows): não herda a permissão de um cache antigo
+            atomic_write_json(self.token_file, dados, indent=None, mode=0o600)
             self.logger.debug("💾 Token salvo no cache")
         except Exception as e:
             self.logger.warning(f"⚠️ Falha ao salvar token no cache: {e}")
 
+    def _forget_refresh_token(self) -> None:
+        """Descarta o refresh token também do cache.
+
+        Só na memória não basta: o próximo `load_token` (deste ou de outro
+        processo) o traria de volta do arquivo.
+        """
+        self.refresh_token = None
+        try:
+            token, refresh_token, client_id = parse_token_cache(
+                self.token_file.read_text(encoding="utf-8")
+            )
+        except OSError:
+            return
+        if not refresh_token:
+            return
+
+        dados = {"access_token": token, "client_id": client_id or self.client_id}
+        try:
+            atomic_write_json(self.token_file, {k: v for k, v in dados.items() if v}, indent=None)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Falha ao atualizar o cache de token: {e}")
+
     def load_token(self):
-        """Carrega token do cache, descartando-o se estiver expirado."""
+        """Carrega token do cache, descartando-o se estiver expirado.
+
+        O refresh token é mantido mesmo com o accessToken vencido: é
+        justamente nesse caso que ele evita abrir o browser.
+        """
         if not self.token_file.exists():
             return
 
         try:
-            token = self.token_file.read_text(encoding="utf-8").strip()
+            token, refresh_token, client_id = parse_token_cache(
+                self.token_file.read_text(encoding="utf-8")
+            )
         except Exception as e:
             self.logger.warning(f"⚠️ Falha ao ler token do cache: {e}")
             return
 
+        # Cache legado (só o accessToken) não apaga o que já está em memória
+        self.refresh_token = refresh_token or self.refresh_token
+        self.client_id = (
+            client_id or (decode_jwt_claims(token) or {}).get("client_id") or self.client_id
+        )
+
+        if token and token == self._rejected_token:
+            return
+
         if is_token_valid(token):
             self.token = token
             self.logger.info("📂 Token carregado do cache")
@@ -730,6 +996,14 @@ class CognitoAuthenticator:
         else:
             self.logger.info("🗑️ Token em cache inválido; será renovado")
 
+    def _accept_page_tokens(self, tokens: Optional[dict]) -> Optional[str]:
+        """accessToken de {"accessToken", "refreshToken"}, guardando o refresh token."""
+        token = (tokens or {}).get("accessToken")
+        if token and tokens.get("refreshToken"):
+            self.refresh_token = tokens["refreshToken"]
+            self.client_id = (decode_jwt_claims(token) or {}).get("client_id") or self.client_id
+        return token
+
     async def _extract_token_from_page(
         self, page: Page, strict: bool = True
     ) -> Optional[str]:
@@ -740,6 +1014,9 @@ class CognitoAuthenticator:
         não o idToken. O idToken resulta em erro 401 — por isso, durante o
         polling (strict=True), apenas o accessToken conta como sucesso.
 
+        Junto com o accessToken, o refresh token que o Amplify guarda ao lado
+        dele é capturado em `self.refresh_token`, para `refresh_access_token`.
+
         Args:
             page: Página do Playwright
             strict: Se True, aceita somente accessToken do Cognito
@@ -749,14 +1026,21 @@ class CognitoAuthenticator:
         """
         # Estratégia 1: accessToken do Cognito (único aceito em modo estrito)
         try:
-            token = await page.evaluate(
+            tokens = await page.evaluate(
                 """
                 () => {
-                    const key = Object.keys(localStorage).find(k => k.includes('accessToken'));
-                    return key ? localStorage.getItem(key) : null;
+                    const keys = Object.keys(localStorage);
+                    const access = keys.find(k => k.includes('accessToken'));
+                    if (!access) return null;
+                    const refresh = keys.find(k => k.includes('refreshToken'));
+                    return {
+                        accessToken: localStorage.getItem(access),
+                        refreshToken: refresh ? localStorage.getItem(refresh) : null,
+                    };
                 }
             """
             )
+            token = self._accept_page_tokens(tokens)
             if token:
                 return token
         except Exception as e:
@@ -800,15 +1084,69 @@ class CognitoAuthenticator:
         """
         Renova token de acesso usando refresh token.
 
+        Faz o grant `refresh_token` no endpoint OAuth2 do Cognito (app client
+        público, sem secret) e grava o novo accessToken em `.token_cache`.
+        Se outro processo renovou enquanto este esperava o lock, o token dele
+        é reaproveitado sem nova requisição.
+
         Returns:
             Novo token de acesso
 
         Raises:
             TokenExpiredError: Se refresh falhar
         """
+        stale_token = self.token
+        async with self._cache_lock():
+            self.load_token()
+            if self.token != stale_token and is_token_valid(self.token):
+                self.logger.info("🔑 Token renovado por outro processo; reaproveitando")
+                return self.token
+            return await self._exchange_refresh_token()
+
+    async def _exchange_refresh_token(self) -> str:
+        """Grant `refresh_token` no Cognito (chamador já detém o lock)."""
         if not self.refresh_token:
             raise TokenExpiredError("Refresh token não disponível")
+        if not self.client_id:
+            raise TokenExpiredError("Client ID do Cognito desconhecido")
 
-        # TODO: Implementar refresh via API Cognito
-        # Por enquanto, lançar erro para forçar re-autenticação
-        raise TokenExpiredError("Token expirado - necessário re-autenticar")
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=REFRESH_TIMEOUT_SECONDS) as http:
+                response = await http.post(
+                    self.token_endpoint,
+                    data={
+                        "grant_type": "refresh_token",
+                        "client_id": self.client_id,
+                        "refresh_token": self.refresh_token,
+                    },
+                )
+        except httpx.HTTPError as e:
+            raise TokenExpiredError(f"Falha de rede ao renovar token: {e}")
+
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+
+        if response.status_code != 200:
+            erro = payload.get("error") or f"HTTP {response.status_code}"
+            if erro == "invalid_grant":
+                # Refresh token revogado ou vencido: só um novo login resolve,
+                # e não adianta tentá-lo de novo no próximo 401.
+                self._forget_refresh_token()
+            raise TokenExpiredError(f"Cognito recusou a renovação ({erro})")
+
+        token = payload.get("access_token")
+        if not is_token_valid(token):
+            raise TokenExpiredError("Cognito devolveu um accessToken inválido")
+
+        # Com rotação ativa no app client, o Cognito devolve um refresh token novo
+        self.refresh_token = payload.get("refresh_token") or self.refresh_token
+        self.token = token
+        self.save_token(token)
+        self.logger.info("🔄 Token renovado via refresh token (sem browser)")
+        return token
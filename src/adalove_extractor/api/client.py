@@ -3,6 +3,7 @@ Cliente HTTP para API do AdaLove.
 
 Este módulo fornece um cliente HTTP assíncrono com:
 - Autenticação automática via AWS Cognito
+- Renovação do token em background, antes do vencimento (single-flight)
 - Retry automático em caso de falhas
 - Logging de requisições
 - Tratamento de erros
@@ -11,9 +12,10 @@ Este módulo fornece um cliente HTTP assíncrono com:
 import httpx
 import logging
 import asyncio
+import time
 from typing import Optional, Dict, Any, List
 
-from .auth import CognitoAuthenticator
+from .auth import CognitoAuthenticator, decode_jwt_claims
 from .endpoints import Endpoints
 from .exceptions import (
     APIError,
@@ -23,6 +25,14 @@ from .exceptions import (
     RateLimitError
 )
 
+# Antecedência da renovação proativa: bem maior que TOKEN_EXPIRY_SKEW_SECONDS,
+# para que nenhuma requisição chegue a ver o token dentro da margem de vencimento.
+TOKEN_RENEW_AHEAD_SECONDS = 300
+# O renovador acorda no máximo a cada minuto (suspensão do notebook, re-login)
+TOKEN_RENEW_CHECK_SECONDS = 60
+# Espera entre tentativas quando a renovação falha (Cognito fora do ar, rede)
+TOKEN_RENEW_RETRY_SECONDS = 30
+
 
 class AdaLoveAPIClient:
     """
@@ -35,7 +45,9 @@ class AdaLoveAPIClient:
         self,
         base_url: str = "https://apiv2.inteli.edu.br",
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        auth: Optional[CognitoAuthenticator] = None,
+        renew_ahead_seconds: int = TOKEN_RENEW_AHEAD_SECONDS,
     ):
         """
         Inicializa o cliente HTTP.
@@ -44,13 +56,22 @@ class AdaLoveAPIClient:
             base_url: URL base da API
             timeout: Timeout em segundos
             max_retries: Número máximo de tentativas
+            auth: Autenticador (default: novo CognitoAuthenticator)
+            renew_ahead_seconds: Antecedência da renovação proativa do token
         """
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
+        self.renew_ahead_seconds = renew_ahead_seconds
         self.session = httpx.AsyncClient(timeout=timeout)
-        self.auth = CognitoAuthenticator()
+        self.auth = auth or CognitoAuthenticator()
         self.logger = logging.getLogger(__name__)
+        # Headers do token atual. Nunca alterado no lugar: a renovação monta um
+        # dict novo e troca a referência, e requisições em voo seguem com o seu.
+        self._headers: Optional[Dict[str, str]] = None
+        # Single-flight: uma renovação por vez; as demais requisições esperam por ela
+        self._renew_lock = asyncio.Lock()
+        self._renewer: Optional[asyncio.Task] = None
     
     async def authenticate(self, login: str, senha: str):
         """
@@ -66,12 +87,100 @@ class AdaLoveAPIClient:
 
         if self.auth.is_authenticated():
             self.logger.info("✅ Cliente já autenticado (cache)")
-            return
+        else:
+            await self.auth.authenticate_google_oauth(login, senha)
+            self.logger.info("✅ Cliente autenticado com sucesso")
+        self._start_renewer()
+
+    # ── Renovação do token ───────────────────────────────────────────────
+
+    def _start_renewer(self) -> None:
+        """Inicia (uma vez) a task que renova o token antes do vencimento."""
+        if self._renewer is None or self._renewer.done():
+            self._renewer = asyncio.create_task(self._renew_loop())
+
+    async def _renew_loop(self) -> None:
+        """
+        Renova o token `renew_ahead_seconds` antes do `exp` do JWT.
+
+        Sem isso, uma extração longa atravessa o vencimento e todas as
+        requisições em voo recebem 401 ao mesmo tempo. Sem refresh token não
+        há o que agendar: o 401 continua levando ao re-login.
+        """
+        while True:
+            token = self.auth.token
+            exp = (decode_jwt_claims(token) or {}).get("exp")
+            if not isinstance(exp, (int, float)) or not self.auth.refresh_token:
+                await asyncio.sleep(TOKEN_RENEW_CHECK_SECONDS)
+                continue
+
+            restante = exp - self.renew_ahead_seconds - time.time()
+            if restante > 0:
+                await asyncio.sleep(min(restante, TOKEN_RENEW_CHECK_SECONDS))
+                continue
+
+            try:
+                await self._renew_token(token)
+            except TokenExpiredError as e:
+                self.logger.warning(f"⚠️ Renovação proativa do token falhou: {e}")
+                await asyncio.sleep(TOKEN_RENEW_RETRY_SECONDS)
+
+    async def _renew_token(self, stale_token: Optional[str]) -> None:
+        """
+        Renova o token, no máximo uma renovação por vez.
+
+        Quem chega enquanto outra renovação está em curso espera por ela e,
+        se o token já mudou, reaproveita o resultado em vez de renovar de novo.
+
+        Args:
+            stale_token: Token que motivou a renovação (o que recebeu 401 ou
+                está vencendo)
+
+        Raises:
+            TokenExpiredError: Se o refresh falhar
+        """
+        async with self._renew_lock:
+            if self.auth.token != stale_token and self.auth.is_authenticated():
+                return
+            await self.auth.refresh_access_token()
+            self._headers = self._make_headers()
+
+    async def _current_headers(self) -> Dict[str, str]:
+        """
+        Headers para a próxima requisição.
+
+        Espera uma renovação em curso e, se o token já entrou na margem de
+        vencimento, renova antes de enviar (em vez de esperar o 401).
+        """
+        if self._renew_lock.locked():
+            async with self._renew_lock:
+                pass
+        if not self.auth.is_authenticated() and self.auth.refresh_token:
+            try:
+                await self._renew_token(self.auth.token)
+            except TokenExpiredError as e:
+                raise AuthenticationError(f"Token expirado e refresh falhou: {e}")
+        return self._build_headers()
 
-        await self.auth.authenticate_google_oauth(login, senha)
-        self.logger.info("✅ Cliente autenticado com sucesso")
-    
     def _build_headers(self) -> Dict[str, str]:
+        """
+        Headers do token atual (o mesmo dict enquanto o token não muda).
+
+        Returns:
+            Dicionário de headers — não deve ser alterado pelo chamador
+
+        Raises:
+            AuthenticationError: Se token não disponível
+        """
+        if not self.auth.is_authenticated():
+            raise AuthenticationError("Cliente não autenticado")
+
+        headers = self._headers
+        if headers is None or headers["Authorization"] != f"Bearer {self.auth.token}":
+            headers = self._headers = self._make_headers()
+        return headers
+
+    def _make_headers(self) -> Dict[str, str]:
         """
         Constrói headers com autenticação e headers browser-like.
         
@@ -80,13 +189,7 @@ class AdaLoveAPIClient:
         
         Returns:
             Dicionário de headers
-            
-        Raises:
-            AuthenticationError: Se token não disponível
         """
-        if not self.auth.is_authenticated():
-            raise AuthenticationError("Cliente não autenticado")
-        
         return {
             # Auth
             "Authorization": f"Bearer {self.auth.token}",
@@ -130,7 +233,7 @@ class AdaLoveAPIClient:
             APIError: Em caso de erro na requisição
         """
         url = f"{self.base_url}{endpoint}"
-        headers = self._build_headers()
+        headers = await self._current_headers()
         
         for attempt in range(self.max_retries):
             try:
@@ -148,7 +251,7 @@ class AdaLoveAPIClient:
                     # Token expirado, tentar refresh
                     self.logger.warning("⚠️ Token expirado, tentando refresh...")
                     try:
-                        await self.auth.refresh_access_token()
+                        await self._renew_token(headers["Authorization"].removeprefix("Bearer "))
                         headers = self._build_headers()
                         continue
                     except TokenExpiredError:
@@ -219,7 +322,7 @@ class AdaLoveAPIClient:
             APIError: Em caso de erro na requisição
         """
         url = f"{self.base_url}{endpoint}"
-        headers = self._build_headers()
+        headers = await self._current_headers()
         
         for attempt in range(self.max_retries):
             try:
@@ -265,7 +368,7 @@ class AdaLoveAPIClient:
             APIError: Em caso de erro na requisição.
         """
         url = f"{self.base_url}{endpoint}"
-        headers = self._build_headers()
+        headers = await self._current_headers()
 
         for attempt in range(self.max_retries):
             try:
@@ -318,7 +421,11 @@ class AdaLoveAPIClient:
             return False
 
     async def close(self):
-        """Fecha a sessão HTTP."""
+        """Fecha a sessão HTTP (e para a renovação em background)."""
+        if self._renewer is not None:
+            self._renewer.cancel()
+            await asyncio.gather(self._renewer, return_exceptions=True)
+            self._renewer = None
         await self.session.aclose()
         self.logger.debug("🔒 Sessão HTTP fechada")
     
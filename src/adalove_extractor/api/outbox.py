@@ -0,0 +1,328 @@
+"""
+Outbox persistente de submissões de respostas.
+
+`AdaLoveAPIClient.submit_answer` tenta uma vez (com os retries do `put`) e
+devolve False em caso de falha. `SubmissionOutbox` primeiro grava a resposta
+num arquivo JSON lines append-only. Depois a envia, e o que falhar fica
+pendente, com backoff exponencial, até um próximo `drenar`: o worker em
+background do CLI interativo, `--enviar-pendentes` ou a próxima sessão.
+
+Antes de reenviar, o outbox relê o `studyAnswer` da atividade via userdata da
+turma (uma requisição por turma por rodada). Se a resposta já está lá, por
+exemplo porque o PUT anterior chegou mas a conexão caiu antes da resposta, a
+entrada é marcada como enviada sem repetir o PUT.
+
+Cada linha do arquivo é uma transição de uma entrada ({"id", "estado", ...});
+o estado de uma entrada é a fusão das suas linhas. Ao fim de cada rodada o
+arquivo é compactado para conter só as entradas pendentes.
+
+Vários processos podem usar o mesmo outbox (sessão interativa + cron). Toda
+escrita acontece sob um `FileLock` (`<arquivo>.lock`), e a compactação relê o
+arquivo antes de regravá-lo, para não apagar entradas acrescentadas por outro
+processo.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid as uuid_lib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from adalove_extractor.utils.fs import atomic_writer
+from adalove_extractor.utils.lock import FileLock
+
+from .endpoints import Endpoints
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_FILENAME = "outbox_submissoes.jsonl"
+# O lock só cobre gravações curtas; um lock mais velho que isso foi abandonado
+LOCK_STALE_SECONDS = 30
+
+# Estados de uma entrada
+PENDENTE = "pendente"
+ENVIADA = "enviada"
+SUBSTITUIDA = "substituida"
+
+
+class SubmissionOutbox:
+    """
+    Fila durável de respostas a submeter, drenada com concorrência limitada.
+
+    Example:
+        >>> outbox = SubmissionOutbox(output_dir / OUTBOX_FILENAME)
+        >>> entrada = outbox.enfileirar(uuid, resposta, section_uuid=turma_uuid, turma="T13")
+        >>> resultado = await outbox.drenar(client, ids=[entrada])
+        >>> resultado["enviadas"]
+        ['<id>']
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        backoff_base: float = 30.0,
+        backoff_max: float = 3600.0,
+        ao_enviar: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Inicializa o outbox (lendo as entradas já gravadas).
+
+        Args:
+            path: Arquivo JSON lines do outbox
+            backoff_base: Espera após a primeira falha (dobra a cada falha)
+            backoff_max: Teto da espera entre tentativas
+            ao_enviar: Chamado com a entrada após cada envio confirmado
+        """
+        self.path = Path(path)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.ao_enviar = ao_enviar
+        self._entradas: Dict[str, Dict[str, Any]] = {}
+        # Entradas sendo enviadas agora (worker e envio imediato compartilham a instância)
+        self._em_voo: set = set()
+        self._lock = FileLock(
+            self.path.with_name(self.path.name + ".lock"),
+            stale_after=LOCK_STALE_SECONDS,
+            poll_interval=0.02,
+        )
+        self._entradas = self._ler()
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _travado(self) -> Iterator[None]:
+        """Lock entre processos do arquivo (reentrante dentro da instância)."""
+        if self._lock.held:
+            yield
+            return
+        with self._lock:
+            yield
+
+    def _ler(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de todas as entradas, fundindo as linhas do arquivo."""
+        entradas: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return entradas
+        with open(self.path, "r", encoding="utf-8") as f:
+            for numero, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    registro = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Outbox {self.path.name}: linha {numero} ilegível ignorada")
+                    continue
+                entrada_id = registro.get("id")
+                if entrada_id:
+                    entradas[entrada_id] = {**entradas.get(entrada_id, {}), **registro}
+        return entradas
+
+    def _registrar(self, entrada_id: str, **campos: Any) -> Dict[str, Any]:
+        registro = {"id": entrada_id, "ts": datetime.now().isoformat(timespec="seconds"), **campos}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._travado(), open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        entrada = {**self._entradas.get(entrada_id, {}), **registro}
+        self._entradas[entrada_id] = entrada
+        return entrada
+
+    def compactar(self) -> None:
+        """Regrava o arquivo só com as entradas pendentes (uma linha cada).
+
+        Parte do arquivo, não da memória: ele tem também o que outros
+        processos acrescentaram desde a última leitura.
+        """
+        with self._travado():
+            pendentes = [e for e in self._ler().values() if e.get("estado") == PENDENTE]
+            with atomic_writer(self.path) as f:
+                for entrada in pendentes:
+                    f.write((json.dumps(entrada, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._entradas = {e["id"]: e for e in pendentes}
+
+    # ------------------------------------------------------------------
+    # Fila
+    # ------------------------------------------------------------------
+
+    def enfileirar(
+        self,
+        student_activity_uuid: str,
+        resposta: str,
+        section_uuid: Optional[str] = None,
+        turma: Optional[str] = None,
+    ) -> str:
+        """
+        Grava uma resposta a submeter (durável antes de qualquer tentativa).
+
+        Uma entrada pendente anterior da mesma atividade é substituída
+        (inclusive uma enfileirada por outro processo).
+
+        Returns:
+            ID da entrada
+        """
+        entrada_id = uuid_lib.uuid4().hex[:12]
+        with self._travado():
+            self._entradas = self._ler()
+            for entrada in self.pendentes():
+                if entrada["uuid"] == student_activity_uuid:
+                    self._registrar(entrada["id"], estado=SUBSTITUIDA)
+
+            self._registrar(
+                entrada_id,
+                estado=PENDENTE,
+                uuid=student_activity_uuid,
+                resposta=resposta,
+                section_uuid=section_uuid,
+                turma=turma,
+                tentativas=0,
+                proximo_em=0.0,
+            )
+        return entrada_id
+
+    def pendentes(self) -> List[Dict[str, Any]]:
+        """Entradas ainda não enviadas, na ordem de enfileiramento."""
+        return [e for e in self._entradas.values() if e.get("estado") == PENDENTE]
+
+    def estado(self, entrada_id: str) -> Dict[str, Any]:
+        return self._entradas.get(entrada_id, {})
+
+    def proximo_vencimento(self) -> Optional[float]:
+        """Timestamp (time.time) da próxima tentativa agendada, ou None se vazio."""
+        pendentes = self.pendentes()
+        return min(e.get("proximo_em", 0.0) for e in pendentes) if pendentes else None
+
+    # ------------------------------------------------------------------
+    # Envio
+    # ------------------------------------------------------------------
+
+    async def drenar(
+        self,
+        client,
+        concorrencia: int = 2,
+        ids: Optional[Iterable[str]] = None,
+        forcar: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Tenta enviar as entradas pendentes vencidas.
+
+        Args:
+            client: `AdaLoveAPIClient` autenticado
+            concorrencia: Envios simultâneos
+            ids: Restringe a estas entradas (ex.: envio imediato de uma resposta)
+            forcar: Ignora o backoff e tenta todas agora
+
+        Returns:
+            {"enviadas": [ids], "ja_enviadas": [ids], "falhas": [ids], "restantes": n}
+        """
+        agora = time.time()
+        filtro = set(ids) if ids is not None else None
+        alvos = [
+            e for e in self.pendentes()
+            if (filtro is None or e["id"] in filtro)
+            and (forcar or e.get("proximo_em", 0.0) <= agora)
+            and e["id"] not in self._em_voo
+        ]
+        resultado: Dict[str, Any] = {"enviadas": [], "ja_enviadas": [], "falhas": [], "restantes": 0}
+        if not alvos:
+            resultado["restantes"] = len(self.pendentes())
+            return resultado
+
+        sem = asyncio.Semaphore(max(1, concorrencia))
+        userdata: Dict[str, "asyncio.Task"] = {}
+
+        def _userdata(section_uuid: str) -> "asyncio.Task":
+            # Uma leitura de userdata por turma, compartilhada pelos envios da rodada
+            if section_uuid not in userdata:
+                userdata[section_uuid] = asyncio.ensure_future(
+                    client.get(Endpoints.section_userdata(section_uuid))
+                )
+            return userdata[section_uuid]
+
+        async def _enviar(entrada: Dict[str, Any]) -> None:
+            async with sem:
+                self._em_voo.add(entrada["id"])
+                try:
+                    # Já houve um PUT (talvez interrompido): confere antes de repetir
+                    if entrada.get("iniciada") and entrada.get("section_uuid"):
+                        dados = await _userdata(entrada["section_uuid"])
+                        if self._resposta_registrada(dados, entrada):
+                            self._concluir(entrada, ja_estava=True)
+                            resultado["ja_enviadas"].append(entrada["id"])
+                            return
+                    else:
+                        entrada = self._registrar(entrada["id"], iniciada=True)
+                    if await client.submit_answer(entrada["uuid"], entrada["resposta"]):
+                        self._concluir(entrada)
+                        resultado["enviadas"].append(entrada["id"])
+                        return
+                    erro = "submissão recusada ou sem conexão"
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    erro = str(e)
+                finally:
+                    self._em_voo.discard(entrada["id"])
+                self._falhou(entrada, erro)
+                resultado["falhas"].append(entrada["id"])
+
+        try:
+            await asyncio.gather(*[_enviar(e) for e in alvos])
+        finally:
+            for tarefa in userdata.values():
+                if not tarefa.done():
+                    tarefa.cancel()
+                elif not tarefa.cancelled():
+                    tarefa.exception()  # evita "exception was never retrieved"
+
+        self.compactar()
+        resultado["restantes"] = len(self.pendentes())
+        logger.info(
+            f"Outbox: {len(resultado['enviadas'])} enviada(s), {len(resultado['ja_enviadas'])} já registrada(s), "
+            f"{len(resultado['falhas'])} falha(s), {resultado['restantes']} pendente(s)"
+        )
+        return resultado
+
+    @staticmethod
+    def _resposta_registrada(userdata: Any, entrada: Dict[str, Any]) -> bool:
+        for activity in (userdata or {}).get("activities", []):
+            if activity.get("studentActivityUuid") == entrada["uuid"]:
+                return (activity.get("studyAnswer") or "").strip() == entrada["resposta"].strip()
+        return False
+
+    def _concluir(self, entrada: Dict[str, Any], ja_estava: bool = False) -> None:
+        concluida = self._registrar(entrada["id"], estado=ENVIADA, ja_estava=ja_estava)
+        if self.ao_enviar is not None:
+            try:
+                self.ao_enviar(concluida)
+            except Exception as e:
+                logger.warning(f"Outbox: callback pós-envio falhou ({e})")
+
+    def _falhou(self, entrada: Dict[str, Any], erro: str) -> None:
+        tentativas = entrada.get("tentativas", 0) + 1
+        espera = min(self.backoff_base * (2 ** (tentativas - 1)), self.backoff_max)
+        self._registrar(entrada["id"], tentativas=tentativas, proximo_em=time.time() + espera, erro=erro)
+        logger.warning(f"Outbox: envio de {entrada['uuid']} falhou ({erro}); nova tentativa em {espera:.0f}s")
+
+    async def executar(self, client, intervalo: float = 30.0, concorrencia: int = 2) -> None:
+        """
+        Worker em background: drena o outbox até ser cancelado.
+
+        Dorme até a próxima tentativa agendada (no máximo `intervalo`), então
+        respostas enfileiradas durante a sessão saem logo que a conexão volta.
+        """
+        while True:
+            try:
+                await self.drenar(client, concorrencia=concorrencia)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox: rodada de envio falhou: {e}")
+            vencimento = self.proximo_vencimento()
+            espera = intervalo if vencimento is None else min(intervalo, max(1.0, vencimento - time.time()))
+            await asyncio.sleep(espera)
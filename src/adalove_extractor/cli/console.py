@@ -0,0 +1,49 @@
+"""
+Saída do CLI (rich) e estilo dos menus (questionary) carregados sob demanda.
+
+rich e questionary/prompt_toolkit custam ~150 ms de import. Comandos simples
+como `--list` não usam nenhum dos dois, então os helpers aqui só importam as
+bibliotecas no primeiro uso.
+"""
+
+from functools import lru_cache
+
+
+def rprint(*objects, **kwargs) -> None:
+    """Equivalente a `rich.print`, importando rich só na primeira chamada."""
+    from rich import print as _rich_print
+
+    _rich_print(*objects, **kwargs)
+
+
+class _LazyConsole:
+    """Proxy de `rich.console.Console` criado no primeiro acesso a atributo."""
+
+    _instance = None
+
+    def __getattr__(self, name):
+        if self._instance is None:
+            from rich.console import Console
+
+            type(self)._instance = Console()
+        return getattr(self._instance, name)
+
+
+console = _LazyConsole()
+
+
+@lru_cache(maxsize=None)
+def menu_style():
+    """Estilo global dos menus questionary (criado uma única vez)."""
+    import questionary
+
+    return questionary.Style([
+        ('qmark', 'fg:#E91E63 bold'),
+        ('question', 'fg:#673AB7 bold'),
+        ('answer', 'fg:#2196f3 bold'),
+        ('pointer', 'fg:#E91E63 bold'),
+        ('highlighted', 'fg:#E91E63 bold'),
+        ('selected', 'fg:#2196f3'),
+        ('separator', 'fg:#6C6C6C'),
+        ('instruction', 'fg:#6C6C6C'),
+    ])
@@ -0,0 +1,183 @@
+"""
+Viewer paginado da lista de ponderadas.
+
+Montar um `questionary.Choice` de 4 linhas por ponderada (com `truncar_texto`
+e `status_prazo` em cada uma) para a lista inteira, a cada volta do menu, fica
+lento em turmas grandes ou listas de várias turmas. `PonderadasView` mantém o
+estado de paginação e filtros e só monta os rótulos da página exibida,
+guardando-os até os dados mudarem (`atualizar`) ou o dia virar (o rótulo de
+prazo depende da data de hoje).
+"""
+
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from .icons import icons
+
+ITENS_POR_PAGINA = 8
+
+# Valores de navegação devolvidos pelo select (índices de ponderada são int)
+PROXIMA = "__NEXT__"
+ANTERIOR = "__PREV__"
+FILTRO_PENDENTES = "__FILTRO_PENDENTES__"
+FILTRO_SEMANA = "__FILTRO_SEMANA__"
+VOLTAR = "__BACK__"
+
+
+class PonderadasView:
+    """
+    Paginação, filtros e cache de rótulos da lista de ponderadas.
+
+    Example:
+        >>> view = PonderadasView(ponderadas, render=montar_label)
+        >>> view.filtrar(pendentes=True)
+        >>> choices = view.choices()     # só a página atual
+        >>> view.proxima()
+    """
+
+    def __init__(
+        self,
+        ponderadas: List[dict],
+        render: Callable[[dict], str],
+        itens_por_pagina: int = ITENS_POR_PAGINA,
+    ):
+        """
+        Inicializa o viewer.
+
+        Args:
+            ponderadas: Lista plana de ponderadas (ponderadas.json)
+            render: Função que monta o rótulo (multi-linha) de uma ponderada
+            itens_por_pagina: Ponderadas por página
+        """
+        self.render = render
+        self.itens_por_pagina = max(1, itens_por_pagina)
+        self.pagina = 0
+        self.somente_pendentes = False
+        self.semana: Optional[str] = None
+        self._labels: Dict[int, str] = {}
+        self._labels_dia = date.today()
+        self._indices: Optional[List[int]] = None
+        self.atualizar(ponderadas)
+
+    # ------------------------------------------------------------------
+    # Dados e filtros
+    # ------------------------------------------------------------------
+
+    def atualizar(self, ponderadas: List[dict]) -> None:
+        """Troca os dados (ex.: após revalidação). Mantém filtros e página."""
+        self.ponderadas = ponderadas
+        self._labels.clear()
+        self._indices = None
+        self.pagina = min(self.pagina, self.total_paginas - 1)
+
+    def filtrar(self, pendentes: Optional[bool] = None, semana: Optional[str] = "") -> None:
+        """
+        Ajusta os filtros e volta para a primeira página.
+
+        Args:
+            pendentes: True = só não respondidas; None = mantém
+            semana: Nome da semana; None = todas; "" = mantém
+        """
+        if pendentes is not None:
+            self.somente_pendentes = pendentes
+        if semana != "":
+            self.semana = semana
+        self._indices = None
+        self.pagina = 0
+
+    def semanas(self) -> List[str]:
+        """Semanas presentes nos dados, na ordem da lista."""
+        return list(dict.fromkeys(p["semana"] for p in self.ponderadas))
+
+    def indices(self) -> List[int]:
+        """Índices (em `ponderadas`) que passam pelos filtros atuais."""
+        if self._indices is None:
+            self._indices = [
+                i for i, p in enumerate(self.ponderadas)
+                if (not self.somente_pendentes or not p.get("avaliacao", {}).get("respondida"))
+                and (self.semana is None or p["semana"] == self.semana)
+            ]
+        return self._indices
+
+    # ------------------------------------------------------------------
+    # Paginação
+    # ------------------------------------------------------------------
+
+    @property
+    def total_paginas(self) -> int:
+        return max(1, -(-len(self.indices()) // self.itens_por_pagina))
+
+    def itens_pagina(self) -> List[int]:
+        inicio = self.pagina * self.itens_por_pagina
+        return self.indices()[inicio:inicio + self.itens_por_pagina]
+
+    def proxima(self) -> None:
+        self.pagina = min(self.pagina + 1, self.total_paginas - 1)
+
+    def anterior(self) -> None:
+        self.pagina = max(self.pagina - 1, 0)
+
+    def label(self, indice: int) -> str:
+        """Rótulo de uma ponderada, montado uma vez por dia (ou até `atualizar`)."""
+        hoje = date.today()
+        if hoje != self._labels_dia:
+            self._labels.clear()
+            self._labels_dia = hoje
+        label = self._labels.get(indice)
+        if label is None:
+            label = self._labels[indice] = self.render(self.ponderadas[indice])
+        return label
+
+    def resumo(self) -> str:
+        """Linha de status: total filtrado, página e filtros ativos."""
+        partes = [f"{len(self.indices())} de {len(self.ponderadas)} atividades"]
+        if self.total_paginas > 1:
+            partes.append(f"página {self.pagina + 1}/{self.total_paginas}")
+        if self.somente_pendentes:
+            partes.append("só pendentes")
+        if self.semana:
+            partes.append(self.semana)
+        return " · ".join(partes)
+
+    # ------------------------------------------------------------------
+    # Menu
+    # ------------------------------------------------------------------
+
+    def choices(self) -> list:
+        """Choices do questionary para a página atual + navegação e filtros."""
+        import questionary
+
+        choices = []
+        semana_atual = None
+        itens = self.itens_pagina()
+
+        for n, i in enumerate(itens):
+            semana = self.ponderadas[i]["semana"]
+            if semana != semana_atual:
+                semana_atual = semana
+                if n > 0:
+                    choices.append(questionary.Separator(" "))
+                choices.append(questionary.Separator(f"━━━━━━━━━━ {icons.calendar} {semana} ━━━━━━━━━━"))
+                choices.append(questionary.Separator(" "))
+
+            choices.append(questionary.Choice(title=self.label(i), value=i))
+
+            # Espaçamento entre ponderadas
+            if n < len(itens) - 1:
+                choices.append(questionary.Separator(" "))
+
+        if not itens:
+            choices.append(questionary.Separator("(nenhuma ponderada com estes filtros)"))
+
+        choices.append(questionary.Separator())
+        if self.pagina < self.total_paginas - 1:
+            choices.append(questionary.Choice(title="Próxima página ▶", value=PROXIMA))
+        if self.pagina > 0:
+            choices.append(questionary.Choice(title="◀ Página anterior", value=ANTERIOR))
+        choices.append(questionary.Choice(
+            title=f"{icons.view} {'Mostrar todas' if self.somente_pendentes else 'Só pendentes'}",
+            value=FILTRO_PENDENTES,
+        ))
+        choices.append(questionary.Choice(title=f"{icons.calendar} Filtrar por semana", value=FILTRO_SEMANA))
+        choices.append(questionary.Choice(title=f"{icons.back} Voltar", value=VOLTAR))
+        return choices
@@ -46,6 +46,22 @@ class Settings(BaseSettings):
     # === Logging ===
     log_level: str = "INFO"
     
+    # === Cache ===
+    # Intervalo mínimo entre atualizações de status das ponderadas (userdata)
+    ponderadas_ttl_minutes: int = 5
+
+    # === IA ===
+    # Comando do gerador (o prompt vai como último argumento)
+    ai_command: str = "claude -p"
+    ai_timeout_seconds: int = 180
+    ai_max_concurrent: int = 2
+    # Entradas mantidas no cache de gerações (output/api_extraction/cache_ia)
+    ai_cache_max_entries: int = 200
+    # Tamanho máximo do prompt montado (0 = sem limite)
+    ai_context_budget_chars: int = 24000
+    # Itens de outras semanas/turmas buscados no índice local (0 = desativa)
+    ai_retrieval_k: int = 5
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
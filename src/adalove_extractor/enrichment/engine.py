@@ -10,7 +10,7 @@ Orquestra todos os processos de enriquecimento:
 - Geração de hash
 """
 
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, Iterable, Iterator, Container
 import logging
 
 from .normalizer import (
@@ -20,7 +20,7 @@ from .normalizer import (
     normalize_urls_pipe,
     extract_data_hora_components,
     is_sincrono,
-    detect_known_names,
+    KnownNamesCounter,
 )
 from .anchor import AnchorEngine
 from ..utils.hash import compute_hash
@@ -73,7 +73,7 @@ class EnrichmentEngine:
         enriched = [dict(card) for card in cards_data]
         
         # 1. Detecção de nomes conhecidos (primeira passagem)
-        known_names = detect_known_names(enriched)
+        known_names = KnownNamesCounter.from_cards(enriched)
         
         # 2. Enriquecimento individual de cada card
         for card in enriched:
@@ -84,7 +84,59 @@ class EnrichmentEngine:
         
         return enriched
     
-    def _enrich_single_card(self, card: dict, known_names: list[str]) -> None:
+    def enrich_weeks(
+        self,
+        weeks: Iterable[Tuple[str, Iterable[dict]]],
+        known_names: Optional[KnownNamesCounter] = None,
+    ) -> Iterator[dict]:
+        """
+        Enriquece cards em streaming, uma semana por vez.
+        
+        Variante de `enrich_cards` para entradas grandes: consome um iterável
+        de `(semana, cards)` — o formato de `IncrementalWriter.iter_weeks()` —
+        e produz os cards enriquecidos semana a semana, mantendo em memória
+        apenas a semana corrente. A ancoragem já é feita por semana em
+        `AnchorEngine`, então o resultado por semana é o mesmo do modo em lote.
+        
+        Nomes conhecidos (fallback de professor):
+        - Sem `known_names`, o contador é alimentado à medida que as semanas
+          chegam: cada semana enxerga as contagens acumuladas até ela.
+        - Com `known_names` pré-computado (ex.: uma passagem barata só de
+          contagem sobre o JSONL), o resultado é idêntico ao de `enrich_cards`.
+        
+        Args:
+            weeks: Iterável de tuplas (nome da semana, cards brutos da semana)
+            known_names: Contador pré-computado ou semeado (opcional)
+            
+        Yields:
+            Cards enriquecidos, na ordem de entrada
+        """
+        self.logger.info("🔧 Enriquecendo registros em streaming (semana a semana)...")
+        
+        precomputed = known_names is not None
+        counter = known_names if precomputed else KnownNamesCounter()
+        
+        total = 0
+        for semana, week_cards in weeks:
+            # Cópia apenas da semana corrente
+            enriched = [dict(card) for card in week_cards]
+            
+            if not precomputed:
+                counter.update(enriched)
+            
+            for card in enriched:
+                self._enrich_single_card(card, counter)
+            
+            # Ancoragem da semana (AnchorEngine agrupa por semana_num)
+            enriched = self.anchor_engine.anchor_autoestudos(enriched, self.logger)
+            
+            total += len(enriched)
+            self.logger.debug(f"   ✅ {semana}: {len(enriched)} cards enriquecidos")
+            yield from enriched
+        
+        self.logger.info(f"✅ {total} cards enriquecidos em streaming")
+    
+    def _enrich_single_card(self, card: dict, known_names: Container[str]) -> None:
         """
         Enriquece um card individual com campos derivados.
         
@@ -92,7 +144,7 @@ class EnrichmentEngine:
         
         Args:
             card: Dicionário do card a enriquecer
-            known_names: Lista de nomes frequentes detectados
+            known_names: Nomes frequentes detectados (lista ou KnownNamesCounter)
             
         Deprecated Fields:
             Campos legados mantidos para compatibilidade (serão removidos em v4.0):
@@ -174,7 +226,7 @@ class EnrichmentEngine:
             card.get("professor")
         )
 
-    def _guess_professor_fallback(self, texto: str, known_names: list[str]) -> str:
+    def _guess_professor_fallback(self, texto: str, known_names: Container[str]) -> str:
         """
         Fallback para detecção heurística de professor.
         Usado apenas quando professor não foi extraído deterministicamente.
@@ -7,7 +7,7 @@ complexidade de módulos e melhorar coesão.
 
 import re
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 
 # Regex para detecção de data/hora no formato brasileiro
@@ -184,6 +184,74 @@ def is_sincrono(data_hora: Optional[str]) -> bool:
     return bool(data_hora)
 
 
+class KnownNamesCounter:
+    """
+    Contador incremental de nomes candidatos a professor.
+    
+    Versão de uma passagem de `detect_known_names`: pode ser alimentado aos
+    poucos (semana a semana, como o JSONL incremental produz os cards),
+    semeado com contagens de execuções anteriores ou pré-computado numa
+    passagem barata antes do enriquecimento em streaming.
+    
+    Example:
+        >>> counter = KnownNamesCounter()
+        >>> counter.update([{"texto_completo": "João Silva"}, {"texto_completo": "João Silva"}])
+        >>> "João Silva" in counter
+        True
+    """
+    
+    def __init__(self, seed: Optional[Dict[str, int]] = None, min_count: int = 2):
+        """
+        Inicializa o contador.
+        
+        Args:
+            seed: Contagens prévias {nome: ocorrências} (opcional)
+            min_count: Ocorrências mínimas para um nome ser considerado conhecido
+        """
+        self.counts: Dict[str, int] = dict(seed or {})
+        self.min_count = min_count
+    
+    @classmethod
+    def from_cards(cls, cards_data: Iterable[dict], min_count: int = 2) -> "KnownNamesCounter":
+        """
+        Cria contador já alimentado com um iterável de cards.
+        
+        Args:
+            cards_data: Cards (lista ou gerador — consumido uma única vez)
+            min_count: Ocorrências mínimas para um nome ser considerado conhecido
+            
+        Returns:
+            Contador pré-computado
+        """
+        counter = cls(min_count=min_count)
+        counter.update(cards_data)
+        return counter
+    
+    def update(self, cards_data: Iterable[dict]) -> None:
+        """
+        Conta os nomes candidatos de mais um lote de cards.
+        
+        Args:
+            cards_data: Cards a contabilizar
+        """
+        for card in cards_data:
+            text = card.get("texto_completo") or ""
+            
+            for line in text.splitlines():
+                line = line.strip()
+                
+                # Valida se parece um nome completo
+                if NAME_CANDIDATE_RE.match(line):
+                    self.counts[line] = self.counts.get(line, 0) + 1
+    
+    def known_names(self) -> list[str]:
+        """Retorna os nomes que atingiram `min_count` (ordem de primeira aparição)."""
+        return [name for name, count in self.counts.items() if count >= self.min_count]
+    
+    def __contains__(self, name: object) -> bool:
+        return self.counts.get(name, 0) >= self.min_count  # type: ignore[arg-type]
+
+
 def detect_known_names(cards_data: list[dict]) -> list[str]:
     """
     Detecta nomes que aparecem com frequência nos cards.
@@ -201,25 +269,4 @@ def detect_known_names(cards_data: list[dict]) -> list[str]:
         >>> detect_known_names(cards)
         ["João Silva"]
     """
-    name_counter = {}
-    
-    for card in cards_data:
-        text = card.get("texto_completo") or ""
-        
-        for line in text.splitlines():
-            line = line.strip()
-            
-            # Valida se parece um nome completo
-            if NAME_CANDIDATE_RE.match(line):
-                name_counter[line] = name_counter.get(line, 0) + 1
-    
-    # Retorna nomes que aparecem em pelo menos 2 cards
-    return [name for name, count in name_counter.items() if count >= 2]
-
-
-
-
-
-
-
-
+    return KnownNamesCounter.from_cards(cards_data).known_names()
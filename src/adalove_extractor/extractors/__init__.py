@@ -2,14 +2,15 @@
 Módulo de extração de dados do AdaLove.
 """
 
-from .turma_completa import extrair_turma_completa
-
 __all__ = ["extrair_turma_completa"]
 
 
+# Carregado sob demanda (PEP 562): turma_completa importa o cliente HTTP e as
+# configurações, que só são necessários quando uma extração roda de fato.
+def __getattr__(name):
+    if name == "extrair_turma_completa":
+        from .turma_completa import extrair_turma_completa
 
-
-
-
-
-
+        globals()[name] = extrair_turma_completa
+        return extrair_turma_completa
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
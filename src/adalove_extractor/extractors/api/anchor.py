@@ -251,6 +251,7 @@ def organize_by_encontros(cards: List[Dict[str, Any]]) -> Dict[str, Any]:
                 "_data": data_apenas,  # Para usar como chave
                 "_sort_key": sort_key,  # Para ordenação
                 "_sort": card.get("sort"),  # Para referência de ancoragem
+                "student_activity_uuid": card.get("student_activity_uuid"),
                 "dia_semana": dia_semana,
                 "titulo": card.get("titulo"),
                 "tipo": card_type,
@@ -271,6 +272,7 @@ def organize_by_encontros(cards: List[Dict[str, Any]]) -> Dict[str, Any]:
             if ancora_sort and ancora_sort in autoestudos_por_encontro:
                 titulo_autoestudo = card.get("titulo", "Sem título")
                 autoestudo_entry = {
+                    "student_activity_uuid": card.get("student_activity_uuid"),
                     "descricao": card.get("descricao"),
                     "professor": card.get("professor"),
                     "conteudos_relacionados": card.get("conteudos_relacionados", []),
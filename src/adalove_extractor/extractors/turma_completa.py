@@ -6,7 +6,6 @@ Extrai todas as semanas com detalhes e organiza por pasta.
 
 import asyncio
 import json
-import re
 import logging
 import sys
 from pathlib import Path
@@ -18,7 +17,11 @@ from adalove_extractor.api.endpoints import Endpoints
 from adalove_extractor.config.settings import Settings
 from adalove_extractor.models.api_card_types import get_type_name, get_type_portuguese
 from adalove_extractor.extractors.api.anchor import organize_by_encontros
-from adalove_extractor.utils.text import decode_html_entities
+from adalove_extractor.io.manifest import ExtractionManifest
+from adalove_extractor.io.progress import NULL_REPORTER, ProgressReporter
+from adalove_extractor.io.ponderadas import PONDERADAS_FILENAME, atualizar_avaliacoes, salvar_ponderadas
+from adalove_extractor.io.uuid_index import PENDING_FILENAME, ShardedExtraction, indexar_semana, salvar_indice
+from adalove_extractor.utils.text import decode_html_entities, slugify_semana
 
 # Raiz do projeto (4 níveis acima: extractors -> adalove_extractor -> src -> projeto)
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -45,6 +48,79 @@ async def fetch_activity_details(
         return None
 
 
+def montar_avaliacao(activity: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monta o bloco "avaliacao" (aba Avaliação) de uma atividade ponderada.
+
+    Usado tanto na extração completa quanto na atualização de status, que só
+    busca o userdata da turma.
+    """
+    study_question = activity.get("studyQuestion", "") or ""
+    study_answer = activity.get("studyAnswer", "") or ""
+    grade_result_raw = activity.get("gradeResult", "-1.0")
+    
+    # Converter gradeResult para float (-1.0 = não avaliado)
+    try:
+        grade_result = float(grade_result_raw)
+    except (ValueError, TypeError):
+        grade_result = -1.0
+    
+    return {
+        "peso": activity.get("gradeWeight", 0) or 0,
+        "pergunta": decode_html_entities(study_question),
+        "resposta": decode_html_entities(study_answer) if study_answer else None,
+        "respondida": bool(study_answer.strip()),
+        "nota": grade_result if grade_result >= 0 else None,
+        "avaliada": activity.get("evaluated", 0) == 1,
+        "bloqueada": activity.get("blocked", 0) == 1,
+    }
+
+
+def aplicar_status_ponderadas(turma_dir: Path, activities: List[Dict[str, Any]], cache=None) -> int:
+    """
+    Aplica o status atual (userdata) às ponderadas de uma extração local.
+
+    Pelo índice de UUIDs, regrava só as semanas cujas avaliações mudaram e as
+    entradas correspondentes de ponderadas.json; extracao_completa.json é
+    consolidado na próxima leitura.
+
+    Args:
+        turma_dir: Pasta da turma
+        activities: Lista "activities" do userdata da turma
+        cache: `ExtractionCache` opcional da sessão
+
+    Returns:
+        Número de ponderadas alteradas
+    """
+    activity_map = {
+        act["studentActivityUuid"]: act
+        for act in activities
+        if act.get("studentActivityUuid")
+    }
+    novas = {}
+
+    # Substitui a avaliacao só quando o conteúdo mudou
+    def atualizar_avaliacao(uuid: str, no: Dict[str, Any]) -> bool:
+        if not no.get("is_ponderada"):
+            return False
+        nova = montar_avaliacao(activity_map[uuid])
+        if no.get("avaliacao") == nova:
+            return False
+        no["avaliacao"] = nova
+        novas[uuid] = nova
+        return True
+
+    extracao = ShardedExtraction(turma_dir, cache=cache)
+    uuids = [
+        uuid for uuid, local in extracao.indice().items()
+        if local.get("ponderada") and uuid in activity_map
+    ]
+    alteradas = extracao.aplicar(atualizar_avaliacao, uuids)
+    if novas:
+        atualizar_avaliacoes(turma_dir, novas)
+    return alteradas
+
+
 def simplificar_atividade(activity: Dict[str, Any], semana: str) -> Dict[str, Any]:
     """Simplifica uma atividade extraindo campos essenciais."""
     tipo_num = activity.get("type")
@@ -84,42 +160,20 @@ def simplificar_atividade(activity: Dict[str, Any], semana: str) -> Dict[str, An
     
     # Avaliação (conteúdo da aba "Avaliação" para cards ponderados)
     if card["is_ponderada"]:
-        study_question = activity.get("studyQuestion", "") or ""
-        study_answer = activity.get("studyAnswer", "") or ""
-        grade_result_raw = activity.get("gradeResult", "-1.0")
-        
-        # Converter gradeResult para float (-1.0 = não avaliado)
-        try:
-            grade_result = float(grade_result_raw)
-        except (ValueError, TypeError):
-            grade_result = -1.0
-        
-        card["avaliacao"] = {
-            "peso": grade_weight,
-            "pergunta": decode_html_entities(study_question),
-            "resposta": decode_html_entities(study_answer) if study_answer else None,
-            "respondida": bool(study_answer.strip()),
-            "nota": grade_result if grade_result >= 0 else None,
-            "avaliada": activity.get("evaluated", 0) == 1,
-            "bloqueada": activity.get("blocked", 0) == 1,
-        }
+        card["avaliacao"] = montar_avaliacao(activity)
     
     return card
 
 
-def slugify_semana(semana: str) -> str:
-    """Converte 'Semana 08' para 'semana_08'"""
-    match = re.search(r'(\d+)', semana)
-    if match:
-        num = match.group(1).zfill(2)
-        return f"semana_{num}"
-    return semana.lower().replace(" ", "_")
-
-
-async def extrair_turma_completa(turma_nome: str):
+async def extrair_turma_completa(turma_nome: str, progresso: Optional[ProgressReporter] = None):
     """
     Extrai todas as semanas de uma turma com detalhes e organiza em pastas.
+
+    Args:
+        turma_nome: Nome exato da turma
+        progresso: Destino opcional dos eventos de progresso (JSON lines)
     """
+    rastreio = (progresso or NULL_REPORTER).turma(turma_nome)
     logger.info("=" * 70)
     logger.info(f"🎯 EXTRAÇÃO COMPLETA: {turma_nome}")
     logger.info("=" * 70)
@@ -130,11 +184,13 @@ async def extrair_turma_completa(turma_nome: str):
     async with AdaLoveAPIClient() as client:
         # 1. Autenticar
         logger.info("\n📋 ETAPA 1: Autenticação")
+        rastreio.etapa("autenticacao")
         await client.authenticate(settings.login, settings.senha)
         logger.info("✅ Autenticado!")
         
         # 2. Buscar turma
         logger.info(f"\n📋 ETAPA 2: Localizando turma {turma_nome}")
+        rastreio.etapa("localizacao")
         sections = await client.get(Endpoints.SECTIONS)
         sections = sections if isinstance(sections, list) else sections.get("sections", [])
         
@@ -147,6 +203,7 @@ async def extrair_turma_completa(turma_nome: str):
         
         if not turma_target:
             logger.error(f"❌ Turma {turma_nome} não encontrada!")
+            rastreio.fim(sucesso=False, erro="turma não encontrada")
             return None
         
         turma_uuid = turma_target.get('uuid')
@@ -154,12 +211,14 @@ async def extrair_turma_completa(turma_nome: str):
         
         # 3. Buscar todas as atividades
         logger.info(f"\n📋 ETAPA 3: Extraindo atividades")
+        rastreio.etapa("userdata")
         userdata = await client.get(Endpoints.section_userdata(turma_uuid))
         all_activities = userdata.get("activities", [])
         logger.info(f"   Total de atividades na turma: {len(all_activities)}")
         
         # 4. Agrupar por semana
         logger.info(f"\n📋 ETAPA 4: Agrupando por semana")
+        rastreio.etapa("agrupamento", atividades_total=len(all_activities))
         atividades_por_semana = {}
         
         for activity in all_activities:
@@ -177,6 +236,8 @@ async def extrair_turma_completa(turma_nome: str):
         
         # 5. Buscar detalhes de cada atividade
         logger.info(f"\n📋 ETAPA 5: Buscando detalhes de cada atividade")
+        rastreio.etapa("detalhes", semanas=len(semanas_ordenadas))
+        total_agrupadas = sum(len(v) for v in atividades_por_semana.values())
         
         dados_brutos = {}
         total_atividades = 0
@@ -212,9 +273,12 @@ async def extrair_turma_completa(turma_nome: str):
                 
                 tipo_nome = get_type_portuguese(tipo)[:20]
                 logger.info(f"   [{tipo_nome}] {caption}")
+
+            rastreio.lote(semana, len(dados_brutos[semana]), total_agrupadas)
         
         # 6. Criar estrutura de pastas e salvar
         logger.info(f"\n📋 ETAPA 6: Organizando e salvando")
+        rastreio.etapa("gravacao")
         
         turma_slug = turma_nome.replace(" ", "_")
         turma_dir = output_base / turma_slug
@@ -233,6 +297,7 @@ async def extrair_turma_completa(turma_nome: str):
         
         total_ancoradas = 0
         total_ponderadas = 0
+        indice_uuid = {}
         
         for semana in semanas_ordenadas:
             # Simplifica atividades
@@ -243,6 +308,7 @@ async def extrair_turma_completa(turma_nome: str):
             
             # Adiciona à extração completa
             extracao_completa["semanas"][semana] = semana_organizada
+            indice_uuid.update(indexar_semana(semana, semana_organizada))
             
             # Salva arquivo individual
             semana_file = semanas_dir / f"{slugify_semana(semana)}.json"
@@ -254,6 +320,7 @@ async def extrair_turma_completa(turma_nome: str):
             }
             with open(semana_file, 'w', encoding='utf-8') as f:
                 json.dump(semana_data, f, ensure_ascii=False, indent=2)
+            rastreio.arquivo(semana_file)
             
             # Estatísticas (encontros agora é um dict com data como chave)
             encontros_dict = semana_organizada.get("encontros", {})
@@ -278,6 +345,19 @@ async def extrair_turma_completa(turma_nome: str):
         completo_file = turma_dir / "extracao_completa.json"
         with open(completo_file, 'w', encoding='utf-8') as f:
             json.dump(extracao_completa, f, ensure_ascii=False, indent=2)
+        rastreio.arquivo(completo_file)
+
+        # Índice UUID → semana/caminho para atualizações parciais; a extração
+        # nova substitui qualquer consolidação pendente da anterior
+        rastreio.arquivo(salvar_indice(turma_dir, indice_uuid, timestamp))
+        (turma_dir / PENDING_FILENAME).unlink(missing_ok=True)
+
+        # Lista plana de ponderadas para o viewer (sem percorrer a árvore)
+        salvar_ponderadas(turma_dir, extracao_completa)
+        rastreio.arquivo(turma_dir / PONDERADAS_FILENAME)
+
+        # Registra no manifesto só depois que todos os arquivos foram gravados
+        ExtractionManifest(output_base).update(turma_dir, extracao_completa)
         
         # Resumo
         logger.info("\n" + "=" * 70)
@@ -292,6 +372,12 @@ async def extrair_turma_completa(turma_nome: str):
         logger.info(f"   🔗 Com links: {total_com_links}")
         logger.info("=" * 70)
         
+        rastreio.fim(
+            sucesso=True,
+            semanas=len(semanas_ordenadas),
+            ponderadas=total_ponderadas,
+            pasta=str(turma_dir),
+        )
         return turma_dir
 
 
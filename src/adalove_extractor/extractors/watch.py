@@ -0,0 +1,312 @@
+"""
+Modo watch: detecção de mudanças por polling leve do userdata.
+
+Em vez de re-extrair turmas inteiras pelo cron, `ChangeWatcher` mantém um
+client autenticado e, a cada intervalo (com jitter), faz uma requisição de
+`/sections/{uuid}/userdata` por turma e uma de `/notifications`. Cada atividade
+vira uma impressão digital (hash do JSON) mais um resumo dos campos que
+importam (nota, resposta, bloqueio, data); o estado fica em
+`output/api_extraction/watch_state.json`.
+
+Só atividades novas ou alteradas disparam a busca de detalhes. As mudanças
+saem como eventos JSON, um por linha, e o status das ponderadas alteradas é
+aplicado à extração local (`aplicar_status_ponderadas`).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from adalove_extractor.api.endpoints import Endpoints
+from adalove_extractor.extractors.turma_completa import (
+    aplicar_status_ponderadas,
+    fetch_activity_details,
+)
+from adalove_extractor.utils.fs import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "watch_state.json"
+STATE_VERSION = 1
+
+# Buscas de detalhes simultâneas por ciclo: uma semana nova publica dezenas de atividades
+DETALHES_PARALELO = 4
+
+# Campos resumidos por atividade: permitem dizer o que mudou sem guardar o JSON inteiro
+CAMPOS_OBSERVADOS = {
+    "titulo": "caption",
+    "data": "date",
+    "nota": "gradeResult",
+    "avaliada": "evaluated",
+    "bloqueada": "blocked",
+    "peso": "gradeWeight",
+}
+
+
+def _digest(obj: Any) -> str:
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def resumir_atividade(activity: Dict[str, Any]) -> Dict[str, Any]:
+    """Impressão digital de uma atividade do userdata + campos observados."""
+    resumo = {campo: activity.get(chave) for campo, chave in CAMPOS_OBSERVADOS.items()}
+    resumo["respondida"] = bool((activity.get("studyAnswer") or "").strip())
+    resumo["hash"] = _digest(activity)
+    return resumo
+
+
+def _lista_notificacoes(resposta: Any) -> List[Dict[str, Any]]:
+    if isinstance(resposta, list):
+        return [n for n in resposta if isinstance(n, dict)]
+    if isinstance(resposta, dict):
+        for chave in ("notifications", "data", "items"):
+            if isinstance(resposta.get(chave), list):
+                return [n for n in resposta[chave] if isinstance(n, dict)]
+    return []
+
+
+def _emitir_stdout(evento: Dict[str, Any]) -> None:
+    sys.stdout.write(json.dumps(evento, ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
+
+
+class ChangeWatcher:
+    """
+    Observa turmas extraídas e emite eventos de mudança.
+
+    Tipos de evento ("evento"): inicio, nova_atividade, atividade_alterada,
+    atividade_removida, nota_publicada, resposta_registrada, desbloqueada,
+    notificacao, erro.
+
+    Example:
+        >>> watcher = ChangeWatcher(client, {"2026-1A-T13": "uuid"}, output_dir)
+        >>> await watcher.run()   # até Ctrl+C
+    """
+
+    def __init__(
+        self,
+        client,
+        turmas: Dict[str, str],
+        output_dir: Path,
+        intervalo: float = 300.0,
+        jitter: float = 0.1,
+        backoff_max: float = 3600.0,
+        notificacoes: bool = True,
+        emitir: Optional[Callable[[Dict[str, Any]], None]] = None,
+        detalhes_paralelo: int = DETALHES_PARALELO,
+    ):
+        """
+        Inicializa o observador.
+
+        Args:
+            client: `AdaLoveAPIClient` já autenticado (compartilhado)
+            turmas: Dict nome da turma → UUID da section
+            output_dir: Diretório com as extrações (output/api_extraction)
+            intervalo: Segundos entre ciclos em regime normal
+            jitter: Fração aleatória aplicada ao intervalo (±)
+            backoff_max: Teto do intervalo após falhas consecutivas
+            notificacoes: Também observar /notifications
+            emitir: Destino dos eventos (default: JSON lines em stdout)
+            detalhes_paralelo: Máximo de buscas de detalhes simultâneas
+        """
+        self.client = client
+        self.turmas = turmas
+        self.output_dir = Path(output_dir)
+        self.intervalo = intervalo
+        self.jitter = jitter
+        self.backoff_max = backoff_max
+        self.observar_notificacoes = notificacoes
+        self.emitir = emitir or _emitir_stdout
+        self._sem_detalhes = asyncio.Semaphore(max(1, detalhes_paralelo))
+        self.state_path = self.output_dir / STATE_FILENAME
+        self.falhas_consecutivas = 0
+        self._estado = self._carregar_estado()
+        self._estado_alterado = False
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+
+    def _carregar_estado(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("versao") == STATE_VERSION:
+                return data
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Estado do watch ilegível ({e}); recomeçando do zero")
+        return {"versao": STATE_VERSION, "turmas": {}, "notificacoes": []}
+
+    def _salvar_estado(self) -> None:
+        if self._estado_alterado:
+            atomic_write_json(self.state_path, self._estado, indent=None)
+            self._estado_alterado = False
+
+    def _evento(self, tipo: str, **campos: Any) -> Dict[str, Any]:
+        return {"evento": tipo, "ts": datetime.now().isoformat(timespec="seconds"), **campos}
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    async def poll_turma(self, nome: str, section_uuid: str) -> List[Dict[str, Any]]:
+        """
+        Uma requisição de userdata + detalhes só das atividades novas/alteradas.
+
+        Returns:
+            Eventos gerados (também enviados para `emitir`)
+        """
+        userdata = await self.client.get(Endpoints.section_userdata(section_uuid))
+        activities = [a for a in userdata.get("activities", []) if a.get("studentActivityUuid")]
+        atuais = {a["studentActivityUuid"]: a for a in activities}
+        resumos = {uuid: resumir_atividade(a) for uuid, a in atuais.items()}
+
+        anteriores = self._estado["turmas"].get(section_uuid)
+        eventos: List[Dict[str, Any]] = []
+
+        if anteriores is None:
+            # Primeira observação da turma: só registra a linha de base
+            eventos.append(self._evento("inicio", turma=nome, atividades=len(resumos)))
+        else:
+            alterados = [u for u, r in resumos.items() if anteriores.get(u, {}).get("hash") != r["hash"]]
+            detalhes = await asyncio.gather(*[self._detalhes(u) for u in alterados])
+            for uuid, det in zip(alterados, detalhes):
+                eventos.extend(self._eventos_atividade(nome, atuais[uuid], anteriores.get(uuid), resumos[uuid], det))
+            for uuid in anteriores.keys() - resumos.keys():
+                eventos.append(self._evento(
+                    "atividade_removida", turma=nome, uuid=uuid, titulo=anteriores[uuid].get("titulo"),
+                ))
+
+            if alterados:
+                turma_dir = self.output_dir / nome.replace(" ", "_")
+                if (turma_dir / "extracao_completa.json").exists():
+                    aplicar_status_ponderadas(turma_dir, activities)
+
+        if anteriores != resumos:
+            self._estado["turmas"][section_uuid] = resumos
+            self._estado_alterado = True
+
+        for evento in eventos:
+            self.emitir(evento)
+        return eventos
+
+    async def _detalhes(self, activity_uuid: str) -> Optional[Dict[str, Any]]:
+        async with self._sem_detalhes:
+            return await fetch_activity_details(self.client, activity_uuid)
+
+    def _eventos_atividade(
+        self,
+        turma: str,
+        activity: Dict[str, Any],
+        anterior: Optional[Dict[str, Any]],
+        atual: Dict[str, Any],
+        detalhes: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        base = {
+            "turma": turma,
+            "uuid": activity["studentActivityUuid"],
+            "titulo": activity.get("caption", ""),
+            "semana": activity.get("folderCaption"),
+        }
+        conteudos = [
+            {"titulo": c.get("caption", ""), "url": c.get("reference", "")}
+            for c in (detalhes or {}).get("contents", [])
+        ]
+
+        if anterior is None:
+            return [self._evento("nova_atividade", **base, data=atual["data"], conteudos=conteudos)]
+
+        mudados = sorted(k for k in atual if k != "hash" and atual[k] != anterior.get(k))
+        eventos = [self._evento("atividade_alterada", **base, campos=mudados, conteudos=conteudos)]
+
+        nota = atual.get("nota")
+        try:
+            nota_publicada = "nota" in mudados and float(nota) >= 0
+        except (TypeError, ValueError):
+            nota_publicada = False
+        if nota_publicada:
+            eventos.append(self._evento("nota_publicada", **base, nota=float(nota)))
+        if "respondida" in mudados and atual["respondida"]:
+            eventos.append(self._evento("resposta_registrada", **base))
+        if "bloqueada" in mudados and not atual["bloqueada"]:
+            eventos.append(self._evento("desbloqueada", **base))
+        return eventos
+
+    async def poll_notificacoes(self) -> List[Dict[str, Any]]:
+        """Uma requisição de /notifications; emite só as notificações não vistas."""
+        itens = _lista_notificacoes(await self.client.get(Endpoints.NOTIFICATIONS))
+        vistas = set(self._estado.get("notificacoes", []))
+        primeira_vez = "notificacoes_iniciadas" not in self._estado
+
+        eventos = []
+        chaves = []
+        for item in itens:
+            chave = str(item.get("id") or item.get("uuid") or _digest(item))
+            chaves.append(chave)
+            if chave not in vistas and not primeira_vez:
+                eventos.append(self._evento("notificacao", id=chave, dados=item))
+
+        if set(chaves) != vistas or primeira_vez:
+            self._estado["notificacoes"] = chaves
+            self._estado["notificacoes_iniciadas"] = True
+            self._estado_alterado = True
+
+        for evento in eventos:
+            self.emitir(evento)
+        return eventos
+
+    async def ciclo(self) -> List[Dict[str, Any]]:
+        """
+        Um ciclo completo: todas as turmas (e notificações) em paralelo.
+
+        Falhas de uma turma viram eventos "erro" e contam para o backoff; as
+        demais turmas do ciclo seguem normalmente.
+        """
+        tarefas = [self.poll_turma(nome, uuid) for nome, uuid in self.turmas.items()]
+        rotulos = list(self.turmas)
+        if self.observar_notificacoes:
+            tarefas.append(self.poll_notificacoes())
+            rotulos.append("(notificações)")
+
+        resultados = await asyncio.gather(*tarefas, return_exceptions=True)
+
+        eventos: List[Dict[str, Any]] = []
+        falhou = False
+        for rotulo, resultado in zip(rotulos, resultados):
+            if isinstance(resultado, BaseException):
+                if isinstance(resultado, asyncio.CancelledError):
+                    raise resultado
+                falhou = True
+                erro = self._evento("erro", turma=rotulo, mensagem=str(resultado))
+                self.emitir(erro)
+                eventos.append(erro)
+            else:
+                eventos.extend(resultado)
+
+        self.falhas_consecutivas = self.falhas_consecutivas + 1 if falhou else 0
+        self._salvar_estado()
+        return eventos
+
+    def proximo_intervalo(self) -> float:
+        """Intervalo até o próximo ciclo: backoff exponencial após falhas, com jitter."""
+        base = min(self.intervalo * (2 ** self.falhas_consecutivas), self.backoff_max)
+        return max(0.0, base * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    async def run(self, max_ciclos: Optional[int] = None) -> None:
+        """Executa ciclos até ser cancelado (ou até `max_ciclos`)."""
+        feitos = 0
+        while max_ciclos is None or feitos < max_ciclos:
+            await self.ciclo()
+            feitos += 1
+            if max_ciclos is not None and feitos >= max_ciclos:
+                break
+            await asyncio.sleep(self.proximo_intervalo())
@@ -4,8 +4,12 @@ from pathlib import Path
 import json
 import logging
 import re
+from typing import Iterator
 from urllib.parse import urlparse
 
+from ..utils.hash import compute_hash
+from ..utils.keyword_matcher import HostSuffixIndex, KeywordMatcher
+
 
 # Caminho default do mapeamento de áreas: <repo>/config/areas.json.
 # calendar.py está em src/adalove_extractor/io/, então a raiz do repo está 3 níveis acima.
@@ -42,6 +46,7 @@ class ICalendarExport:
         self.horario_padrao = horario_padrao
         self.duracao_padrao = duracao_padrao
         self._areas = self._carregar_areas_config(areas_config_path or _DEFAULT_AREAS_CONFIG)
+        self._compilar_classificadores()
 
     def _carregar_areas_config(self, caminho: Path) -> dict:
         """Carrega o mapeamento de áreas. Se faltar/inválido, usa fallback embutido."""
@@ -59,37 +64,37 @@ class ICalendarExport:
             self.logger.error(f"areas.json inválido ({e}); usando fallback embutido")
             return _AREAS_FALLBACK
 
+    def _compilar_classificadores(self) -> None:
+        """Compila o areas.json uma única vez em estruturas de busca de passagem única.
+
+        - palavras: autômato Aho-Corasick; o valor de cada padrão é a chave de
+          ordenação `(-len, ordem_da_area, area)`, então o menor match é o
+          longest-match com desempate pela ordem de declaração.
+        - professores: autômato Aho-Corasick com prioridade pela ordem do dict.
+        - dominios: índice hash consultado pelos sufixos do host.
+        """
+        self._matcher_palavras = KeywordMatcher()
+        for ordem, (area, palavras) in enumerate((self._areas.get("palavras") or {}).items()):
+            for p in palavras:
+                pl = p.lower()
+                self._matcher_palavras.add(pl, (-len(pl), ordem, area))
+
+        self._matcher_professores = KeywordMatcher(
+            (chave.lower(), (ordem, area))
+            for ordem, (chave, area) in enumerate((self._areas.get("professores") or {}).items())
+        )
+
+        self._indice_dominios = HostSuffixIndex((self._areas.get("dominios") or {}).items())
+
     def gerar_calendario(self, extracao_data: dict, output_path: Path) -> bool:
-        cal = Calendar()
-        cal.add('prodid', '-//AdaLove Extractor Enhanced//br//')
-        cal.add('version', '2.0')
-        cal.add('calscale', 'GREGORIAN')
+        cal = self._novo_calendario()
 
         eventos_adicionados = 0
 
-        semanas = extracao_data.get("semanas", {})
-        for semana_key, semana_data in semanas.items():
-            if not isinstance(semana_data, dict):
-                continue
-            
-            # Percorrer encontros
-            encontros = semana_data.get("encontros", {})
-            for date_key, card in encontros.items():
-                # No formato api_extraction, 'tipo' comeca com 'encontro'
-                tipo = card.get("tipo", "").lower()
-                if "encontro" in tipo or card.get("is_sincrono") or card.get("is_encontro"):
-                    adicionado = self._adicionar_evento(cal, card, semana_key, date_key=date_key)
-                    if adicionado:
-                        eventos_adicionados += 1
-
-            # Sem âncora
-            sem_ancora = semana_data.get("sem_ancora", [])
-            for card in sem_ancora:
-                tipo = card.get("tipo", "").lower()
-                if "encontro" in tipo or card.get("is_sincrono") or card.get("is_encontro"):
-                    adicionado = self._adicionar_evento(cal, card, semana_key)
-                    if adicionado:
-                        eventos_adicionados += 1
+        for semana_key, card, date_key in self._iter_cards_evento(extracao_data):
+            adicionado = self._adicionar_evento(cal, card, semana_key, date_key=date_key)
+            if adicionado:
+                eventos_adicionados += 1
 
         if eventos_adicionados > 0:
             try:
@@ -105,6 +110,50 @@ class ICalendarExport:
             self.logger.info("Nenhum evento síncrono encontrado para gerar o calendário.")
             return False
 
+    def _novo_calendario(self) -> Calendar:
+        """Calendar vazio com os cabeçalhos padrão do exportador."""
+        cal = Calendar()
+        cal.add('prodid', '-//AdaLove Extractor Enhanced//br//')
+        cal.add('version', '2.0')
+        cal.add('calscale', 'GREGORIAN')
+        return cal
+
+    def _iter_cards_evento(self, extracao_data: dict) -> Iterator[tuple[str, dict, str]]:
+        """Percorre a extração e produz os cards que viram evento no calendário.
+
+        Yields:
+            Tuplas (semana, card, date_key). `date_key` é a chave de data do
+            encontro (YYYY-MM-DD) ou "" para cards sem âncora.
+        """
+        semanas = extracao_data.get("semanas", {})
+        for semana_key, semana_data in semanas.items():
+            if not isinstance(semana_data, dict):
+                continue
+
+            # Percorrer encontros
+            encontros = semana_data.get("encontros", {})
+            for date_key, card in encontros.items():
+                # No formato api_extraction, 'tipo' comeca com 'encontro'
+                if self._is_evento(card):
+                    yield semana_key, card, date_key
+
+            # Sem âncora
+            for card in semana_data.get("sem_ancora", []):
+                if self._is_evento(card):
+                    yield semana_key, card, ""
+
+    def iter_eventos(self, extracao_data: dict) -> Iterator[Event]:
+        """Produz os VEVENTs da extração, um por vez, sem montar um Calendar."""
+        for semana_key, card, date_key in self._iter_cards_evento(extracao_data):
+            event = self._montar_evento(card, semana_key, date_key=date_key)
+            if event is not None:
+                yield event
+
+    @staticmethod
+    def _is_evento(card: dict) -> bool:
+        tipo = card.get("tipo", "").lower()
+        return "encontro" in tipo or bool(card.get("is_sincrono") or card.get("is_encontro"))
+
     def _determinar_prefixo(self, card: dict) -> str:
         """Determina o prefixo da disciplina aplicando sinais em cascata.
 
@@ -213,32 +262,35 @@ class ICalendarExport:
         return urls
 
     def _classificar_por_dominio(self, urls: list[str]) -> str | None:
-        """Retorna a primeira área cujo domínio configurado bate em alguma URL."""
-        mapa = self._areas.get("dominios") or {}
-        if not mapa or not urls:
+        """Retorna a área do domínio configurado (de maior prioridade) que casa com alguma URL.
+
+        Um domínio casa quando é sufixo de rótulo do host (`www.x.org` casa `x.org`).
+        Em empate entre URLs, a ordem de declaração no JSON desempata.
+        """
+        if not len(self._indice_dominios) or not urls:
             return None
-        dominios_url = []
+        melhor: tuple | None = None
         for u in urls:
             try:
                 host = (urlparse(u).hostname or "").lower()
             except ValueError:
                 continue
-            if host:
-                dominios_url.append(host)
-        for dominio_cfg, area in mapa.items():
-            alvo = dominio_cfg.lower()
-            if any(alvo in host for host in dominios_url):
-                return area
-        return None
+            if not host:
+                continue
+            hit = self._indice_dominios.lookup(host)
+            if hit is not None and (melhor is None or hit[0] < melhor[0]):
+                melhor = hit
+        return melhor[1] if melhor else None
 
     def _classificar_por_professor(self, professor_lower: str) -> str | None:
         """Substring match no nome do professor. Ordem de iteração do dict define prioridade."""
         if not professor_lower:
             return None
-        for chave, area in (self._areas.get("professores") or {}).items():
-            if chave.lower() in professor_lower:
-                return area
-        return None
+        melhor = min(
+            (valor for _, valor in self._matcher_professores.iter_matches(professor_lower)),
+            default=None,
+        )
+        return melhor[1] if melhor else None
 
     def _montar_texto_card(self, card: dict) -> str:
         """Concatena título, assuntos_relacionados e títulos dos autoestudos em texto único.
@@ -274,24 +326,32 @@ class ICalendarExport:
 
         Em empate de comprimento, a ordem de declaração no JSON desempata
         (dict preserva insertion order desde Python 3.7+).
+
+        O texto é percorrido uma única vez pelo autômato compilado em
+        `_compilar_classificadores`, independente do número de palavras-chave.
         """
         if not texto_lower:
             return None
-        candidatos: list[tuple[int, int, str]] = []
-        for ordem, (area, palavras) in enumerate((self._areas.get("palavras") or {}).items()):
-            for p in palavras:
-                pl = p.lower()
-                if len(pl) < min_len:
-                    continue
-                if pl in texto_lower:
-                    candidatos.append((-len(pl), ordem, area))
-        if not candidatos:
-            return None
-        candidatos.sort()
-        return candidatos[0][2]
+        melhor = min(
+            (
+                chave
+                for tamanho, chave in self._matcher_palavras.iter_matches(texto_lower)
+                if tamanho >= min_len
+            ),
+            default=None,
+        )
+        return melhor[2] if melhor else None
 
     def _adicionar_evento(self, cal: Calendar, card: dict, semana_nome: str, date_key: str = "") -> bool:
         """Adiciona um único evento ao calendário se possuir horários válidos."""
+        event = self._montar_evento(card, semana_nome, date_key=date_key)
+        if event is None:
+            return False
+        cal.add_component(event)
+        return True
+
+    def _montar_evento(self, card: dict, semana_nome: str, date_key: str = "") -> Event | None:
+        """Monta o VEVENT de um card, ou None se não houver horário válido."""
         dt_start = None
         
         # 1. Tentar parse iso (caso exista EnrichedCard structure no futuro)
@@ -332,7 +392,7 @@ class ICalendarExport:
                 pass
 
         if not dt_start:
-            return False
+            return None
 
         # Configuração de duração padrão a partir da instância
         dt_end = dt_start + timedelta(hours=self.duracao_padrao)
@@ -402,8 +462,22 @@ class ICalendarExport:
         desc_final = "\n".join(descricao_linhas).strip()
         event.add('description', vText(desc_final))
         
-        uid_base = card.get("record_hash") or card.get("id") or str(dt_start.timestamp())
-        event.add('uid', f"adalove-{uid_base}@inteli.edu.br")
+        event.add('uid', self._uid_evento(card, date_key))
+        return event
 
-        cal.add_component(event)
-        return True
+    @staticmethod
+    def _uid_evento(card: dict, date_key: str = "") -> str:
+        """UID estável entre execuções.
+
+        Usa a identidade do card quando existe (record_hash, id ou
+        student_activity_uuid). Sem ela, deriva de campos de conteúdo estáveis
+        (data do encontro + título) — nunca do horário calculado, que muda com
+        `horario_padrao` e fazia clientes de calendário reimportarem tudo.
+        """
+        uid_base = (
+            card.get("record_hash")
+            or card.get("id")
+            or card.get("student_activity_uuid")
+            or compute_hash(date_key or card.get("data_hora_iso") or card.get("data_hora"), card.get("titulo"))
+        )
+        return f"adalove-{uid_base}@inteli.edu.br"
@@ -0,0 +1,85 @@
+"""
+Calendário combinado de várias turmas em streaming.
+
+Em vez de carregar todas as extrações e montar um único `icalendar.Calendar`
+em memória, `gerar_calendario_combinado` processa uma turma por vez e grava
+cada bloco VEVENT direto no arquivo de saída. Só a extração da turma corrente
+e o conjunto de UIDs já emitidos ficam em memória, então o consumo não cresce
+com o número de turmas.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from ..utils.fs import atomic_writer
+from .calendar import ICalendarExport
+
+logger = logging.getLogger(__name__)
+
+_FOOTER = b"END:VCALENDAR\r\n"
+
+
+def _cabecalho(exporter: ICalendarExport) -> bytes:
+    header = exporter._novo_calendario().to_ical()
+    return header[: -len(_FOOTER)] if header.endswith(_FOOTER) else header
+
+
+def gerar_calendario_combinado(
+    extracoes: Iterable[Path],
+    output_path: Path,
+    exporter: Optional[ICalendarExport] = None,
+) -> Dict[str, int]:
+    """
+    Gera um único .ics com os encontros de várias turmas.
+
+    Eventos com o mesmo UID em turmas diferentes (ex.: um encontro
+    compartilhado) são emitidos só na primeira turma em que aparecem.
+    Extrações ilegíveis são registradas no log e puladas. O arquivo final é
+    trocado atomicamente, então leitores nunca veem um .ics pela metade.
+
+    Args:
+        extracoes: Caminhos de `extracao_completa.json`, na ordem desejada
+        output_path: Arquivo .ics de saída
+        exporter: Exportador com horário/duração/áreas configurados
+
+    Returns:
+        Estatísticas: turmas, turmas_com_erro, eventos, duplicados
+    """
+    exporter = exporter or ICalendarExport()
+    stats = {"turmas": 0, "turmas_com_erro": 0, "eventos": 0, "duplicados": 0}
+    uids_emitidos: set[str] = set()
+
+    with atomic_writer(Path(output_path)) as out:
+        out.write(_cabecalho(exporter))
+
+        for caminho in extracoes:
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    extracao = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Extração ignorada no calendário combinado ({caminho}): {e}")
+                stats["turmas_com_erro"] += 1
+                continue
+
+            stats["turmas"] += 1
+            for event in exporter.iter_eventos(extracao):
+                uid = str(event.get("uid"))
+                if uid in uids_emitidos:
+                    stats["duplicados"] += 1
+                    continue
+                uids_emitidos.add(uid)
+                out.write(event.to_ical())
+                stats["eventos"] += 1
+
+            # Libera a extração antes de carregar a próxima
+            del extracao
+
+        out.write(_FOOTER)
+
+    logger.info(
+        f"Calendário combinado gerado em {output_path} "
+        f"({stats['turmas']} turmas, {stats['eventos']} eventos, {stats['duplicados']} duplicados)"
+    )
+    return stats
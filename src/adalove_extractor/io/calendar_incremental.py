@@ -0,0 +1,204 @@
+"""
+Exportação incremental do calendário (.ics).
+
+`ICalendarExport.gerar_calendario` reconstrói o `Calendar` inteiro a cada
+exportação: reclassifica prefixos, remonta descrições e re-serializa todos os
+eventos. `IncrementalCalendarExport` mantém, ao lado do .ics, um cache por
+evento indexado pelo digest do conteúdo do encontro (incluindo seus
+autoestudos) e das configurações que afetam a renderização. Só os VEVENTs cujo
+digest mudou são reconstruídos; os demais são reaproveitados como texto já
+serializado e emendados entre o cabeçalho e o rodapé do VCALENDAR.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.fs import atomic_write_bytes, atomic_write_json
+from .calendar import ICalendarExport
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato do cache; mudar invalida todos os caches existentes
+CACHE_VERSION = 1
+
+_FOOTER = b"END:VCALENDAR\r\n"
+
+
+class IncrementalCalendarExport(ICalendarExport):
+    """
+    Exportador .ics que só reconstrói os eventos alterados desde a última execução.
+
+    O cache é um JSON `{digest: {"uid": ..., "ics": ...}}` salvo ao lado do
+    arquivo de saída (`<saida>.cache.json` por padrão). Entradas não usadas na
+    execução atual são descartadas, então o cache acompanha o tamanho da turma.
+
+    Example:
+        >>> exporter = IncrementalCalendarExport(horario_padrao="10:00")
+        >>> exporter.gerar_calendario(extracao, Path("turma_calendario.ics"))
+        >>> exporter.ultimas_estatisticas
+        {'eventos': 42, 'reaproveitados': 40, 'reconstruidos': 2, ...}
+    """
+
+    def __init__(self, *args, cache_path: Optional[Path] = None, **kwargs):
+        """
+        Inicializa o exportador.
+
+        Args:
+            cache_path: Caminho do cache (default: derivado do arquivo de saída)
+            *args, **kwargs: Repassados para `ICalendarExport`
+        """
+        super().__init__(*args, **kwargs)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ultimas_estatisticas: Dict[str, int] = {}
+        # Blocos (uid, VEVENT serializado) da última geração, na ordem do arquivo
+        self.ultimos_blocos: List[Tuple[str, bytes]] = []
+        self._fingerprint = self._fingerprint_config()
+
+    def _fingerprint_config(self) -> str:
+        """Digest das configurações que mudam o texto de qualquer evento."""
+        config = {
+            "horario_padrao": self.horario_padrao,
+            "duracao_padrao": self.duracao_padrao,
+            "areas": self._areas,
+        }
+        return hashlib.sha1(
+            json.dumps(config, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def _digest_evento(self, semana_key: str, card: dict, date_key: str) -> str:
+        """Digest do conteúdo de um encontro (com autoestudos) + configuração."""
+        payload = json.dumps(
+            [self._fingerprint, semana_key, date_key, card],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _resolver_cache_path(self, output_path: Path) -> Path:
+        return self.cache_path or Path(output_path).with_suffix(".cache.json")
+
+    def _carregar_cache(self, caminho: Path) -> Dict[str, dict]:
+        """Carrega o cache de eventos. Cache ausente ou corrompido = vazio."""
+        try:
+            with open(caminho, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Cache do calendário ilegível ({e}); reconstruindo todos os eventos")
+            return {}
+
+        if not isinstance(data, dict) or data.get("versao") != CACHE_VERSION:
+            return {}
+        eventos = data.get("eventos")
+        return eventos if isinstance(eventos, dict) else {}
+
+    def iter_vevents(
+        self,
+        extracao_data: dict,
+        cache: Dict[str, dict],
+        usados: Dict[str, dict],
+    ) -> Iterator[Tuple[str, bytes]]:
+        """
+        Produz os VEVENTs serializados, reaproveitando o cache quando possível.
+
+        Eventos com UID repetido (o mesmo encontro listado duas vezes) são
+        emitidos só uma vez — clientes de calendário rejeitam UIDs duplicados.
+
+        Args:
+            extracao_data: Dados de extracao_completa.json
+            cache: Cache carregado da execução anterior (somente leitura)
+            usados: Dict preenchido com as entradas usadas nesta execução
+
+        Yields:
+            Tuplas (uid, bytes do bloco BEGIN:VEVENT ... END:VEVENT)
+        """
+        uids_emitidos: set[str] = set()
+        stats = self.ultimas_estatisticas
+
+        for semana_key, card, date_key in self._iter_cards_evento(extracao_data):
+            digest = self._digest_evento(semana_key, card, date_key)
+
+            entrada = usados.get(digest) or cache.get(digest)
+            if entrada is not None:
+                stats["reaproveitados"] += 1
+            else:
+                event = self._montar_evento(card, semana_key, date_key=date_key)
+                if event is None:
+                    continue
+                entrada = {
+                    "uid": str(event.get("uid")),
+                    "ics": event.to_ical().decode("utf-8"),
+                }
+                stats["reconstruidos"] += 1
+            usados[digest] = entrada
+
+            uid = entrada["uid"]
+            if uid in uids_emitidos:
+                stats["duplicados"] += 1
+                continue
+            uids_emitidos.add(uid)
+            stats["eventos"] += 1
+            yield uid, entrada["ics"].encode("utf-8")
+
+    def montar_ics(self, blocos: Iterable[Tuple[str, bytes]]) -> bytes:
+        """Monta o .ics completo: cabeçalho + blocos VEVENT + rodapé."""
+        header = self._novo_calendario().to_ical()
+        if header.endswith(_FOOTER):
+            header = header[: -len(_FOOTER)]
+
+        partes = [header]
+        partes.extend(bloco for _, bloco in blocos)
+        partes.append(_FOOTER)
+        return b"".join(partes)
+
+    def render(self, extracao_data: dict, cache: Dict[str, dict], usados: Dict[str, dict]) -> bytes:
+        """Renderiza a extração inteira, reaproveitando o cache."""
+        return self.montar_ics(self.iter_vevents(extracao_data, cache, usados))
+
+    def gerar_calendario(self, extracao_data: dict, output_path: Path) -> bool:
+        output_path = Path(output_path)
+        cache_path = self._resolver_cache_path(output_path)
+        cache = self._carregar_cache(cache_path)
+        usados: Dict[str, dict] = {}
+        self.ultimas_estatisticas = {
+            "eventos": 0,
+            "reaproveitados": 0,
+            "reconstruidos": 0,
+            "duplicados": 0,
+            "removidos": 0,
+        }
+
+        self.ultimos_blocos = list(self.iter_vevents(extracao_data, cache, usados))
+        conteudo = self.montar_ics(self.ultimos_blocos)
+        stats = self.ultimas_estatisticas
+        stats["removidos"] = len(set(cache) - set(usados))
+
+        if stats["eventos"] == 0:
+            self.logger.info("Nenhum evento síncrono encontrado para gerar o calendário.")
+            return False
+
+        try:
+            atual = output_path.read_bytes() if output_path.exists() else None
+            if atual != conteudo:
+                atomic_write_bytes(output_path, conteudo)
+            if stats["reconstruidos"] or stats["removidos"] or not cache_path.exists():
+                atomic_write_json(
+                    cache_path,
+                    {"versao": CACHE_VERSION, "eventos": usados},
+                    indent=None,
+                )
+        except OSError as e:
+            self.logger.error(f"Erro ao salvar arquivo .ics: {e}")
+            return False
+
+        self.logger.info(
+            f"Calendário gerado em {output_path} ({stats['eventos']} eventos: "
+            f"{stats['reaproveitados']} do cache, {stats['reconstruidos']} reconstruídos, "
+            f"{stats['removidos']} removidos)"
+        )
+        return True
@@ -0,0 +1,356 @@
+"""
+Servidor local de feeds de calendário (.ics) com GET condicional.
+
+Serve o calendário de cada turma extraída (`/<turma_slug>.ics`) e um feed
+combinado (`/todas.ics`) direto da memória, a partir do exportador incremental
+(`IncrementalCalendarExport`) — nada de copiar arquivos após cada exportação.
+
+- ETag forte (SHA1 do corpo); `If-None-Match` correspondente → 304 sem corpo,
+  então clientes que fazem polling custam quase nada.
+- Variante gzip pré-computada quando o cliente envia `Accept-Encoding: gzip`,
+  com ETag própria (representações diferentes não compartilham ETag forte).
+- Uma tarefa em background observa `extracao_completa.json` (mtime + tamanho)
+  e regenera apenas os feeds das turmas alteradas.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from .calendar_incremental import IncrementalCalendarExport
+from .uuid_index import PENDING_FILENAME, ShardedExtraction
+
+logger = logging.getLogger(__name__)
+
+COMBINED_FEED = "todas"
+CONTENT_TYPE = "text/calendar; charset=utf-8"
+
+# Tempo máximo esperando a próxima requisição numa conexão keep-alive
+KEEPALIVE_TIMEOUT_SECONDS = 15.0
+MAX_HEADER_LINES = 100
+
+
+@dataclass
+class Feed:
+    """Representações prontas de um feed .ics."""
+
+    body: bytes
+    etag: str
+    gzip_body: bytes
+    gzip_etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "Feed":
+        digest = hashlib.sha1(body).hexdigest()
+        # mtime=0 deixa o gzip determinístico para o mesmo corpo
+        return cls(
+            body=body,
+            etag=f'"{digest}"',
+            gzip_body=gzip.compress(body, mtime=0),
+            gzip_etag=f'"{digest}-gz"',
+        )
+
+
+def _etag_match(if_none_match: str, etag: str) -> bool:
+    """Comparação fraca de If-None-Match (RFC 9110 §13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidatos = [c.strip() for c in if_none_match.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidatos)
+
+
+def _aceita_gzip(accept_encoding: str) -> bool:
+    for item in accept_encoding.split(","):
+        nome, _, params = item.strip().partition(";")
+        if nome.strip().lower() in ("gzip", "x-gzip", "*"):
+            q = params.strip().lower()
+            return q not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class CalendarFeedServer:
+    """
+    Servidor HTTP asyncio que publica os calendários das turmas extraídas.
+
+    Example:
+        >>> server = CalendarFeedServer(Path("output/api_extraction"), port=8765)
+        >>> await server.start()
+        >>> await server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        horario_padrao: str = "10:00",
+        duracao_padrao: int = 2,
+        poll_interval: float = 5.0,
+        areas_config_path: Optional[Path] = None,
+    ):
+        """
+        Inicializa o servidor (sem abrir a porta; veja `start`).
+
+        Args:
+            output_dir: Diretório com as pastas das turmas (output/api_extraction)
+            host: Interface de escuta (default: só localhost)
+            port: Porta TCP (0 = escolhida pelo sistema)
+            horario_padrao: Horário de início dos encontros (HH:MM)
+            duracao_padrao: Duração dos encontros em horas
+            poll_interval: Intervalo em segundos entre verificações de mudança
+            areas_config_path: areas.json alternativo (opcional)
+        """
+        self.output_dir = Path(output_dir)
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.exporter = IncrementalCalendarExport(
+            horario_padrao=horario_padrao,
+            duracao_padrao=duracao_padrao,
+            areas_config_path=areas_config_path,
+        )
+
+        self.feeds: Dict[str, Feed] = {}
+        # Por turma: assinatura (mtime_ns, size[, mtime do marcador]) da extração e blocos VEVENT
+        self._assinaturas: Dict[str, Tuple[int, ...]] = {}
+        self._blocos: Dict[str, List[Tuple[str, bytes]]] = {}
+        self._lock = asyncio.Lock()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._watcher: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Geração dos feeds
+    # ------------------------------------------------------------------
+
+    def _gerar_turma(self, slug: str, extracao_path: Path) -> List[Tuple[str, bytes]]:
+        """Regenera (incrementalmente) o .ics de uma turma e devolve seus blocos."""
+        # Inclui semanas atualizadas parcialmente, sem regravar a extração
+        extracao = ShardedExtraction(extracao_path.parent).carregar(persistir=False)
+        if extracao is None:
+            raise FileNotFoundError(extracao_path)
+        output_path = extracao_path.parent / f"{slug}_calendario.ics"
+        self.exporter.gerar_calendario(extracao, output_path)
+        return list(self.exporter.ultimos_blocos)
+
+    def _montar_combinado(self) -> bytes:
+        uids: set[str] = set()
+        blocos = []
+        for slug in sorted(self._blocos):
+            for uid, bloco in self._blocos[slug]:
+                if uid not in uids:
+                    uids.add(uid)
+                    blocos.append((uid, bloco))
+        return self.exporter.montar_ics(blocos)
+
+    def _varrer(self) -> Dict[str, Tuple[Path, Tuple[int, ...]]]:
+        encontrados = {}
+        if not self.output_dir.exists():
+            return encontrados
+        for extracao_path in self.output_dir.glob("*/extracao_completa.json"):
+            try:
+                st = extracao_path.stat()
+            except OSError:
+                continue
+            assinatura = (st.st_mtime_ns, st.st_size)
+            try:
+                # Atualizações parciais mexem só nos shards e no marcador de pendência
+                assinatura += (extracao_path.with_name(PENDING_FILENAME).stat().st_mtime_ns,)
+            except OSError:
+                pass
+            encontrados[extracao_path.parent.name] = (extracao_path, assinatura)
+        return encontrados
+
+    async def refresh(self) -> List[str]:
+        """
+        Regenera os feeds cujas extrações mudaram desde a última verificação.
+
+        Returns:
+            Slugs das turmas regeneradas ou removidas
+        """
+        async with self._lock:
+            encontrados = await asyncio.to_thread(self._varrer)
+            alterados = []
+
+            for slug in list(self._assinaturas):
+                if slug not in encontrados:
+                    self._assinaturas.pop(slug)
+                    self._blocos.pop(slug, None)
+                    self.feeds.pop(slug, None)
+                    alterados.append(slug)
+
+            for slug, (extracao_path, assinatura) in sorted(encontrados.items()):
+                if self._assinaturas.get(slug) == assinatura:
+                    continue
+                try:
+                    blocos = await asyncio.to_thread(self._gerar_turma, slug, extracao_path)
+                except Exception as e:
+                    # Extração em andamento ou malformada: o último feed bom continua
+                    # servido, e a turma é tentada de novo no próximo ciclo
+                    logger.warning(f"Calendário de {slug} não regenerado: {e!r}")
+                    continue
+                self._assinaturas[slug] = assinatura
+                self._blocos[slug] = blocos
+                self.feeds[slug] = Feed.from_body(self.exporter.montar_ics(blocos))
+                alterados.append(slug)
+
+            if alterados or COMBINED_FEED not in self.feeds:
+                self.feeds[COMBINED_FEED] = Feed.from_body(self._montar_combinado())
+                if alterados:
+                    logger.info(f"Feeds regenerados: {', '.join(alterados)}")
+            return alterados
+
+    async def _observar(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Erro ao atualizar feeds de calendário: {e}")
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Gera os feeds iniciais, abre a porta e inicia o observador."""
+        await self.refresh()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._watcher = asyncio.create_task(self._observar())
+        logger.info(f"Servindo calendários em http://{self.host}:{self.port}/")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "CalendarFeedServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+
+                headers: Dict[str, str] = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = line.decode("latin-1").partition(":")
+                    headers[nome.strip().lower()] = valor.strip()
+
+                partes = request_line.decode("latin-1").split()
+                if len(partes) != 3:
+                    await self._responder(writer, 400, b"Bad Request\n", fechar=True)
+                    break
+                metodo, alvo, versao = partes
+
+                fechar = headers.get("connection", "").lower() == "close" or versao == "HTTP/1.0"
+                await self._despachar(writer, metodo, alvo, headers, fechar)
+                if fechar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _despachar(
+        self,
+        writer: asyncio.StreamWriter,
+        metodo: str,
+        alvo: str,
+        headers: Dict[str, str],
+        fechar: bool,
+    ) -> None:
+        if metodo not in ("GET", "HEAD"):
+            await self._responder(writer, 405, b"Method Not Allowed\n", {"Allow": "GET, HEAD"}, fechar=fechar)
+            return
+
+        caminho = unquote(urlsplit(alvo).path).strip("/")
+        if caminho == "":
+            indice = "".join(f"/{nome}.ics\n" for nome in sorted(self.feeds)).encode("utf-8")
+            await self._responder(writer, 200, indice, {"Content-Type": "text/plain; charset=utf-8"},
+                                  head=metodo == "HEAD", fechar=fechar)
+            return
+
+        feed = self.feeds.get(caminho.removesuffix(".ics")) if caminho.endswith(".ics") else None
+        if feed is None:
+            await self._responder(writer, 404, b"Not Found\n", head=metodo == "HEAD", fechar=fechar)
+            return
+
+        if _aceita_gzip(headers.get("accept-encoding", "")):
+            body, etag, extra = feed.gzip_body, feed.gzip_etag, {"Content-Encoding": "gzip"}
+        else:
+            body, etag, extra = feed.body, feed.etag, {}
+
+        comuns = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _etag_match(if_none_match, etag):
+            await self._responder(writer, 304, b"", comuns, head=True, fechar=fechar)
+            return
+
+        await self._responder(
+            writer, 200, body, {**comuns, **extra, "Content-Type": CONTENT_TYPE},
+            head=metodo == "HEAD", fechar=fechar,
+        )
+
+    async def _responder(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        head: bool = False,
+        fechar: bool = False,
+    ) -> None:
+        motivos = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+        linhas = [f"HTTP/1.1 {status} {motivos.get(status, '')}"]
+        todos = {"Content-Type": "text/plain; charset=utf-8", **(headers or {})}
+        if status != 304:
+            todos["Content-Length"] = str(len(body))
+        else:
+            todos.pop("Content-Type", None)
+        if fechar:
+            todos["Connection"] = "close"
+        linhas.extend(f"{k}: {v}" for k, v in todos.items())
+        writer.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1"))
+        if not head and status != 304:
+            writer.write(body)
+        await writer.drain()
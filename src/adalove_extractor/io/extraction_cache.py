@@ -0,0 +1,111 @@
+"""
+Cache em processo de extrações carregadas (extracao_completa.json).
+
+Numa sessão interativa a mesma extração é lida várias vezes (calendário,
+viewer de ponderadas, fluxo de IA). `ExtractionCache` guarda o JSON já
+parseado por caminho, validado pela assinatura (mtime_ns, tamanho) do arquivo,
+com limite LRU de entradas. Gravações feitas por `store` atualizam o cache no
+lugar, então a próxima leitura não re-parseia o arquivo recém-escrito.
+"""
+
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils.fs import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """
+    LRU de extrações parseadas, invalidado por mtime e tamanho.
+
+    O dict devolvido por `load` é compartilhado entre chamadas: quem o
+    modificar deve persistir com `store` (ou chamar `invalidate`), senão o
+    cache diverge do disco.
+
+    Example:
+        >>> cache = ExtractionCache(max_entries=4)
+        >>> data = cache.load(path)       # parse
+        >>> data = cache.load(path)       # só um stat
+        >>> cache.store(path, data)       # grava e mantém o cache quente
+    """
+
+    def __init__(self, max_entries: int = 4):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries: Número máximo de extrações mantidas em memória
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Path, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: Path) -> Path:
+        return Path(path).resolve()
+
+    def _put(self, key: Path, assinatura: Tuple[int, int], data: Dict[str, Any]) -> None:
+        self._entries[key] = (assinatura, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def load(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Carrega a extração, reaproveitando a versão em memória se o arquivo
+        não mudou.
+
+        Args:
+            path: Caminho de extracao_completa.json
+
+        Returns:
+            Dados da extração, ou None se o arquivo não existir
+        """
+        key = self._key(path)
+        try:
+            st = key.stat()
+        except FileNotFoundError:
+            self._entries.pop(key, None)
+            return None
+        assinatura = (st.st_mtime_ns, st.st_size)
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == assinatura:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        with open(key, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._put(key, assinatura, data)
+        return data
+
+    def store(self, path: Path, data: Dict[str, Any]) -> None:
+        """
+        Grava a extração atomicamente e atualiza o cache com o novo conteúdo.
+
+        Args:
+            path: Caminho de extracao_completa.json
+            data: Dados completos da extração
+        """
+        key = self._key(path)
+        atomic_write_json(key, data)
+        st = key.stat()
+        self._put(key, (st.st_mtime_ns, st.st_size), data)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Descarta uma extração do cache (ou todas, sem argumento)."""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(path), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -13,7 +13,7 @@ import os
 import hashlib
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 
 class IncrementalWriter:
@@ -148,24 +148,62 @@ class IncrementalWriter:
         self.flush()
         
         # Carrega todos os cards do arquivo JSONL
-        all_cards = []
+        return list(self.iter_cards())
         
-        if self.temp_jsonl_path.exists():
-            try:
-                with open(self.temp_jsonl_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            card = json.loads(line)
-                            # Remove metadata interna
-                            card.pop("_written_at", None)
-                            card.pop("_execution_id", None)
-                            all_cards.append(card)
-                            
-            except Exception as e:
-                raise RuntimeError(f"Falha ao ler dados consolidados: {e}")
-                
-        return all_cards
+    def iter_cards(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lê os cards já persistidos no JSONL, um por vez.
+        
+        Não faz flush do buffer: chame `flush()` antes se houver cards
+        pendentes. Permite consumir extrações grandes sem materializar a
+        lista inteira em memória.
+        
+        Yields:
+            Cards sem a metadata interna de escrita
+        """
+        if not self.temp_jsonl_path.exists():
+            return
+            
+        try:
+            with open(self.temp_jsonl_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        card = json.loads(line)
+                        # Remove metadata interna
+                        card.pop("_written_at", None)
+                        card.pop("_execution_id", None)
+                        yield card
+                        
+        except (OSError, json.JSONDecodeError) as e:
+            raise RuntimeError(f"Falha ao ler dados consolidados: {e}")
+            
+    def iter_weeks(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Finaliza a escrita e agrupa os cards do JSONL por semana, em streaming.
+        
+        Os cards são escritos semana a semana, então cards consecutivos com o
+        mesmo campo `semana` formam um grupo. Apenas a semana corrente fica em
+        memória — formato consumido por `EnrichmentEngine.enrich_weeks`.
+        
+        Yields:
+            Tuplas (semana, cards da semana)
+        """
+        self.flush()
+        
+        semana_atual: Optional[str] = None
+        grupo: List[Dict[str, Any]] = []
+        
+        for card in self.iter_cards():
+            semana = card.get("semana") or ""
+            if grupo and semana != semana_atual:
+                yield semana_atual or "", grupo
+                grupo = []
+            semana_atual = semana
+            grupo.append(card)
+            
+        if grupo:
+            yield semana_atual or "", grupo
         
     def cleanup(self) -> None:
         """
@@ -0,0 +1,194 @@
+"""
+Manifesto do diretório de saída (output/api_extraction/manifest.json).
+
+Índice pequeno com um registro por turma extraída (slug, UUID, timestamp,
+contagens e tamanhos de arquivo). Listagens e menus leem só este arquivo, em
+vez de abrir cada `extracao_completa.json` ou fazer um stat por turma.
+
+O manifesto é atualizado atomicamente ao fim de cada extração e pode ser
+reconstruído a partir do disco com `ExtractionManifest.rebuild()`.
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils.fs import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+EXTRACTION_FILENAME = "extracao_completa.json"
+
+
+def build_entry(turma_dir: Path, extracao: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Monta o registro de uma turma a partir da extração já carregada.
+
+    Args:
+        turma_dir: Pasta da turma (output/api_extraction/<slug>)
+        extracao: Conteúdo de extracao_completa.json
+
+    Returns:
+        Registro do manifesto
+    """
+    turma_dir = Path(turma_dir)
+    arquivo = turma_dir / EXTRACTION_FILENAME
+    semanas = sorted((turma_dir / "semanas").glob("*.json"))
+
+    return {
+        "slug": turma_dir.name,
+        "turma": extracao.get("turma", turma_dir.name),
+        "uuid": extracao.get("uuid"),
+        "extracao_timestamp": extracao.get("extração_timestamp"),
+        "total_semanas": extracao.get("total_semanas", len(extracao.get("semanas", {}))),
+        "total_atividades": extracao.get("total_atividades", 0),
+        "total_ponderadas": extracao.get("total_ponderadas", 0),
+        "total_ancoradas": extracao.get("total_ancoradas", 0),
+        "arquivo_bytes": arquivo.stat().st_size if arquivo.exists() else 0,
+        "semanas_arquivos": len(semanas),
+        "semanas_bytes": sum(p.stat().st_size for p in semanas),
+        "atualizado_em": datetime.now().isoformat(),
+    }
+
+
+class ExtractionManifest:
+    """
+    Leitura e atualização do manifest.json de um diretório de saída.
+
+    A leitura é memorizada pela assinatura (mtime_ns, tamanho) do arquivo:
+    chamadas repetidas custam um stat e só re-parseiam quando outro processo
+    (ou outra extração) regravou o manifesto.
+
+    Example:
+        >>> manifest = ExtractionManifest(Path("output/api_extraction"))
+        >>> manifest.update(turma_dir, extracao)
+        >>> "2026-1A-T13" in manifest
+        True
+    """
+
+    def __init__(self, output_dir: Path):
+        """
+        Inicializa o manifesto.
+
+        Args:
+            output_dir: Diretório com as pastas das turmas
+        """
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILENAME
+        self._cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._assinatura: Optional[Tuple[int, int]] = None
+
+    def turmas(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Registros por slug. Se o manifesto ainda não existir mas houver
+        extrações no disco (saídas anteriores a ele), reconstrói uma vez.
+
+        Returns:
+            Dict slug → registro (não modificar)
+        """
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            if any(self.output_dir.glob(f"*/{EXTRACTION_FILENAME}")):
+                return self.rebuild()
+            return {}
+
+        assinatura = (st.st_mtime_ns, st.st_size)
+        if self._cache is not None and assinatura == self._assinatura:
+            return self._cache
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Manifesto ilegível ({e}); reconstruindo a partir do disco")
+            return self.rebuild()
+
+        if not isinstance(data, dict) or data.get("versao") != MANIFEST_VERSION:
+            return self.rebuild()
+
+        self._cache = data.get("turmas", {})
+        self._assinatura = assinatura
+        return self._cache
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        return self.turmas().get(slug)
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self.turmas()
+
+    def _salvar(self, turmas: Dict[str, Dict[str, Any]]) -> None:
+        dados = {
+            "versao": MANIFEST_VERSION,
+            "turmas": dict(sorted(turmas.items())),
+        }
+        atomic_write_json(self.path, dados)
+        st = self.path.stat()
+        self._cache = dados["turmas"]
+        self._assinatura = (st.st_mtime_ns, st.st_size)
+
+    def update(self, turma_dir: Path, extracao: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Registra (ou substitui) a turma e regrava o manifesto atomicamente.
+
+        Args:
+            turma_dir: Pasta da turma recém-extraída
+            extracao: Conteúdo de extracao_completa.json
+
+        Returns:
+            Registro gravado
+        """
+        entry = build_entry(turma_dir, extracao)
+        turmas = dict(self.turmas())
+        turmas[entry["slug"]] = entry
+        self._salvar(turmas)
+        return entry
+
+    def marcar(self, slug: str, **campos: Any) -> bool:
+        """
+        Atualiza campos avulsos do registro de uma turma (ex.: horário da
+        última verificação de status). Retorna False se a turma não consta.
+        """
+        turmas = dict(self.turmas())
+        if slug not in turmas:
+            return False
+        turmas[slug] = {**turmas[slug], **campos}
+        self._salvar(turmas)
+        return True
+
+    def remove(self, slug: str) -> bool:
+        """Remove uma turma do manifesto. Retorna False se ela não constava."""
+        turmas = dict(self.turmas())
+        if turmas.pop(slug, None) is None:
+            return False
+        self._salvar(turmas)
+        return True
+
+    def rebuild(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Regenera o manifesto varrendo as pastas do diretório de saída.
+
+        Extrações ilegíveis são registradas no log e ficam de fora.
+
+        Returns:
+            Registros por slug
+        """
+        turmas: Dict[str, Dict[str, Any]] = {}
+        for arquivo in sorted(self.output_dir.glob(f"*/{EXTRACTION_FILENAME}")):
+            try:
+                with open(arquivo, "r", encoding="utf-8") as f:
+                    extracao = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Extração ignorada no manifesto ({arquivo}): {e}")
+                continue
+            entry = build_entry(arquivo.parent, extracao)
+            turmas[entry["slug"]] = entry
+
+        if turmas or self.path.exists():
+            self._salvar(turmas)
+        logger.info(f"Manifesto reconstruído: {len(turmas)} turmas")
+        return self._cache if self._cache is not None else turmas
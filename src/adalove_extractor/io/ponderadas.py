@@ -0,0 +1,181 @@
+"""
+Índice pré-computado das atividades ponderadas de uma turma (ponderadas.json).
+
+O viewer de ponderadas, o menu de cada ponderada e relatórios em lote só
+precisam de uma lista plana: título, semana, encontro, professor, descrição,
+bloco `avaliacao` (resposta, nota, status), UUID para submissão e prazo.
+Em vez de percorrer semanas, encontros, autoestudos e `sem_ancora` a cada
+abertura, o extrator grava essa lista ao lado de `extracao_completa.json`, e a
+atualização de status a mantém em dia (`atualizar_avaliacoes`).
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.fs import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+PONDERADAS_FILENAME = "ponderadas.json"
+PONDERADAS_VERSION = 1
+
+
+def calcular_prazo_ponderada(data_encontro: str) -> Optional[datetime]:
+    """
+    Calcula o prazo de entrega de uma ponderada.
+    Regra: sexta-feira 23:59 da mesma semana do encontro.
+
+    Args:
+        data_encontro: Data do encontro no formato 'YYYY-MM-DD'
+
+    Returns:
+        datetime do prazo ou None se data inválida
+    """
+    if not data_encontro or data_encontro == "sem data":
+        return None
+    try:
+        dt = datetime.strptime(data_encontro, "%Y-%m-%d")
+        # weekday(): 0=segunda, 4=sexta
+        dias_ate_sexta = 4 - dt.weekday()
+        if dias_ate_sexta < 0:
+            # Encontro é sábado/domingo → sexta da PRÓXIMA semana
+            dias_ate_sexta += 7
+        sexta = dt + timedelta(days=dias_ate_sexta)
+        return sexta.replace(hour=23, minute=59, second=59)
+    except ValueError:
+        return None
+
+
+def _ponderada(semana: str, data_encontro: str, encontro_titulo: str, titulo: str,
+               no: Dict[str, Any], tipo: str, descricao: str) -> Dict[str, Any]:
+    prazo = calcular_prazo_ponderada(data_encontro)
+    return {
+        "semana": semana,
+        "data_encontro": data_encontro,
+        "encontro_titulo": encontro_titulo,
+        "titulo": titulo,
+        "professor": no.get("professor", ""),
+        "descricao": descricao,
+        "avaliacao": no.get("avaliacao", {}),
+        "tipo": tipo,
+        "student_activity_uuid": no.get("student_activity_uuid"),
+        "prazo": prazo.isoformat() if prazo else None,
+    }
+
+
+def extrair_ponderadas(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extrai todas as atividades ponderadas do JSON de extração,
+    organizadas por semana com informações do encontro ancorado.
+    """
+    ponderadas = []
+
+    for semana_key, semana_data in data.get("semanas", {}).items():
+        if not isinstance(semana_data, dict):
+            continue
+
+        encontros = semana_data.get("encontros", {})
+        for data_encontro, encontro in encontros.items():
+            titulo_encontro = encontro.get("titulo", "")
+
+            # Ponderadas do próprio encontro
+            if encontro.get("is_ponderada") and "avaliacao" in encontro:
+                ponderadas.append(_ponderada(
+                    semana_key, data_encontro, titulo_encontro, titulo_encontro,
+                    encontro, "encontro", descricao="",
+                ))
+
+            # Ponderadas dos autoestudos ancorados neste encontro
+            for auto_titulo, auto_data in encontro.get("autoestudos", {}).items():
+                if auto_data.get("is_ponderada") and "avaliacao" in auto_data:
+                    ponderadas.append(_ponderada(
+                        semana_key, data_encontro, titulo_encontro, auto_titulo,
+                        auto_data, "autoestudo", descricao=auto_data.get("descricao", ""),
+                    ))
+
+        # Ponderadas sem âncora
+        for card in semana_data.get("sem_ancora", []):
+            if card.get("is_ponderada") and "avaliacao" in card:
+                ponderadas.append(_ponderada(
+                    semana_key, "sem data", "(sem âncora)", card.get("titulo", ""),
+                    card, "sem_ancora", descricao=card.get("descricao", ""),
+                ))
+
+    return ponderadas
+
+
+def salvar_ponderadas(turma_dir: Path, extracao: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Gera e grava ponderadas.json a partir da extração consolidada.
+
+    Args:
+        turma_dir: Pasta da turma
+        extracao: Conteúdo de extracao_completa.json
+
+    Returns:
+        Lista de ponderadas gravada
+    """
+    ponderadas = extrair_ponderadas(extracao)
+    atomic_write_json(Path(turma_dir) / PONDERADAS_FILENAME, {
+        "versao": PONDERADAS_VERSION,
+        "turma": extracao.get("turma"),
+        "extracao_timestamp": extracao.get("extração_timestamp"),
+        "ponderadas": ponderadas,
+    })
+    return ponderadas
+
+
+def carregar_ponderadas(turma_dir: Path) -> Optional[List[Dict[str, Any]]]:
+    """
+    Lê ponderadas.json.
+
+    Returns:
+        Lista de ponderadas, ou None se o índice não existir, estiver
+        ilegível ou em outra versão (quem chama regenera com `salvar_ponderadas`)
+    """
+    caminho = Path(turma_dir) / PONDERADAS_FILENAME
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Índice de ponderadas ilegível ({caminho}): {e}")
+        return None
+
+    if not isinstance(data, dict) or data.get("versao") != PONDERADAS_VERSION:
+        return None
+    return data.get("ponderadas", [])
+
+
+def atualizar_avaliacoes(turma_dir: Path, avaliacoes: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Substitui o bloco `avaliacao` das ponderadas indicadas no índice.
+
+    Args:
+        turma_dir: Pasta da turma
+        avaliacoes: Dict student_activity_uuid → nova avaliação
+
+    Returns:
+        Número de ponderadas atualizadas (0 se o índice não existir)
+    """
+    caminho = Path(turma_dir) / PONDERADAS_FILENAME
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 0
+
+    atualizadas = 0
+    for pond in data.get("ponderadas", []):
+        nova = avaliacoes.get(pond.get("student_activity_uuid"))
+        if nova is not None and pond.get("avaliacao") != nova:
+            pond["avaliacao"] = nova
+            atualizadas += 1
+
+    if atualizadas:
+        atomic_write_json(caminho, data)
+    return atualizadas
@@ -0,0 +1,179 @@
+"""
+Eventos de progresso legíveis por máquina (JSON lines) para automação.
+
+No modo não interativo o progresso sai como logs com emoji e `print`s, e
+extrações em paralelo se misturam. `ProgressReporter` emite um objeto JSON por
+linha — mudança de etapa, lote de atividades buscado, arquivo gravado — num
+file descriptor separado (ex.: `--progress-json 3`), com turma, contagens,
+bytes, tempo decorrido e vazão.
+
+`emit` só enfileira o evento: a serialização e a escrita acontecem numa thread
+dedicada, então um leitor lento do outro lado do pipe nunca bloqueia o event
+loop da extração.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_FIM = object()
+
+
+class ProgressReporter:
+    """
+    Escreve eventos de progresso como JSON lines num file descriptor.
+
+    Com `fd=None` o reporter fica desativado e `emit` não faz nada, então o
+    código instrumentado não precisa de `if` em cada ponto de emissão.
+
+    Example:
+        >>> with ProgressReporter(3) as progresso:
+        ...     turma = progresso.turma("2026-1A-T13")
+        ...     turma.etapa("autenticacao")
+        ...     turma.arquivo(Path("extracao_completa.json"))
+    """
+
+    def __init__(self, fd: Optional[int] = None):
+        """
+        Inicializa o reporter (e a thread escritora, se ativo).
+
+        Args:
+            fd: File descriptor de destino (não é fechado no `close`)
+        """
+        self.ativo = fd is not None
+        self._inicio = time.monotonic()
+        self._fila: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._saida = None
+        if self.ativo:
+            self._saida = os.fdopen(fd, "w", encoding="utf-8", closefd=False)
+            self._thread = threading.Thread(target=self._escrever, name="progress-json", daemon=True)
+            self._thread.start()
+
+    def _escrever(self) -> None:
+        while True:
+            item = self._fila.get()
+            linhas = []
+            fim = False
+            # Drena o que já estiver na fila para um único write/flush
+            while True:
+                if item is _FIM:
+                    fim = True
+                    break
+                linhas.append(json.dumps(item, ensure_ascii=False, default=str))
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+            if linhas:
+                try:
+                    self._saida.write("\n".join(linhas) + "\n")
+                    self._saida.flush()
+                except (OSError, ValueError):
+                    # Leitor foi embora (pipe fechado): progresso é best-effort
+                    self.ativo = False
+            if fim:
+                return
+
+    def emit(self, evento: str, **campos: Any) -> None:
+        """Enfileira um evento (não bloqueia)."""
+        if not self.ativo:
+            return
+        self._fila.put({
+            "evento": evento,
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "decorrido_s": round(time.monotonic() - self._inicio, 3),
+            **campos,
+        })
+
+    def turma(self, nome: str) -> "TurmaProgress":
+        """Rastreador de progresso de uma turma (contagens, bytes e vazão)."""
+        return TurmaProgress(self, nome)
+
+    def close(self) -> None:
+        """Escreve os eventos pendentes e encerra a thread escritora."""
+        if self._thread is not None:
+            self._fila.put(_FIM)
+            self._thread.join()
+            self._thread = None
+        self.ativo = False
+
+    def __enter__(self) -> "ProgressReporter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class TurmaProgress:
+    """Acumula contagens de uma extração e emite eventos com vazão."""
+
+    def __init__(self, reporter: ProgressReporter, turma: str):
+        self.reporter = reporter
+        self.turma = turma
+        self.inicio = time.monotonic()
+        self.atividades = 0
+        self.arquivos = 0
+        self.bytes = 0
+
+    def _tempo(self) -> Dict[str, float]:
+        return {"turma_decorrido_s": round(time.monotonic() - self.inicio, 3)}
+
+    def etapa(self, etapa: str, **campos: Any) -> None:
+        self.reporter.emit("etapa", turma=self.turma, etapa=etapa, **self._tempo(), **campos)
+
+    def lote(self, semana: str, atividades: int, total: int) -> None:
+        """Um lote (semana) de atividades com detalhes buscados."""
+        self.atividades += atividades
+        tempo = self._tempo()
+        decorrido = tempo["turma_decorrido_s"] or 1e-9
+        self.reporter.emit(
+            "lote",
+            turma=self.turma,
+            semana=semana,
+            atividades=atividades,
+            atividades_acumuladas=self.atividades,
+            atividades_total=total,
+            atividades_por_s=round(self.atividades / decorrido, 2),
+            **tempo,
+        )
+
+    def arquivo(self, caminho: Path) -> None:
+        """Um arquivo gravado (o tamanho é lido do disco)."""
+        if not self.reporter.ativo:
+            return
+        tamanho = Path(caminho).stat().st_size
+        self.arquivos += 1
+        self.bytes += tamanho
+        tempo = self._tempo()
+        decorrido = tempo["turma_decorrido_s"] or 1e-9
+        self.reporter.emit(
+            "arquivo",
+            turma=self.turma,
+            caminho=str(caminho),
+            bytes=tamanho,
+            bytes_acumulados=self.bytes,
+            bytes_por_s=round(self.bytes / decorrido, 1),
+            **tempo,
+        )
+
+    def fim(self, sucesso: bool, **campos: Any) -> None:
+        self.reporter.emit(
+            "turma_fim",
+            turma=self.turma,
+            sucesso=sucesso,
+            atividades=self.atividades,
+            arquivos=self.arquivos,
+            bytes=self.bytes,
+            **self._tempo(),
+            **campos,
+        )
+
+
+# Reporter desativado, para código instrumentado sem destino configurado
+NULL_REPORTER = ProgressReporter(None)
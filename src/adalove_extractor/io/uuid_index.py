@@ -0,0 +1,308 @@
+"""
+Índice student_activity_uuid → localização na extração, e atualizações parciais.
+
+A extração de uma turma existe em duas formas: os arquivos por semana
+(`semanas/semana_XX.json`, os "shards") e a visão consolidada
+(`extracao_completa.json`). O índice (`indice_uuid.json`), gravado na extração,
+diz em qual shard e em qual caminho da árvore está cada atividade:
+
+    {"semana": "Semana 08", "arquivo": "semanas/semana_08.json",
+     "caminho": ["encontros", "2026-03-26", "autoestudos", "Teoria 1"],
+     "ponderada": true}
+
+`ShardedExtraction.aplicar` usa o índice para abrir e regravar só os shards
+afetados. As semanas alteradas ficam anotadas em `extracao_completa.pendente.json`
+e a visão consolidada é regenerada sob demanda (`consolidar`/`carregar`),
+reaproveitando a extração já carregada e lendo apenas os shards pendentes.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..utils.fs import atomic_write_json
+from ..utils.text import slugify_semana
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "indice_uuid.json"
+INDEX_VERSION = 1
+PENDING_FILENAME = "extracao_completa.pendente.json"
+EXTRACTION_FILENAME = "extracao_completa.json"
+
+# Chaves de cabeçalho do shard que não fazem parte de extracao["semanas"][semana]
+_SHARD_HEADER = ("turma", "semana", "extração_timestamp")
+
+
+def _iter_nos(semana_data: Dict[str, Any]) -> Iterator[Tuple[List[Any], Dict[str, Any]]]:
+    """Percorre encontros, autoestudos e cards sem âncora com seus caminhos."""
+    for data_key, encontro in (semana_data.get("encontros") or {}).items():
+        yield ["encontros", data_key], encontro
+        for titulo, auto in (encontro.get("autoestudos") or {}).items():
+            yield ["encontros", data_key, "autoestudos", titulo], auto
+    for i, card in enumerate(semana_data.get("sem_ancora") or []):
+        yield ["sem_ancora", i], card
+
+
+def indexar_semana(semana: str, semana_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Indexa as atividades de uma semana organizada (`organize_by_encontros`).
+
+    Args:
+        semana: Nome da semana (ex.: "Semana 08")
+        semana_data: Dict com "encontros" e "sem_ancora"
+
+    Returns:
+        Dict uuid → localização
+    """
+    arquivo = f"semanas/{slugify_semana(semana)}.json"
+    indice = {}
+    for caminho, no in _iter_nos(semana_data):
+        uuid = no.get("student_activity_uuid")
+        if uuid:
+            indice[uuid] = {
+                "semana": semana,
+                "arquivo": arquivo,
+                "caminho": caminho,
+                "ponderada": bool(no.get("is_ponderada")),
+            }
+    return indice
+
+
+def construir_indice(extracao: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Indexa uma extração consolidada inteira."""
+    indice: Dict[str, Dict[str, Any]] = {}
+    for semana, semana_data in (extracao.get("semanas") or {}).items():
+        if isinstance(semana_data, dict):
+            indice.update(indexar_semana(semana, semana_data))
+    return indice
+
+
+def salvar_indice(turma_dir: Path, indice: Dict[str, Dict[str, Any]], extracao_timestamp: Optional[str]) -> Path:
+    """
+    Grava indice_uuid.json atomicamente.
+
+    Args:
+        turma_dir: Pasta da turma
+        indice: Dict uuid → localização
+        extracao_timestamp: Timestamp da extração a que o índice se refere
+
+    Returns:
+        Caminho do índice
+    """
+    caminho = Path(turma_dir) / INDEX_FILENAME
+    atomic_write_json(
+        caminho,
+        {"versao": INDEX_VERSION, "extracao_timestamp": extracao_timestamp, "atividades": indice},
+        indent=None,
+    )
+    return caminho
+
+
+def _resolver(raiz: Any, caminho: List[Any]) -> Optional[Dict[str, Any]]:
+    no = raiz
+    for parte in caminho:
+        try:
+            no = no[parte]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return no if isinstance(no, dict) else None
+
+
+class ShardedExtraction:
+    """
+    Extração de uma turma vista como shards semanais + visão consolidada.
+
+    Example:
+        >>> ext = ShardedExtraction(Path("output/api_extraction/2026-1A-T13"))
+        >>> ext.aplicar(atualizar, uuids)   # regrava só as semanas afetadas
+        >>> data = ext.carregar()           # consolida se houver pendências
+    """
+
+    def __init__(self, turma_dir: Path, cache=None):
+        """
+        Inicializa a visão da extração.
+
+        Args:
+            turma_dir: Pasta da turma (output/api_extraction/<slug>)
+            cache: `ExtractionCache` opcional para ler/gravar a visão consolidada
+        """
+        self.turma_dir = Path(turma_dir)
+        self.extracao_path = self.turma_dir / EXTRACTION_FILENAME
+        self.indice_path = self.turma_dir / INDEX_FILENAME
+        self.pendente_path = self.turma_dir / PENDING_FILENAME
+        self.cache = cache
+        self._indice: Optional[Dict[str, Dict[str, Any]]] = None
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def _ler_json(self, caminho: Path) -> Any:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _carregar_consolidada(self) -> Optional[Dict[str, Any]]:
+        if self.cache is not None:
+            return self.cache.load(self.extracao_path)
+        if not self.extracao_path.exists():
+            return None
+        return self._ler_json(self.extracao_path)
+
+    def indice(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Índice uuid → localização. Extrações anteriores ao índice têm o índice
+        reconstruído (uma vez) a partir da visão consolidada.
+        """
+        if self._indice is not None:
+            return self._indice
+
+        try:
+            data = self._ler_json(self.indice_path)
+            if isinstance(data, dict) and data.get("versao") == INDEX_VERSION:
+                self._indice = data.get("atividades") or {}
+                return self._indice
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Índice de UUIDs ilegível ({e}); reconstruindo")
+
+        extracao = self._carregar_consolidada()
+        if extracao is None:
+            return {}
+        self._indice = construir_indice(extracao)
+        salvar_indice(self.turma_dir, self._indice, extracao.get("extração_timestamp"))
+        return self._indice
+
+    def localizar(self, uuid: str) -> Optional[Dict[str, Any]]:
+        return self.indice().get(uuid)
+
+    def pendentes(self) -> Set[str]:
+        """Semanas cujos shards estão mais novos que a visão consolidada."""
+        try:
+            data = self._ler_json(self.pendente_path)
+        except FileNotFoundError:
+            return set()
+        except (OSError, json.JSONDecodeError):
+            # Marcador corrompido: na dúvida, todas as semanas estão pendentes
+            return {loc["semana"] for loc in self.indice().values()}
+        return set(data.get("semanas", []))
+
+    def _carregar_shard(self, semana: str, arquivo: str) -> Dict[str, Any]:
+        """Lê um shard; se ele não existir, recria a partir da visão consolidada."""
+        caminho = self.turma_dir / arquivo
+        try:
+            return self._ler_json(caminho)
+        except FileNotFoundError:
+            extracao = self._carregar_consolidada() or {}
+            shard = {
+                "turma": extracao.get("turma"),
+                "semana": semana,
+                "extração_timestamp": extracao.get("extração_timestamp"),
+                **(extracao.get("semanas", {}).get(semana) or {}),
+            }
+            logger.info(f"Shard {arquivo} ausente; recriado a partir de {EXTRACTION_FILENAME}")
+            return shard
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def aplicar(self, atualizar: Callable[[str, Dict[str, Any]], bool], uuids: Iterable[str]) -> int:
+        """
+        Aplica `atualizar(uuid, no)` às atividades indicadas, abrindo só os
+        shards onde elas estão. Shards sem alteração não são regravados.
+
+        Args:
+            atualizar: Função que modifica o nó no lugar e retorna True se mudou
+            uuids: UUIDs a visitar (os ausentes do índice são ignorados)
+
+        Returns:
+            Número de atividades alteradas
+        """
+        indice = self.indice()
+        por_arquivo: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        for uuid in uuids:
+            loc = indice.get(uuid)
+            if loc is not None:
+                por_arquivo[(loc["semana"], loc["arquivo"])].append(uuid)
+
+        alteradas = 0
+        semanas_alteradas = set()
+        for (semana, arquivo), lista in sorted(por_arquivo.items()):
+            shard = self._carregar_shard(semana, arquivo)
+            mudou = 0
+            for uuid in lista:
+                no = _resolver(shard, indice[uuid]["caminho"])
+                if no is None or no.get("student_activity_uuid") != uuid:
+                    logger.warning(f"Atividade {uuid} fora do lugar em {arquivo}; índice desatualizado?")
+                    continue
+                mudou += bool(atualizar(uuid, no))
+            if mudou:
+                atomic_write_json(self.turma_dir / arquivo, shard)
+                semanas_alteradas.add(semana)
+                alteradas += mudou
+
+        if semanas_alteradas:
+            pendentes = self.pendentes() | semanas_alteradas
+            atomic_write_json(self.pendente_path, {"semanas": sorted(pendentes)}, indent=None)
+        return alteradas
+
+    def carregar(self, persistir: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Visão consolidada atualizada (com os shards pendentes aplicados).
+
+        Args:
+            persistir: Se True, regrava extracao_completa.json e limpa o
+                marcador; se False, só monta a visão em memória (para leitores
+                que não devem escrever, como o servidor de calendário)
+
+        Returns:
+            Dados da extração, ou None se não houver extração
+        """
+        extracao = self._carregar_consolidada()
+        if extracao is None:
+            return None
+        pendentes = self.pendentes()
+        if not pendentes:
+            return extracao
+
+        if not persistir:
+            # Cópia rasa: não contamina o dict compartilhado pelo cache
+            extracao = {**extracao, "semanas": dict(extracao.get("semanas", {}))}
+
+        indice = self.indice()
+        arquivos = {loc["semana"]: loc["arquivo"] for loc in indice.values()}
+        nao_consolidadas = set()
+        for semana in sorted(pendentes):
+            arquivo = arquivos.get(semana, f"semanas/{slugify_semana(semana)}.json")
+            try:
+                shard = self._ler_json(self.turma_dir / arquivo)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Shard {arquivo} não consolidado: {e}")
+                nao_consolidadas.add(semana)
+                continue
+            extracao["semanas"][semana] = {k: v for k, v in shard.items() if k not in _SHARD_HEADER}
+
+        if persistir:
+            if self.cache is not None:
+                self.cache.store(self.extracao_path, extracao)
+            else:
+                atomic_write_json(self.extracao_path, extracao)
+            if nao_consolidadas:
+                # Só as semanas aplicadas saem do marcador; as demais ficam para a próxima leitura
+                atomic_write_json(self.pendente_path, {"semanas": sorted(nao_consolidadas)}, indent=None)
+            else:
+                self.pendente_path.unlink(missing_ok=True)
+            logger.info(
+                f"Extração consolidada ({len(pendentes) - len(nao_consolidadas)} semanas): {self.extracao_path}"
+            )
+        return extracao
+
+    def consolidar(self) -> bool:
+        """Regrava a visão consolidada se houver semanas pendentes."""
+        if not self.pendentes():
+            return False
+        return self.carregar(persistir=True) is not None
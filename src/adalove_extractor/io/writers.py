@@ -6,7 +6,7 @@ import csv
 import json
 import os
 import logging
-from typing import Tuple
+from typing import Iterable, Tuple
 
 
 def write_cards_csv(
@@ -49,7 +49,7 @@ def write_cards_csv(
 
 
 def write_enriched_outputs(
-    enriched_data: list[dict], 
+    enriched_data: Iterable[dict], 
     output_dir: str, 
     timestamp: str,
     logger: logging.Logger
@@ -60,8 +60,12 @@ def write_enriched_outputs(
     - CSV: Formato plano para BI/planilhas
     - JSONL: Um JSON por linha para pipelines de dados
     
+    Os dois arquivos são escritos numa única passagem, então `enriched_data`
+    pode ser um gerador (ex.: `EnrichmentEngine.enrich_weeks`) — nenhuma
+    lista intermediária é materializada.
+    
     Args:
-        enriched_data: Lista de dicionários com cards enriquecidos
+        enriched_data: Iterável de dicionários com cards enriquecidos
         output_dir: Diretório onde salvar os arquivos
         timestamp: Timestamp para nomear arquivos
         logger: Logger para mensagens
@@ -92,9 +96,11 @@ def write_enriched_outputs(
         "record_hash", "texto_completo", "links", "materiais", "arquivos"
     ]
     
-    # Escreve CSV
-    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fields)
+    # Escreve CSV e JSONL na mesma passagem
+    total = 0
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f_csv, \
+            open(jsonl_path, 'w', encoding='utf-8') as f_jsonl:
+        writer = csv.DictWriter(f_csv, fieldnames=fields)
         writer.writeheader()
         
         for card in enriched_data:
@@ -120,14 +126,10 @@ def write_enriched_outputs(
                     row[key] = value
             
             writer.writerow(row)
+            f_jsonl.write(json.dumps(card, ensure_ascii=False) + "\n")
+            total += 1
     
-    logger.info(f"💾 Enriched CSV: {csv_path}")
-    
-    # Escreve JSONL
-    with open(jsonl_path, 'w', encoding='utf-8') as f:
-        for card in enriched_data:
-            f.write(json.dumps(card, ensure_ascii=False) + "\n")
-    
+    logger.info(f"💾 Enriched CSV: {csv_path} ({total} cards)")
     logger.info(f"💾 Enriched JSONL: {jsonl_path}")
     
     return csv_path, jsonl_path
@@ -4,8 +4,21 @@ Utilitários gerais do sistema de extração.
 
 from .hash import compute_hash
 from .text import normalize_title, title_similarity
-
-__all__ = ["compute_hash", "normalize_title", "title_similarity"]
+from .keyword_matcher import KeywordMatcher, HostSuffixIndex
+from .fs import atomic_writer, atomic_write_bytes, atomic_write_json
+from .lock import FileLock
+
+__all__ = [
+    "compute_hash",
+    "normalize_title",
+    "title_similarity",
+    "KeywordMatcher",
+    "HostSuffixIndex",
+    "atomic_writer",
+    "atomic_write_bytes",
+    "atomic_write_json",
+    "FileLock",
+]
 
 
 
@@ -0,0 +1,96 @@
+"""
+Utilitários de sistema de arquivos.
+"""
+
+import json
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional
+
+
+def _umask() -> int:
+    # Não há como ler a umask sem trocá-la; lida uma vez, no import
+    atual = os.umask(0)
+    os.umask(atual)
+    return atual
+
+
+_UMASK = _umask()
+
+
+def _modo_final(path: Path) -> int:
+    """Permissão que um `open()` comum deixaria: a do arquivo atual ou 0666 & ~umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_writer(path: Path, mode: Optional[int] = None) -> Iterator[BinaryIO]:
+    """
+    Abre um arquivo temporário no mesmo diretório e o move para `path` ao sair.
+
+    Permite gravar em streaming (sem montar o conteúdo inteiro em memória)
+    mantendo a troca atômica. Se o bloco levantar exceção, o temporário é
+    removido e o arquivo original fica intacto.
+
+    O `mkstemp` cria o temporário com 0600; antes da troca ele recebe a
+    permissão do arquivo substituído (ou a da umask, se for novo), para que
+    feeds e extrações continuem legíveis por outros usuários/servidores.
+
+    Args:
+        path: Caminho final do arquivo
+        mode: Permissão explícita (ex.: 0o600 para segredos); None = a de um `open()` comum
+
+    Yields:
+        Arquivo binário aberto para escrita
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp_name, _modo_final(path) if mode is None else mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes, mode: Optional[int] = None) -> None:
+    """
+    Escreve um arquivo de forma atômica (arquivo temporário + os.replace).
+
+    Leitores concorrentes veem o conteúdo antigo ou o novo, nunca um arquivo
+    pela metade — importante para arquivos lidos por outros processos (feeds
+    de calendário, manifesto, caches) enquanto são regravados.
+
+    Args:
+        path: Caminho final do arquivo
+        data: Conteúdo completo
+        mode: Permissão explícita (veja `atomic_writer`)
+    """
+    with atomic_writer(path, mode=mode) as f:
+        f.write(data)
+
+
+def atomic_write_json(path: Path, data: Any, indent: Optional[int] = 2, mode: Optional[int] = None) -> None:
+    """
+    Serializa `data` como JSON (UTF-8, sem escapar acentos) e grava atomicamente.
+
+    Args:
+        path: Caminho final do arquivo
+        data: Objeto serializável em JSON
+        indent: Indentação (None = compacto)
+        mode: Permissão explícita (veja `atomic_writer`)
+    """
+    payload = json.dumps(data, ensure_ascii=False, indent=indent)
+    atomic_write_bytes(path, payload.encode("utf-8"), mode=mode)
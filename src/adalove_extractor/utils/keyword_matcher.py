@@ -0,0 +1,183 @@
+"""
+Casamento de múltiplas palavras-chave em uma única passagem.
+
+- `KeywordMatcher`: autômato Aho-Corasick — encontra todas as ocorrências de
+  um conjunto de padrões num texto em tempo linear no tamanho do texto (mais o
+  número de ocorrências), em vez de um teste `in` por palavra-chave.
+- `HostSuffixIndex`: índice hash de domínios consultado pelos sufixos do host
+  (`a.b.c` → `a.b.c`, `b.c`, `c`), em vez de varrer todos os domínios por URL.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    Autômato Aho-Corasick sobre padrões de texto.
+
+    Cada padrão carrega um valor arbitrário. Se o mesmo padrão for adicionado
+    mais de uma vez, vale o valor da primeira inserção (ordem de declaração).
+    O autômato é compilado sob demanda na primeira busca após uma inserção.
+
+    Example:
+        >>> m = KeywordMatcher()
+        >>> m.add("direito", "BSS")
+        >>> m.add("direitos humanos", "LID")
+        >>> sorted(m.iter_matches("direitos humanos"))
+        [(7, 'BSS'), (16, 'LID')]
+    """
+
+    def __init__(self, patterns: Optional[Iterable[Tuple[str, Any]]] = None):
+        """
+        Inicializa o autômato.
+
+        Args:
+            patterns: Pares (padrão, valor) a inserir (opcional)
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._value: List[Any] = [None]
+        self._length: List[int] = [0]
+        self._terminal: List[bool] = [False]
+        # Próximo nó terminal na cadeia de falhas (atalho de saída)
+        self._output_link: List[int] = [-1]
+        self._compiled = True
+
+        for pattern, value in patterns or ():
+            self.add(pattern, value)
+
+    def __len__(self) -> int:
+        return sum(self._terminal)
+
+    def add(self, pattern: str, value: Any) -> None:
+        """
+        Insere um padrão. Padrões vazios são ignorados.
+
+        Args:
+            pattern: Texto a procurar (comparação exata; normalize antes)
+            value: Valor devolvido quando o padrão casa
+        """
+        if not pattern:
+            return
+
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._value.append(None)
+                self._length.append(0)
+                self._terminal.append(False)
+                self._output_link.append(-1)
+                self._goto[node][char] = nxt
+            node = nxt
+
+        if not self._terminal[node]:
+            self._terminal[node] = True
+            self._value[node] = value
+            self._length[node] = len(pattern)
+        self._compiled = False
+
+    def _compile(self) -> None:
+        """Calcula links de falha e de saída (BFS a partir da raiz)."""
+        queue: deque[int] = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            self._output_link[child] = -1
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+
+                fail = self._fail[child]
+                self._output_link[child] = fail if self._terminal[fail] else self._output_link[fail]
+                queue.append(child)
+
+        self._compiled = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """
+        Percorre o texto uma única vez e produz todas as ocorrências.
+
+        Args:
+            text: Texto onde procurar
+
+        Yields:
+            Tuplas (tamanho do padrão, valor) para cada ocorrência
+        """
+        if not text:
+            return
+        if not self._compiled:
+            self._compile()
+
+        goto = self._goto
+        fail = self._fail
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            out = node if self._terminal[node] else self._output_link[node]
+            while out > 0:
+                yield self._length[out], self._value[out]
+                out = self._output_link[out]
+
+
+class HostSuffixIndex:
+    """
+    Índice de domínios consultado pelos sufixos de rótulo do host.
+
+    `discrete.openmathbooks.org` casa com os hosts `discrete.openmathbooks.org`
+    e `www.discrete.openmathbooks.org`, mas não com `openmathbooks.org` nem com
+    `discrete.openmathbooks.org.exemplo.com`. Cada consulta custa O(rótulos do
+    host), independente do número de domínios configurados.
+
+    Em empate (dois domínios configurados casando), vence o declarado primeiro.
+    """
+
+    def __init__(self, domains: Optional[Iterable[Tuple[str, Any]]] = None):
+        """
+        Inicializa o índice.
+
+        Args:
+            domains: Pares (domínio, valor) em ordem de prioridade (opcional)
+        """
+        self._index: Dict[str, Tuple[int, Any]] = {}
+        for domain, value in domains or ():
+            self.add(domain, value)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, domain: str, value: Any) -> None:
+        """Registra um domínio; a ordem de inserção define a prioridade."""
+        key = (domain or "").strip().lower().strip(".")
+        if key and key not in self._index:
+            self._index[key] = (len(self._index), value)
+
+    def lookup(self, host: str) -> Optional[Tuple[int, Any]]:
+        """
+        Procura o domínio configurado de maior prioridade que é sufixo do host.
+
+        Args:
+            host: Hostname (ex.: "www.exemplo.com")
+
+        Returns:
+            Tupla (prioridade, valor) ou None
+        """
+        labels = (host or "").lower().strip(".").split(".")
+        best: Optional[Tuple[int, Any]] = None
+        for i in range(len(labels)):
+            hit = self._index.get(".".join(labels[i:]))
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        return best
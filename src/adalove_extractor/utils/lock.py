@@ -0,0 +1,198 @@
+"""
+Lock consultivo entre processos baseado em arquivo.
+
+O lock é um arquivo criado com O_CREAT | O_EXCL: só um processo consegue
+criá-lo, e os demais esperam (com `asyncio.sleep`, sem bloquear o event loop)
+até ele sumir. Funciona igual em POSIX e Windows. Para seções curtas em código
+síncrono (ex.: gravar uma linha num arquivo compartilhado), `with lock:` espera
+com `time.sleep`.
+
+O arquivo guarda o dono ({"pid", "host", "ts", "id"}). Um lock é considerado
+abandonado (stale) quando o processo dono, na mesma máquina, não existe mais,
+ou quando passou de `stale_after` segundos — um dono travado não prende os
+outros processos para sempre.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> Optional[bool]:
+    """Se o processo existe; None quando não dá para saber (Windows)."""
+    if sys.platform == "win32":
+        # os.kill no Windows encerra o processo em vez de só sondar
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # existe, mas é de outro usuário
+    except OSError:
+        return None
+    return True
+
+
+class FileLock:
+    """
+    Lock exclusivo entre processos, com detecção de lock abandonado.
+
+    Example:
+        >>> async with FileLock(Path(".token_cache.lock"), stale_after=600):
+        ...     ...  # um processo por vez
+        >>> with FileLock(Path("outbox.jsonl.lock"), stale_after=30):
+        ...     ...  # seção curta em código síncrono
+    """
+
+    def __init__(self, path: Path, stale_after: float = 600.0, poll_interval: float = 0.2):
+        """
+        Args:
+            path: Arquivo de lock
+            stale_after: Idade (s) a partir da qual o lock é tomado de quem o detém
+            poll_interval: Intervalo entre tentativas enquanto espera
+        """
+        self.path = Path(path)
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._id: Optional[str] = None
+
+    @property
+    def held(self) -> bool:
+        return self._id is not None
+
+    def _read(self) -> Optional[bytes]:
+        try:
+            return self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            return b""
+
+    def owner(self) -> Dict[str, Any]:
+        """Dono atual do lock ({} se livre ou ilegível)."""
+        raw = self._read()
+        try:
+            dono = json.loads(raw) if raw else {}
+        except ValueError:
+            return {}
+        return dono if isinstance(dono, dict) else {}
+
+    def is_stale(self, raw: Optional[bytes] = None) -> bool:
+        """Se o lock existente foi abandonado (dono morto ou lock antigo demais)."""
+        raw = self._read() if raw is None else raw
+        if raw is None:
+            return False
+        try:
+            dono = json.loads(raw) if raw else {}
+        except ValueError:
+            dono = {}
+        if not isinstance(dono, dict):
+            dono = {}
+
+        ts = dono.get("ts")
+        if not isinstance(ts, (int, float)):
+            # Lock sem conteúdo legível (escrita interrompida): vale a idade do arquivo
+            try:
+                ts = self.path.stat().st_mtime
+            except OSError:
+                return False
+        if time.time() - ts > self.stale_after:
+            return True
+
+        pid = dono.get("pid")
+        if isinstance(pid, int) and dono.get("host") == socket.gethostname():
+            return _pid_alive(pid) is False
+        return False
+
+    def try_acquire(self) -> bool:
+        """Tenta tomar o lock sem esperar (removendo-o antes, se abandonado)."""
+        if self.held:
+            return True
+
+        raw = self._read()
+        if raw is not None and self.is_stale(raw):
+            # Só remove se ainda for o MESMO lock avaliado: outro processo pode
+            # tê-lo tomado entre a leitura e aqui.
+            if self._read() == raw:
+                logger.warning(f"Lock abandonado removido: {self.path} ({self.owner() or 'sem dono'})")
+                try:
+                    self.path.unlink()
+                except FileNotFoundError:
+                    pass
+
+        lock_id = uuid.uuid4().hex
+        dono = {"pid": os.getpid(), "host": socket.gethostname(), "ts": time.time(), "id": lock_id}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(dono, f)
+        self._id = lock_id
+        return True
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Espera até obter o lock.
+
+        Raises:
+            TimeoutError: Se `timeout` passar sem obter o lock
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        avisado = False
+        while not self.try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Lock {self.path} ocupado por {self.owner() or 'outro processo'}")
+            if not avisado:
+                avisado = True
+                logger.info(f"🔒 Aguardando lock {self.path.name} (dono: {self.owner().get('pid', '?')})")
+            await asyncio.sleep(self.poll_interval)
+
+    def acquire_blocking(self, timeout: Optional[float] = None) -> None:
+        """
+        Como `acquire`, mas bloqueando a thread (só para seções curtas).
+
+        Raises:
+            TimeoutError: Se `timeout` passar sem obter o lock
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Lock {self.path} ocupado por {self.owner() or 'outro processo'}")
+            time.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        """Libera o lock, se ainda for deste objeto (não remove lock alheio)."""
+        if not self.held:
+            return
+        if self.owner().get("id") == self._id:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+        self._id = None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire_blocking()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "FileLock":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
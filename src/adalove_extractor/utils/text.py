@@ -27,6 +27,15 @@ def decode_html_entities(text: str) -> str:
     return html.unescape(text)
 
 
+def slugify_semana(semana: str) -> str:
+    """Converte 'Semana 08' para 'semana_08'"""
+    match = re.search(r'(\d+)', semana)
+    if match:
+        num = match.group(1).zfill(2)
+        return f"semana_{num}"
+    return semana.lower().replace(" ", "_")
+
+
 def normalize_title(title: str) -> str:
     """
     Normaliza títulos para comparação, removendo ruído e padronizando formato.
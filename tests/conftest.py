@@ -1,4 +1,34 @@
+import importlib.util
+import logging
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+CLI = Path(__file__).resolve().parents[1] / "adalove_cli.py"
+
+
+@pytest.fixture
+def adalove_cli(tmp_path, monkeypatch):
+    """Carrega `adalove_cli.py` como módulo, isolado do repositório.
+
+    O import roda `logging.basicConfig(filename='adalove_cli.log', force=True)`:
+    o cwd vai para `tmp_path` (o log não cai na raiz do repo) e os handlers do
+    root logger são restaurados ao final.
+    """
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("adalove_cli_teste", CLI)
+    modulo = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(modulo)
+        yield modulo
+    finally:
+        for handler in root.handlers:
+            if handler not in handlers:
+                handler.close()
+        root.handlers[:] = handlers
+        root.setLevel(level)
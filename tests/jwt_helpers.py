@@ -0,0 +1,30 @@
+"""JWTs sintéticos para os testes de autenticação (assinatura não é validada localmente)."""
+
+import base64
+import json
+import time
+
+
+def make_jwt(exp_offset_seconds: int, client_id: str = "app-client", marca: str = "fake-signature") -> str:
+    """Cria um JWT sintético que expira em `exp_offset_seconds` a partir de agora.
+
+    Args:
+        exp_offset_seconds: Segundos até a expiração (negativo = já expirado)
+        client_id: Claim `client_id` (app client do Cognito)
+        marca: Texto no lugar da assinatura, para distinguir tokens de mesmo `exp`
+
+    Returns:
+        String JWT com assinatura fake (não é validada localmente)
+    """
+
+    def b64(data: dict) -> str:
+        raw = json.dumps(data).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    header = b64({"alg": "RS256", "typ": "JWT"})
+    payload = b64({
+        "exp": int(time.time()) + exp_offset_seconds,
+        "token_use": "access",
+        "client_id": client_id,
+    })
+    return f"{header}.{payload}.{marca}"
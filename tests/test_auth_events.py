@@ -0,0 +1,121 @@
+"""
+Testes da espera por login dirigida a eventos.
+
+Uma página falsa conta as leituras de localStorage (`page.evaluate`): com os
+eventos ligados, a espera só deve ler o storage na primeira volta e acordar
+assim que o binding entrega o token ou a página navega.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from adalove_extractor.api.auth import CognitoAuthenticator, LoginEvents, parse_token_cache
+from jwt_helpers import make_jwt
+
+
+class FakePage:
+    def __init__(self, url: str = "https://accounts.google.com/v3/signin/identifier"):
+        self.url = url
+        self.evaluates = 0
+        self.storage = None  # {"accessToken", "refreshToken"} lido do localStorage
+
+    async def evaluate(self, script):
+        self.evaluates += 1
+        return self.storage
+
+    async def content(self):
+        return ""
+
+    async def bring_to_front(self):
+        pass
+
+
+def _esperar(auth, page, events, segundos=10, interactive=True):
+    return auth._wait_for_authentication(
+        page,
+        events=events,
+        deadline=time.monotonic() + segundos,
+        interactive=interactive,
+        console=None,
+    )
+
+
+async def test_token_gravado_acorda_a_espera_na_hora(tmp_path):
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache")
+    page, events = FakePage(), LoginEvents()
+    token = make_jwt(3600)
+
+    espera = asyncio.create_task(_esperar(auth, page, events))
+    await asyncio.sleep(0.05)
+    inicio = time.monotonic()
+    events.on_token(None, {"accessToken": token, "refreshToken": "refresh-1"})
+
+    assert await asyncio.wait_for(espera, timeout=1) == token
+    assert time.monotonic() - inicio < 0.5
+    assert page.evaluates == 1  # só a leitura inicial
+    assert parse_token_cache((tmp_path / ".token_cache").read_text()) == (token, "refresh-1", "app-client")
+
+
+async def test_refresh_token_gravado_depois_do_access_token_e_capturado(tmp_path):
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache")
+    page, events = FakePage(), LoginEvents()
+    token = make_jwt(3600)
+
+    espera = asyncio.create_task(_esperar(auth, page, events))
+    await asyncio.sleep(0.05)
+    # Ordem real do Amplify: um setItem por chave, accessToken primeiro
+    events.on_token(None, {"accessToken": token, "refreshToken": None})
+    await asyncio.sleep(0.01)
+    events.on_token(None, {"accessToken": token, "refreshToken": "r1"})
+
+    assert await asyncio.wait_for(espera, timeout=2) == token
+    assert auth.refresh_token == "r1"
+    assert parse_token_cache((tmp_path / ".token_cache").read_text())[1] == "r1"
+
+
+async def test_sem_segundo_aviso_le_o_refresh_token_do_storage(tmp_path):
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache")
+    page, events = FakePage(), LoginEvents()
+    token = make_jwt(3600)
+
+    espera = asyncio.create_task(_esperar(auth, page, events))
+    await asyncio.sleep(0.05)
+    page.storage = {"accessToken": token, "refreshToken": "r-storage"}
+    events.on_token(None, {"accessToken": token, "refreshToken": None})
+
+    assert await asyncio.wait_for(espera, timeout=3) == token
+    assert auth.refresh_token == "r-storage"
+    assert parse_token_cache((tmp_path / ".token_cache").read_text())[1] == "r-storage"
+
+
+async def test_navegacao_reclassifica_a_tela(tmp_path):
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache")
+    page, events = FakePage(), LoginEvents()
+
+    espera = asyncio.create_task(_esperar(auth, page, events, interactive=False))
+    await asyncio.sleep(0.05)
+    page.url = "https://accounts.google.com/v3/signin/challenge/totp"
+    events.on_navigation(SimpleNamespace(parent_frame=None))
+
+    # Headless diante de 2FA desiste logo para escalar ao modo interativo
+    assert await asyncio.wait_for(espera, timeout=1) is None
+
+
+async def test_token_vencido_no_evento_nao_conclui(tmp_path):
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache")
+    page, events = FakePage(), LoginEvents()
+
+    espera = asyncio.create_task(_esperar(auth, page, events, segundos=0.3))
+    events.on_token(None, {"accessToken": make_jwt(-60)})
+
+    assert await espera is None
+    assert auth.token is None
+
+
+async def test_navegacao_de_iframe_e_ignorada():
+    events = LoginEvents()
+    events.on_navigation(SimpleNamespace(parent_frame=object()))
+    assert await events.wait(0.01) is False
+    events.on_navigation(SimpleNamespace(parent_frame=None))
+    assert await events.wait(0.01) is True
@@ -0,0 +1,167 @@
+"""
+Testes da renovação de token via refresh token (grant OAuth2 do Cognito).
+
+Um servidor HTTP local faz o papel do endpoint /oauth2/token: nenhum teste
+abre browser nem acessa a rede.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from adalove_extractor.api.auth import CognitoAuthenticator, parse_token_cache
+from adalove_extractor.api.exceptions import TokenExpiredError
+from jwt_helpers import make_jwt
+
+
+class FakeTokenEndpoint:
+    """Stand-in local do /oauth2/token do Cognito."""
+
+    def __init__(self):
+        self.requests = []
+        self.status = 200
+        self.body = {}
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                form = parse_qs(self.rfile.read(length).decode())
+                endpoint.requests.append({k: v[0] for k, v in form.items()})
+                corpo = json.dumps(endpoint.body).encode()
+                self.send_response(endpoint.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/oauth2/token"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def endpoint():
+    fake = FakeTokenEndpoint()
+    yield fake
+    fake.close()
+
+
+def _cache(tmp_path, **dados):
+    path = tmp_path / ".token_cache"
+    path.write_text(json.dumps(dados), encoding="utf-8")
+    return path
+
+
+class TestParseTokenCache:
+    def test_formato_legado_em_texto_puro(self):
+        assert parse_token_cache("eyJ.abc.def\n") == ("eyJ.abc.def", None, None)
+
+    def test_formato_json(self):
+        texto = json.dumps({"access_token": "a", "refresh_token": "r", "client_id": "c"})
+        assert parse_token_cache(texto) == ("a", "r", "c")
+
+    def test_json_corrompido(self):
+        assert parse_token_cache('{"access_token": ') == (None, None, None)
+
+
+async def test_refresh_troca_token_e_grava_cache(tmp_path, endpoint):
+    novo = make_jwt(3600)
+    endpoint.body = {"access_token": novo, "id_token": "x", "expires_in": 3600, "token_type": "Bearer"}
+    cache = _cache(tmp_path, access_token=make_jwt(-60), refresh_token="refresh-1")
+
+    auth = CognitoAuthenticator(token_file=cache, token_endpoint=endpoint.url)
+    assert auth.token is None
+    assert auth.client_id == "app-client"  # lido do claim do token vencido
+
+    assert await auth.refresh_access_token() == novo
+    assert endpoint.requests == [
+        {"grant_type": "refresh_token", "client_id": "app-client", "refresh_token": "refresh-1"}
+    ]
+    assert auth.token == novo
+    # Sem rotação, o refresh token anterior continua valendo e fica no cache
+    assert parse_token_cache(cache.read_text(encoding="utf-8")) == (novo, "refresh-1", "app-client")
+    assert CognitoAuthenticator(token_file=cache, token_endpoint=endpoint.url).token == novo
+
+
+async def test_refresh_adota_refresh_token_rotacionado(tmp_path, endpoint):
+    endpoint.body = {"access_token": make_jwt(3600), "refresh_token": "refresh-2"}
+    cache = _cache(tmp_path, refresh_token="refresh-1", client_id="app-client")
+
+    auth = CognitoAuthenticator(token_file=cache, token_endpoint=endpoint.url)
+    await auth.refresh_access_token()
+
+    assert auth.refresh_token == "refresh-2"
+    assert parse_token_cache(cache.read_text(encoding="utf-8"))[1] == "refresh-2"
+
+
+async def test_invalid_grant_descarta_refresh_token(tmp_path, endpoint):
+    endpoint.status = 400
+    endpoint.body = {"error": "invalid_grant"}
+    cache = _cache(tmp_path, refresh_token="revogado", client_id="app-client")
+
+    auth = CognitoAuthenticator(token_file=cache, token_endpoint=endpoint.url)
+    with pytest.raises(TokenExpiredError, match="invalid_grant"):
+        await auth.refresh_access_token()
+    assert auth.refresh_token is None
+    assert auth.token is None
+    assert parse_token_cache(cache.read_text(encoding="utf-8")) == (None, None, "app-client")
+
+    # Nem este processo nem um novo tentam de novo o token revogado
+    with pytest.raises(TokenExpiredError, match="não disponível"):
+        await auth.refresh_access_token()
+    assert CognitoAuthenticator(token_file=cache, token_endpoint=endpoint.url).refresh_token is None
+    assert len(endpoint.requests) == 1
+
+
+async def test_erro_transitorio_mantem_refresh_token(tmp_path, endpoint):
+    endpoint.status = 503
+    cache = _cache(tmp_path, refresh_token="refresh-1", client_id="app-client")
+
+    auth = CognitoAuthenticator(token_file=cache, token_endpoint=endpoint.url)
+    with pytest.raises(TokenExpiredError):
+        await auth.refresh_access_token()
+    assert auth.refresh_token == "refresh-1"
+
+
+async def test_sem_refresh_token_nao_chama_endpoint(tmp_path, endpoint):
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache", token_endpoint=endpoint.url)
+    with pytest.raises(TokenExpiredError):
+        await auth.refresh_access_token()
+    assert endpoint.requests == []
+
+
+async def test_authenticate_renova_sem_abrir_browser(tmp_path, endpoint):
+    novo = make_jwt(3600)
+    endpoint.body = {"access_token": novo}
+    cache = _cache(tmp_path, access_token=make_jwt(-60), refresh_token="refresh-1")
+    auth = CognitoAuthenticator(token_file=cache, token_endpoint=endpoint.url)
+
+    async def sem_browser(*args, **kwargs):
+        raise AssertionError("o browser não deveria abrir")
+
+    auth._perform_oauth_login = sem_browser
+    assert await auth.authenticate_google_oauth("aluno@inteli.edu.br", "senha") == novo
+
+
+async def test_extracao_da_pagina_captura_refresh_token(tmp_path):
+    access = make_jwt(3600, client_id="cliente-spa")
+
+    class FakePage:
+        async def evaluate(self, script):
+            return {"accessToken": access, "refreshToken": "refresh-da-pagina"}
+
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache")
+    assert await auth._extract_token_from_page(FakePage(), strict=True) == access
+    assert auth.refresh_token == "refresh-da-pagina"
+    assert auth.client_id == "cliente-spa"
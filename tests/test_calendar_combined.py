@@ -0,0 +1,75 @@
+"""Testes do calendário combinado em streaming (gerar_calendario_combinado)."""
+
+import json
+from pathlib import Path
+
+import pytest
+from icalendar import Calendar
+
+from adalove_extractor.io.calendar import ICalendarExport
+from adalove_extractor.io.calendar_combined import gerar_calendario_combinado
+
+
+@pytest.fixture
+def exporter(tmp_path: Path) -> ICalendarExport:
+    caminho = tmp_path / "areas.json"
+    caminho.write_text(json.dumps({"palavras": {"COMP": ["software"]}}), encoding="utf-8")
+    return ICalendarExport(areas_config_path=caminho)
+
+
+def _salvar_extracao(base: Path, turma: str, encontros: dict) -> Path:
+    caminho = base / turma / "extracao_completa.json"
+    caminho.parent.mkdir(parents=True)
+    extracao = {"turma": turma, "semanas": {"Semana 01": {"encontros": encontros, "sem_ancora": []}}}
+    caminho.write_text(json.dumps(extracao), encoding="utf-8")
+    return caminho
+
+
+def _encontro(titulo: str, record_hash: str) -> dict:
+    return {"tipo": "encontro_instrucao", "titulo": titulo, "record_hash": record_hash}
+
+
+def test_combina_turmas_e_deduplica_uid(tmp_path, exporter):
+    a = _salvar_extracao(tmp_path, "T1", {
+        "2026-03-10": _encontro("Software I", "a1"),
+        "2026-03-11": _encontro("Compartilhado", "comum"),
+    })
+    b = _salvar_extracao(tmp_path, "T2", {
+        "2026-03-11": _encontro("Compartilhado", "comum"),
+        "2026-03-12": _encontro("Software II", "b1"),
+    })
+    saida = tmp_path / "todas.ics"
+
+    stats = gerar_calendario_combinado([a, b], saida, exporter)
+
+    cal = Calendar.from_ical(saida.read_bytes())
+    uids = [str(e["uid"]) for e in cal.walk("VEVENT")]
+    assert uids == [f"adalove-{h}@inteli.edu.br" for h in ("a1", "comum", "b1")]
+    assert stats == {"turmas": 2, "turmas_com_erro": 0, "eventos": 3, "duplicados": 1}
+
+
+def test_extracao_ilegivel_e_pulada(tmp_path, exporter):
+    boa = _salvar_extracao(tmp_path, "T1", {"2026-03-10": _encontro("Software I", "a1")})
+    ruim = tmp_path / "T2" / "extracao_completa.json"
+    ruim.parent.mkdir()
+    ruim.write_text("{", encoding="utf-8")
+
+    stats = gerar_calendario_combinado([ruim, boa], tmp_path / "todas.ics", exporter)
+
+    assert stats["turmas"] == 1
+    assert stats["turmas_com_erro"] == 1
+    assert stats["eventos"] == 1
+
+
+def test_mesmo_conteudo_do_exportador_por_turma(tmp_path, exporter):
+    caminho = _salvar_extracao(tmp_path, "T1", {"2026-03-10": _encontro("Software I", "a1")})
+    individual = tmp_path / "individual.ics"
+    exporter.gerar_calendario(json.loads(caminho.read_text(encoding="utf-8")), individual)
+
+    combinado = tmp_path / "todas.ics"
+    gerar_calendario_combinado([caminho], combinado, exporter)
+
+    def eventos(p):
+        return [(str(e["uid"]), str(e["summary"]), e["dtstart"].dt) for e in Calendar.from_ical(p.read_bytes()).walk("VEVENT")]
+
+    assert eventos(individual) == eventos(combinado)
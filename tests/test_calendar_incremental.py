@@ -0,0 +1,133 @@
+"""Testes do exportador incremental de calendário (IncrementalCalendarExport).
+
+Cobre: reaproveitamento do cache por evento, reconstrução só do que mudou,
+descarte de entradas órfãs, UIDs estáveis e equivalência com o exportador
+completo (`ICalendarExport`).
+"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+from icalendar import Calendar
+
+from adalove_extractor.io.calendar import ICalendarExport
+from adalove_extractor.io.calendar_incremental import IncrementalCalendarExport
+
+
+@pytest.fixture
+def areas_config(tmp_path: Path) -> Path:
+    caminho = tmp_path / "areas.json"
+    caminho.write_text(json.dumps({"palavras": {"COMP": ["software"]}}), encoding="utf-8")
+    return caminho
+
+
+def _extracao() -> dict:
+    return {
+        "semanas": {
+            "Semana 01": {
+                "encontros": {
+                    "2026-03-10": {
+                        "tipo": "encontro_instrucao",
+                        "titulo": "Engenharia de Software",
+                        "professor": "Ana",
+                        "autoestudos": {"Leitura": {"titulo": "Leitura", "descricao": "Cap. 1"}},
+                    },
+                    "2026-03-12": {
+                        "tipo": "encontro_instrucao",
+                        "titulo": "Testes de Software",
+                        "professor": "Ana",
+                        "autoestudos": {},
+                    },
+                },
+                "sem_ancora": [],
+            },
+        },
+    }
+
+
+def _uids(ics: bytes) -> list[str]:
+    cal = Calendar.from_ical(ics)
+    return [str(e.get("uid")) for e in cal.walk("VEVENT")]
+
+
+class TestIncrementalCalendarExport:
+    def test_segunda_execucao_reaproveita_tudo(self, tmp_path, areas_config):
+        saida = tmp_path / "turma.ics"
+        exporter = IncrementalCalendarExport(areas_config_path=areas_config)
+
+        assert exporter.gerar_calendario(_extracao(), saida)
+        assert exporter.ultimas_estatisticas["reconstruidos"] == 2
+        primeiro = saida.read_bytes()
+
+        assert exporter.gerar_calendario(_extracao(), saida)
+        assert exporter.ultimas_estatisticas["reconstruidos"] == 0
+        assert exporter.ultimas_estatisticas["reaproveitados"] == 2
+        assert saida.read_bytes() == primeiro
+
+    def test_reconstroi_apenas_encontro_alterado(self, tmp_path, areas_config):
+        saida = tmp_path / "turma.ics"
+        IncrementalCalendarExport(areas_config_path=areas_config).gerar_calendario(_extracao(), saida)
+
+        extracao = _extracao()
+        encontro = extracao["semanas"]["Semana 01"]["encontros"]["2026-03-10"]
+        encontro["autoestudos"]["Leitura"]["descricao"] = "Cap. 2"
+
+        exporter = IncrementalCalendarExport(areas_config_path=areas_config)
+        exporter.gerar_calendario(extracao, saida)
+
+        assert exporter.ultimas_estatisticas["reconstruidos"] == 1
+        assert exporter.ultimas_estatisticas["reaproveitados"] == 1
+        assert exporter.ultimas_estatisticas["removidos"] == 1
+
+    def test_mudanca_de_configuracao_invalida_cache(self, tmp_path, areas_config):
+        saida = tmp_path / "turma.ics"
+        IncrementalCalendarExport(areas_config_path=areas_config).gerar_calendario(_extracao(), saida)
+
+        exporter = IncrementalCalendarExport(horario_padrao="14:00", areas_config_path=areas_config)
+        exporter.gerar_calendario(_extracao(), saida)
+
+        assert exporter.ultimas_estatisticas["reconstruidos"] == 2
+        assert b"T140000" in saida.read_bytes()
+
+    def test_uids_estaveis_entre_horarios(self, tmp_path, areas_config):
+        manha = tmp_path / "manha.ics"
+        tarde = tmp_path / "tarde.ics"
+        IncrementalCalendarExport(horario_padrao="08:00", areas_config_path=areas_config).gerar_calendario(_extracao(), manha)
+        IncrementalCalendarExport(horario_padrao="14:00", areas_config_path=areas_config).gerar_calendario(_extracao(), tarde)
+
+        assert _uids(manha.read_bytes()) == _uids(tarde.read_bytes())
+
+    def test_uid_duplicado_emitido_uma_vez(self, tmp_path, areas_config):
+        extracao = _extracao()
+        encontros = extracao["semanas"]["Semana 01"]["encontros"]
+        for encontro in encontros.values():
+            encontro["record_hash"] = "mesmo"
+
+        saida = tmp_path / "turma.ics"
+        exporter = IncrementalCalendarExport(areas_config_path=areas_config)
+        exporter.gerar_calendario(extracao, saida)
+
+        assert _uids(saida.read_bytes()) == ["adalove-mesmo@inteli.edu.br"]
+        assert exporter.ultimas_estatisticas["duplicados"] == 1
+
+    def test_mesmos_eventos_do_exportador_completo(self, tmp_path, areas_config):
+        completo = tmp_path / "completo.ics"
+        incremental = tmp_path / "incremental.ics"
+        ICalendarExport(areas_config_path=areas_config).gerar_calendario(copy.deepcopy(_extracao()), completo)
+        IncrementalCalendarExport(areas_config_path=areas_config).gerar_calendario(_extracao(), incremental)
+
+        def eventos(caminho):
+            cal = Calendar.from_ical(caminho.read_bytes())
+            return [(str(e["uid"]), str(e["summary"]), e["dtstart"].dt) for e in cal.walk("VEVENT")]
+
+        assert eventos(completo) == eventos(incremental)
+
+    def test_cache_corrompido_reconstroi(self, tmp_path, areas_config):
+        saida = tmp_path / "turma.ics"
+        saida.with_suffix(".cache.json").write_text("{quebrado", encoding="utf-8")
+
+        exporter = IncrementalCalendarExport(areas_config_path=areas_config)
+        assert exporter.gerar_calendario(_extracao(), saida)
+        assert exporter.ultimas_estatisticas["reconstruidos"] == 2
@@ -0,0 +1,105 @@
+"""Testes do servidor local de feeds de calendário (CalendarFeedServer).
+
+Sobe o servidor em localhost numa porta efêmera e verifica ETag, 304,
+gzip e regeneração após mudança na extração.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+
+from adalove_extractor.io.calendar_server import CalendarFeedServer
+
+
+def _salvar_extracao(base: Path, turma: str, titulo: str) -> Path:
+    caminho = base / turma / "extracao_completa.json"
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    extracao = {
+        "turma": turma,
+        "semanas": {
+            "Semana 01": {
+                "encontros": {
+                    "2026-03-10": {"tipo": "encontro_instrucao", "titulo": titulo, "record_hash": turma},
+                },
+                "sem_ancora": [],
+            }
+        },
+    }
+    caminho.write_text(json.dumps(extracao), encoding="utf-8")
+    return caminho
+
+
+@pytest.fixture
+async def servidor(tmp_path: Path):
+    _salvar_extracao(tmp_path, "T1", "Aula A")
+    _salvar_extracao(tmp_path, "T2", "Aula B")
+    async with CalendarFeedServer(tmp_path, port=0, poll_interval=3600) as server:
+        yield server
+
+
+def _url(server: CalendarFeedServer, caminho: str) -> str:
+    return f"http://127.0.0.1:{server.port}/{caminho}"
+
+
+async def test_serve_feed_com_etag_e_304(servidor):
+    async with httpx.AsyncClient(headers={"Accept-Encoding": "identity"}) as client:
+        resp = await client.get(_url(servidor, "T1.ics"))
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/calendar")
+        assert b"Aula A" in resp.content
+        etag = resp.headers["etag"]
+
+        resp = await client.get(_url(servidor, "T1.ics"), headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+
+
+async def test_gzip_tem_etag_propria(servidor):
+    async with httpx.AsyncClient() as client:
+        plain = await client.get(_url(servidor, "T1.ics"), headers={"Accept-Encoding": "identity"})
+        comprimido = await client.get(_url(servidor, "T1.ics"), headers={"Accept-Encoding": "gzip"})
+
+    assert comprimido.headers["content-encoding"] == "gzip"
+    assert comprimido.headers["etag"] != plain.headers["etag"]
+    assert comprimido.content == plain.content  # httpx descomprime
+
+
+async def test_feed_combinado_e_404(servidor):
+    async with httpx.AsyncClient() as client:
+        todas = await client.get(_url(servidor, "todas.ics"))
+        faltando = await client.get(_url(servidor, "nao_existe.ics"))
+
+    assert b"Aula A" in todas.content and b"Aula B" in todas.content
+    assert faltando.status_code == 404
+
+
+async def test_regenera_quando_extracao_muda(servidor, tmp_path):
+    async with httpx.AsyncClient(headers={"Accept-Encoding": "identity"}) as client:
+        etag_antiga = (await client.get(_url(servidor, "T1.ics"))).headers["etag"]
+
+        caminho = _salvar_extracao(tmp_path, "T1", "Aula A revisada")
+        st = caminho.stat()
+        os.utime(caminho, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert await servidor.refresh() == ["T1"]
+
+        resp = await client.get(_url(servidor, "T1.ics"), headers={"If-None-Match": etag_antiga})
+
+    assert resp.status_code == 200
+    assert b"Aula A revisada" in resp.content
+    assert await servidor.refresh() == []
+
+
+async def test_extracao_malformada_mantem_ultimo_feed(servidor, tmp_path):
+    caminho = tmp_path / "T1" / "extracao_completa.json"
+    caminho.write_text(json.dumps({"turma": "T1", "semanas": {"Semana 01": {"encontros": {"2026-03-10": 7}}}}))
+    st = caminho.stat()
+    os.utime(caminho, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    _salvar_extracao(tmp_path, "T3", "Aula C")
+
+    # Uma turma malformada não derruba a atualização das demais
+    assert await servidor.refresh() == ["T3"]
+    assert b"Aula A" in servidor.feeds["T1"].body
+    assert "T3" in servidor.feeds
@@ -0,0 +1,111 @@
+"""Testes do relatório de ponderadas (`adalove_cli.py --ponderadas`)."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from adalove_extractor.extractors.api.anchor import organize_by_encontros
+from adalove_extractor.io.manifest import ExtractionManifest
+from adalove_extractor.io.ponderadas import salvar_ponderadas
+from adalove_extractor.io.uuid_index import indexar_semana, salvar_indice
+
+
+def _gravar_turma(output_dir: Path, nome: str, uuid_turma: str, data_encontro: str) -> None:
+    cards = [
+        {
+            "student_activity_uuid": f"{nome}-enc",
+            "titulo": "Instrução",
+            "card_type": "encontro_instrucao",
+            "data_hora": f"{data_encontro}T07:00:00.000Z",
+            "professor": "Prof",
+            "sort": 1,
+        },
+        {
+            "student_activity_uuid": f"{nome}-pond",
+            "titulo": f"Ponderada {nome}",
+            "card_type": "avaliacao",
+            "professor": "Prof",
+            "sort": 2,
+            "is_ponderada": True,
+            "avaliacao": {"peso": 3, "pergunta": "?", "resposta": None, "respondida": False,
+                          "nota": None, "avaliada": False, "bloqueada": False},
+        },
+    ]
+    organizada = organize_by_encontros(cards)
+    turma_dir = output_dir / nome
+    (turma_dir / "semanas").mkdir(parents=True)
+    extracao = {
+        "turma": nome,
+        "uuid": uuid_turma,
+        "extração_timestamp": "2026-01-01T00:00:00",
+        "semanas": {"Semana 01": organizada},
+    }
+    shard = {"turma": nome, "semana": "Semana 01", "extração_timestamp": "2026-01-01T00:00:00", **organizada}
+    (turma_dir / "semanas" / "semana_01.json").write_text(json.dumps(shard), encoding="utf-8")
+    (turma_dir / "extracao_completa.json").write_text(json.dumps(extracao), encoding="utf-8")
+    salvar_indice(turma_dir, indexar_semana("Semana 01", organizada), extracao["extração_timestamp"])
+    salvar_ponderadas(turma_dir, extracao)
+    ExtractionManifest(output_dir).update(turma_dir, extracao)
+
+
+class FakeClient:
+    """Client que responde userdata com a ponderada de cada turma já respondida."""
+
+    def __init__(self):
+        self.em_voo = 0
+        self.max_em_voo = 0
+        self.fechado = False
+
+    async def get(self, endpoint):
+        self.em_voo += 1
+        self.max_em_voo = max(self.max_em_voo, self.em_voo)
+        await asyncio.sleep(0.01)
+        self.em_voo -= 1
+        nome = "T1" if "uuid-t1" in endpoint else "T2"
+        return {"activities": [{
+            "studentActivityUuid": f"{nome}-pond",
+            "gradeWeight": 3,
+            "studyQuestion": "?",
+            "studyAnswer": "feito" if nome == "T1" else "",
+        }]}
+
+    async def __aexit__(self, *exc):
+        self.fechado = True
+
+
+@pytest.fixture
+def cli(adalove_cli, tmp_path: Path):
+    output_dir = tmp_path / "api_extraction"
+    _gravar_turma(output_dir, "T1", "uuid-t1", "2026-03-26")
+    _gravar_turma(output_dir, "T2", "uuid-t2", "2026-03-18")
+    adalove_cli.OUTPUT_DIR = output_dir
+    return adalove_cli
+
+
+async def test_atualiza_turmas_em_paralelo_e_lista_pendentes(cli, capsys):
+    client = FakeClient()
+
+    async def _cliente_autenticado():
+        return client, None
+
+    cli._cliente_autenticado = _cliente_autenticado
+
+    await cli._ponderadas_cli(todas=False, como_json=True, atualizar=True, paralelo=None)
+
+    linhas = json.loads(capsys.readouterr().out)
+    assert client.max_em_voo == 2
+    assert client.fechado
+    # T1 foi respondida na revalidação; só T2 continua pendente
+    assert [l["turma"] for l in linhas] == ["T2"]
+    assert linhas[0]["prazo"] == "2026-03-20T23:59:59"
+    assert linhas[0]["student_activity_uuid"] == "T2-pond"
+
+
+async def test_todas_ordena_por_prazo_sem_rede(cli, capsys):
+    await cli._ponderadas_cli(todas=True, como_json=True, atualizar=False, paralelo=None)
+
+    linhas = json.loads(capsys.readouterr().out)
+    assert [l["turma"] for l in linhas] == ["T2", "T1"]
+    assert [l["respondida"] for l in linhas] == [False, False]
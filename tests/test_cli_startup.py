@@ -0,0 +1,35 @@
+"""Garante que `adalove_cli.py --list` (modo local) não carrega dependências pesadas.
+
+Roda o CLI num subprocesso limpo e inspeciona `sys.modules` ao final: se
+alguém voltar a importar questionary/rich/playwright/pydantic no topo de um
+módulo, o startup do `--list` (usado em cron e prompts de shell) volta a
+custar centenas de milissegundos.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+CLI = Path(__file__).resolve().parents[1] / "adalove_cli.py"
+
+PESADOS = ["questionary", "prompt_toolkit", "rich", "playwright", "pydantic", "httpx", "icalendar", "asyncio"]
+
+SCRIPT = f"""
+import json, runpy, sys
+sys.argv = [{str(CLI)!r}, "--list"]
+runpy.run_path({str(CLI)!r}, run_name="__main__")
+print(json.dumps(sorted(m for m in {PESADOS!r} if m in sys.modules)))
+"""
+
+
+def test_list_local_nao_importa_dependencias_pesadas(tmp_path):
+    resultado = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+        check=True,
+    )
+    carregados = json.loads(resultado.stdout.strip().splitlines()[-1])
+    assert carregados == []
@@ -0,0 +1,110 @@
+"""
+Testes da renovação de token no AdaLoveAPIClient.
+
+A API é simulada com `httpx.MockTransport` e o refresh do autenticador é
+trocado por uma corrotina que conta as chamadas: o que importa aqui é que
+requisições concorrentes disparem UMA renovação só e esperem por ela.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from adalove_extractor.api import client as client_module
+from adalove_extractor.api.auth import CognitoAuthenticator
+from adalove_extractor.api.client import AdaLoveAPIClient
+from jwt_helpers import make_jwt
+
+
+NOVO = make_jwt(3600)
+
+
+@pytest.fixture
+def auth(tmp_path):
+    auth = CognitoAuthenticator(token_file=tmp_path / ".token_cache")
+    auth.refresh_token = "refresh-1"
+    auth.chamadas = 0
+
+    async def fake_refresh():
+        auth.chamadas += 1
+        await asyncio.sleep(0.05)
+        auth.token = NOVO
+        return NOVO
+
+    auth.refresh_access_token = fake_refresh
+    return auth
+
+
+@pytest.fixture
+async def api(auth):
+    vistos = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        vistos.append(token)
+        if token != NOVO:
+            return httpx.Response(401)
+        return httpx.Response(200, json={"ok": True})
+
+    client = AdaLoveAPIClient(base_url="http://api.test", auth=auth)
+    await client.session.aclose()
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.vistos = vistos
+    yield client
+    await client.close()
+
+
+async def test_401_concorrentes_disparam_uma_renovacao(api, auth):
+    auth.token = make_jwt(1800)  # válido pelo exp, mas recusado pela API
+
+    respostas = await asyncio.gather(*[api.get("/sections") for _ in range(10)])
+
+    assert respostas == [{"ok": True}] * 10
+    assert auth.chamadas == 1
+
+
+async def test_token_na_margem_renova_antes_de_enviar(api, auth):
+    auth.token = make_jwt(60)  # dentro de TOKEN_EXPIRY_SKEW_SECONDS
+
+    await asyncio.gather(*[api.get("/sections") for _ in range(5)])
+
+    assert auth.chamadas == 1
+    assert set(api.vistos) == {NOVO}
+
+
+async def test_renovador_renova_antes_do_vencimento(api, auth):
+    auth.token = make_jwt(200)  # dentro da antecedência de 300s
+    antigos = api._build_headers()
+
+    api._start_renewer()
+    await asyncio.sleep(0.2)
+
+    assert auth.chamadas == 1
+    assert api._headers["Authorization"] == f"Bearer {NOVO}"
+    # Troca de referência: quem já tinha o dict antigo não o vê mudar
+    assert antigos["Authorization"] != f"Bearer {NOVO}"
+    assert await api.get("/sections") == {"ok": True}
+    assert api.vistos == [NOVO]
+
+
+async def test_renovador_sem_refresh_token_nao_renova(api, auth, monkeypatch):
+    monkeypatch.setattr(client_module, "TOKEN_RENEW_CHECK_SECONDS", 0.01)
+    auth.token = make_jwt(200)
+    auth.refresh_token = None
+
+    api._start_renewer()
+    await asyncio.sleep(0.1)
+
+    assert auth.chamadas == 0
+    assert not api._renewer.done()
+
+
+async def test_close_para_o_renovador(api, auth):
+    auth.token = make_jwt(3600)
+    api._start_renewer()
+    renovador = api._renewer
+
+    await api.close()
+
+    assert renovador.cancelled()
@@ -0,0 +1,119 @@
+"""
+Testes do enriquecimento em streaming.
+
+Garante que `EnrichmentEngine.enrich_weeks`, alimentado por
+`IncrementalWriter.iter_weeks`, produz o mesmo resultado do modo em lote
+(`enrich_cards`) quando recebe o contador de nomes pré-computado.
+"""
+
+import json
+import logging
+import tempfile
+
+import pytest
+
+from adalove_extractor.enrichment import EnrichmentEngine
+from adalove_extractor.enrichment.normalizer import KnownNamesCounter, detect_known_names
+from adalove_extractor.io.incremental_writer import IncrementalWriter
+from adalove_extractor.io.writers import write_enriched_outputs
+
+
+def _cards() -> list[dict]:
+    """Duas semanas com instrução + autoestudo e professor só no texto."""
+    cards = []
+    for semana in ("Semana 01", "Semana 02"):
+        cards.append({
+            "semana": semana,
+            "indice": "1",
+            "id": f"{semana}-instr",
+            "titulo": "Instrução Python Básico",
+            "card_type": "encontro_instrucao",
+            "is_encontro": True,
+            "texto_completo": "Instrução\nMaria Souza\n10/03/2026 - 10:00",
+        })
+        cards.append({
+            "semana": semana,
+            "indice": "2",
+            "id": f"{semana}-auto",
+            "titulo": "Autoestudo Python Básico",
+            "card_type": "autoestudo",
+            "texto_completo": "Leitura\nMaria Souza",
+            "links": "https://docs.python.org",
+        })
+    return cards
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield tmpdir
+
+
+class TestKnownNamesCounter:
+    def test_equivalente_a_detect_known_names(self):
+        cards = _cards()
+        assert KnownNamesCounter.from_cards(cards).known_names() == detect_known_names(cards)
+
+    def test_seed_conta_como_ocorrencia_previa(self):
+        counter = KnownNamesCounter(seed={"Maria Souza": 1})
+        assert "Maria Souza" not in counter
+        counter.update([{"texto_completo": "Maria Souza"}])
+        assert "Maria Souza" in counter
+
+
+class TestIterWeeks:
+    def test_agrupa_cards_consecutivos_por_semana(self, temp_dir):
+        writer = IncrementalWriter("turma", temp_dir, "exec")
+        writer.write_batch(_cards())
+
+        semanas = [(semana, len(cards)) for semana, cards in writer.iter_weeks()]
+
+        assert semanas == [("Semana 01", 2), ("Semana 02", 2)]
+
+    def test_remove_metadata_interna(self, temp_dir):
+        writer = IncrementalWriter("turma", temp_dir, "exec")
+        writer.write_batch(_cards())
+
+        for _, cards in writer.iter_weeks():
+            for card in cards:
+                assert "_written_at" not in card
+                assert "_execution_id" not in card
+
+
+class TestEnrichWeeks:
+    def test_streaming_igual_ao_lote_com_contador_precomputado(self, temp_dir):
+        writer = IncrementalWriter("turma", temp_dir, "exec")
+        writer.write_batch(_cards())
+
+        lote = EnrichmentEngine().enrich_cards(writer.finalize())
+        counter = KnownNamesCounter.from_cards(writer.iter_cards())
+        stream = list(EnrichmentEngine().enrich_weeks(writer.iter_weeks(), known_names=counter))
+
+        assert stream == lote
+
+    def test_nao_modifica_cards_originais(self):
+        cards = _cards()
+        originais = json.loads(json.dumps(cards))
+
+        list(EnrichmentEngine().enrich_weeks([("Semana 01", cards)]))
+
+        assert cards == originais
+
+    def test_gerador_flui_direto_para_writer(self, temp_dir):
+        writer = IncrementalWriter("turma", temp_dir, "exec")
+        writer.write_batch(_cards())
+        engine = EnrichmentEngine()
+
+        csv_path, jsonl_path = write_enriched_outputs(
+            engine.enrich_weeks(writer.iter_weeks()),
+            temp_dir,
+            "20260101",
+            logging.getLogger(__name__),
+        )
+
+        with open(jsonl_path, encoding="utf-8") as f:
+            linhas = [json.loads(line) for line in f]
+        assert len(linhas) == 4
+        autoestudo = next(c for c in linhas if c["id"] == "Semana 02-auto")
+        assert autoestudo["parent_instruction_id"] == "Semana 02-instr"
+        assert autoestudo["professor"] == "Maria Souza"
@@ -0,0 +1,76 @@
+"""Testes do cache de extrações da sessão (ExtractionCache)."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from adalove_extractor.io.extraction_cache import ExtractionCache
+
+
+def _escrever(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def arquivo(tmp_path: Path) -> Path:
+    path = tmp_path / "T1" / "extracao_completa.json"
+    _escrever(path, {"turma": "T1", "semanas": {}})
+    return path
+
+
+class TestExtractionCache:
+    def test_segunda_leitura_vem_do_cache(self, arquivo):
+        cache = ExtractionCache()
+
+        primeira = cache.load(arquivo)
+        segunda = cache.load(arquivo)
+
+        assert segunda is primeira
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_arquivo_alterado_invalida(self, arquivo):
+        cache = ExtractionCache()
+        cache.load(arquivo)
+
+        _escrever(arquivo, {"turma": "T1 alterada", "semanas": {}})
+        st = arquivo.stat()
+        os.utime(arquivo, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert cache.load(arquivo)["turma"] == "T1 alterada"
+        assert cache.misses == 2
+
+    def test_store_grava_e_mantem_cache_quente(self, arquivo):
+        cache = ExtractionCache()
+        data = cache.load(arquivo)
+        data["semanas"]["Semana 01"] = {"encontros": {}}
+
+        cache.store(arquivo, data)
+
+        assert json.loads(arquivo.read_text(encoding="utf-8")) == data
+        assert cache.load(arquivo) is data
+        assert cache.misses == 1
+
+    def test_limite_lru(self, tmp_path):
+        cache = ExtractionCache(max_entries=2)
+        caminhos = []
+        for nome in ("A", "B", "C"):
+            path = tmp_path / nome / "extracao_completa.json"
+            _escrever(path, {"turma": nome})
+            caminhos.append(path)
+
+        cache.load(caminhos[0])
+        cache.load(caminhos[1])
+        cache.load(caminhos[0])  # A vira o mais recente
+        cache.load(caminhos[2])  # expulsa B
+
+        assert len(cache) == 2
+        cache.load(caminhos[0])
+        assert cache.misses == 3
+        cache.load(caminhos[1])
+        assert cache.misses == 4
+
+    def test_arquivo_inexistente(self, tmp_path):
+        assert ExtractionCache().load(tmp_path / "nada.json") is None
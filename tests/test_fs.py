@@ -0,0 +1,45 @@
+"""Testes da escrita atômica (utils.fs): conteúdo e permissões do arquivo final."""
+
+import os
+import stat
+import sys
+
+import pytest
+
+from adalove_extractor.utils.fs import atomic_write_bytes, atomic_write_json
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="permissões POSIX")
+
+
+def _modo(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_arquivo_novo_tem_a_permissao_de_um_open_comum(tmp_path):
+    comum = tmp_path / "comum.ics"
+    comum.write_bytes(b"x")
+
+    atomic_write_bytes(tmp_path / "feed.ics", b"BEGIN:VCALENDAR")
+
+    assert _modo(tmp_path / "feed.ics") == _modo(comum)
+    assert (tmp_path / "feed.ics").read_bytes() == b"BEGIN:VCALENDAR"
+
+
+def test_regravacao_preserva_permissao_existente(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("{}")
+    os.chmod(path, 0o640)
+
+    atomic_write_json(path, {"turmas": {}})
+
+    assert _modo(path) == 0o640
+
+
+def test_modo_explicito_prevalece(tmp_path):
+    path = tmp_path / ".token_cache"
+    path.write_text("{}")
+    os.chmod(path, 0o644)
+
+    atomic_write_json(path, {"access_token": "a"}, indent=None, mode=0o600)
+
+    assert _modo(path) == 0o600
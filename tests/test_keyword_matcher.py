@@ -0,0 +1,89 @@
+"""
+Testes do casamento de palavras-chave em passagem única.
+
+O autômato precisa reproduzir exatamente o resultado do teste `in` ingênuo
+que substituiu em `ICalendarExport._classificar_por_palavras`, inclusive
+longest-match e desempate pela ordem de declaração.
+"""
+
+import random
+
+from adalove_extractor.utils.keyword_matcher import HostSuffixIndex, KeywordMatcher
+
+
+def _ingenuo(palavras: dict, texto: str, min_len: int = 0):
+    """Implementação anterior (um `in` por palavra-chave), usada como oráculo."""
+    candidatos = []
+    for ordem, (area, lista) in enumerate(palavras.items()):
+        for p in lista:
+            if len(p) >= min_len and p in texto:
+                candidatos.append((-len(p), ordem, area))
+    return min(candidatos)[2] if candidatos else None
+
+
+def _automato(palavras: dict, texto: str, min_len: int = 0):
+    matcher = KeywordMatcher()
+    for ordem, (area, lista) in enumerate(palavras.items()):
+        for p in lista:
+            matcher.add(p, (-len(p), ordem, area))
+    melhor = min((v for n, v in matcher.iter_matches(texto) if n >= min_len), default=None)
+    return melhor[2] if melhor else None
+
+
+class TestKeywordMatcher:
+    def test_encontra_padroes_sobrepostos(self):
+        m = KeywordMatcher([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+        assert sorted(m.iter_matches("ushers")) == [(2, 1), (3, 2), (4, 4)]
+
+    def test_conta_todas_as_ocorrencias(self):
+        m = KeywordMatcher([("aa", "x")])
+        assert list(m.iter_matches("aaaa")) == [(2, "x")] * 3
+
+    def test_primeira_insercao_vence_para_padrao_repetido(self):
+        m = KeywordMatcher([("dados", "COMP"), ("dados", "MAT")])
+        assert list(m.iter_matches("dados")) == [(5, "COMP")]
+
+    def test_ignora_padrao_vazio(self):
+        m = KeywordMatcher([("", "x")])
+        assert len(m) == 0
+        assert list(m.iter_matches("qualquer")) == []
+
+    def test_recompila_apos_nova_insercao(self):
+        m = KeywordMatcher([("grafo", "MAT")])
+        assert list(m.iter_matches("grafo")) == [(5, "MAT")]
+        m.add("raf", "X")
+        assert sorted(m.iter_matches("grafo")) == [(3, "X"), (5, "MAT")]
+
+    def test_equivalente_ao_teste_in_ingenuo(self):
+        rng = random.Random(42)
+        alfabeto = "abcd "
+        for _ in range(300):
+            palavras = {
+                f"A{i}": ["".join(rng.choice(alfabeto) for _ in range(rng.randint(1, 4)))
+                          for _ in range(rng.randint(1, 4))]
+                for i in range(rng.randint(1, 4))
+            }
+            texto = "".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 30)))
+            min_len = rng.choice([0, 2, 3])
+            assert _automato(palavras, texto, min_len) == _ingenuo(palavras, texto, min_len)
+
+
+class TestHostSuffixIndex:
+    def test_casa_host_exato_e_subdominio(self):
+        idx = HostSuffixIndex([("discrete.openmathbooks.org", "MAT")])
+        assert idx.lookup("discrete.openmathbooks.org") == (0, "MAT")
+        assert idx.lookup("www.discrete.openmathbooks.org") == (0, "MAT")
+
+    def test_nao_casa_dominio_pai_nem_sufixo_parcial(self):
+        idx = HostSuffixIndex([("discrete.openmathbooks.org", "MAT")])
+        assert idx.lookup("openmathbooks.org") is None
+        assert idx.lookup("discrete.openmathbooks.org.exemplo.com") is None
+        assert idx.lookup("notdiscrete.openmathbooks.org") is None
+
+    def test_ordem_de_declaracao_desempata(self):
+        idx = HostSuffixIndex([("wolfram.com", "MAT"), ("mathworld.wolfram.com", "COMP")])
+        assert idx.lookup("mathworld.wolfram.com") == (0, "MAT")
+
+    def test_normaliza_caixa(self):
+        idx = HostSuffixIndex([("Exemplo.COM", "UX")])
+        assert idx.lookup("WWW.exemplo.com") == (0, "UX")
@@ -0,0 +1,95 @@
+"""Testes do manifesto do diretório de saída (ExtractionManifest)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from adalove_extractor.io.manifest import MANIFEST_FILENAME, ExtractionManifest
+
+
+def _salvar_extracao(base: Path, slug: str, **extra) -> Path:
+    turma_dir = base / slug
+    (turma_dir / "semanas").mkdir(parents=True)
+    (turma_dir / "semanas" / "semana_01.json").write_text("{}", encoding="utf-8")
+    extracao = {
+        "turma": slug.replace("_", " "),
+        "uuid": f"uuid-{slug}",
+        "extração_timestamp": "2026-03-01T10:00:00",
+        "total_semanas": 1,
+        "total_atividades": 12,
+        "total_ponderadas": 3,
+        "semanas": {"Semana 01": {}},
+        **extra,
+    }
+    (turma_dir / "extracao_completa.json").write_text(json.dumps(extracao), encoding="utf-8")
+    return turma_dir
+
+
+@pytest.fixture
+def output_dir(tmp_path: Path) -> Path:
+    return tmp_path / "api_extraction"
+
+
+class TestExtractionManifest:
+    def test_update_registra_contagens_e_tamanhos(self, output_dir):
+        turma_dir = _salvar_extracao(output_dir, "2026-1A-T13")
+        extracao = json.loads((turma_dir / "extracao_completa.json").read_text(encoding="utf-8"))
+
+        entry = ExtractionManifest(output_dir).update(turma_dir, extracao)
+
+        assert entry["uuid"] == "uuid-2026-1A-T13"
+        assert entry["total_ponderadas"] == 3
+        assert entry["semanas_arquivos"] == 1
+        assert entry["arquivo_bytes"] == (turma_dir / "extracao_completa.json").stat().st_size
+        salvo = json.loads((output_dir / MANIFEST_FILENAME).read_text(encoding="utf-8"))
+        assert "2026-1A-T13" in salvo["turmas"]
+
+    def test_manifesto_ausente_e_reconstruido_do_disco(self, output_dir):
+        _salvar_extracao(output_dir, "T1")
+        _salvar_extracao(output_dir, "T2")
+
+        manifest = ExtractionManifest(output_dir)
+
+        assert list(manifest.turmas()) == ["T1", "T2"]
+        assert (output_dir / MANIFEST_FILENAME).exists()
+
+    def test_le_apenas_manifesto_depois_de_criado(self, output_dir):
+        turma_dir = _salvar_extracao(output_dir, "T1")
+        ExtractionManifest(output_dir).rebuild()
+
+        # Extração corrompida depois: a listagem não abre o arquivo da turma
+        (turma_dir / "extracao_completa.json").write_text("{", encoding="utf-8")
+
+        assert "T1" in ExtractionManifest(output_dir)
+
+    def test_recarrega_quando_outro_processo_grava(self, output_dir):
+        _salvar_extracao(output_dir, "T1")
+        leitor = ExtractionManifest(output_dir)
+        assert "T2" not in leitor
+
+        turma_dir = _salvar_extracao(output_dir, "T2")
+        ExtractionManifest(output_dir).update(turma_dir, {"turma": "T2"})
+
+        assert "T2" in leitor
+
+    def test_rebuild_ignora_extracao_ilegivel_e_remove_orfas(self, output_dir):
+        _salvar_extracao(output_dir, "T1")
+        manifest = ExtractionManifest(output_dir)
+        manifest.rebuild()
+
+        (output_dir / "T1" / "extracao_completa.json").write_text("{", encoding="utf-8")
+
+        assert manifest.rebuild() == {}
+        assert "T1" not in manifest
+
+    def test_marcar_atualiza_campos_de_turma_existente(self, output_dir):
+        _salvar_extracao(output_dir, "T1")
+        manifest = ExtractionManifest(output_dir)
+
+        assert manifest.marcar("T1", status_verificado_em="2026-03-02T08:00:00")
+        assert not manifest.marcar("T9", status_verificado_em="2026-03-02T08:00:00")
+
+        entry = ExtractionManifest(output_dir).get("T1")
+        assert entry["status_verificado_em"] == "2026-03-02T08:00:00"
+        assert entry["total_atividades"] == 12
@@ -0,0 +1,137 @@
+"""Testes do outbox de submissões (SubmissionOutbox)."""
+
+import asyncio
+import json
+import time
+
+from adalove_extractor.api.endpoints import Endpoints
+from adalove_extractor.api.outbox import ENVIADA, SubmissionOutbox
+
+
+class FakeClient:
+    def __init__(self, online=True):
+        self.online = online
+        self.registradas = {}
+        self.puts = []
+        self.gets = []
+        self.em_voo = 0
+        self.max_em_voo = 0
+        # Simula PUT que chega à API mas cuja resposta se perde
+        self.perder_resposta = False
+
+    async def submit_answer(self, uuid, texto):
+        self.em_voo += 1
+        self.max_em_voo = max(self.max_em_voo, self.em_voo)
+        await asyncio.sleep(0.01)
+        self.em_voo -= 1
+        self.puts.append(uuid)
+        if not self.online:
+            return False
+        self.registradas[uuid] = texto
+        return not self.perder_resposta
+
+    async def get(self, endpoint):
+        self.gets.append(endpoint)
+        if not self.online:
+            raise RuntimeError("sem conexão")
+        return {"activities": [
+            {"studentActivityUuid": uuid, "studyAnswer": texto} for uuid, texto in self.registradas.items()
+        ]}
+
+
+async def test_envia_com_concorrencia_limitada_e_compacta(tmp_path):
+    enviados = []
+    outbox = SubmissionOutbox(tmp_path / "outbox.jsonl", ao_enviar=enviados.append)
+    ids = [outbox.enfileirar(f"a{i}", f"resposta {i}", section_uuid="sec") for i in range(5)]
+    client = FakeClient()
+
+    resultado = await outbox.drenar(client, concorrencia=2)
+
+    assert sorted(resultado["enviadas"]) == sorted(ids)
+    assert resultado["restantes"] == 0
+    assert client.max_em_voo == 2
+    assert [e["estado"] for e in enviados] == [ENVIADA] * 5
+    assert (tmp_path / "outbox.jsonl").read_text() == ""
+
+
+async def test_falha_fica_pendente_com_backoff_e_sobrevive_a_reinicio(tmp_path):
+    path = tmp_path / "outbox.jsonl"
+    outbox = SubmissionOutbox(path, backoff_base=30)
+    entrada = outbox.enfileirar("a1", "minha resposta", section_uuid="sec", turma="T1")
+
+    resultado = await outbox.drenar(FakeClient(online=False))
+    assert resultado["falhas"] == [entrada]
+    assert outbox.estado(entrada)["tentativas"] == 1
+    assert outbox.proximo_vencimento() > time.time() + 20
+
+    # Nova sessão: a entrada continua lá, adiada pelo backoff
+    reaberto = SubmissionOutbox(path)
+    client = FakeClient()
+    assert (await reaberto.drenar(client))["restantes"] == 1
+    assert client.puts == []
+
+    resultado = await reaberto.drenar(client, forcar=True)
+    assert resultado["enviadas"] == [entrada]
+    assert client.registradas == {"a1": "minha resposta"}
+
+
+async def test_nao_reenvia_resposta_ja_registrada(tmp_path):
+    outbox = SubmissionOutbox(tmp_path / "outbox.jsonl", backoff_base=0)
+    entrada = outbox.enfileirar("a1", "texto", section_uuid="sec-1")
+    client = FakeClient()
+    client.perder_resposta = True
+
+    primeira = await outbox.drenar(client)
+    assert primeira["falhas"] == [entrada]
+
+    segunda = await outbox.drenar(client)
+    assert segunda["ja_enviadas"] == [entrada]
+    assert client.puts == ["a1"]
+    assert client.gets == [Endpoints.section_userdata("sec-1")]
+
+
+async def test_nova_resposta_substitui_pendente_da_mesma_atividade(tmp_path):
+    path = tmp_path / "outbox.jsonl"
+    outbox = SubmissionOutbox(path)
+    outbox.enfileirar("a1", "versão 1")
+    nova = outbox.enfileirar("a1", "versão 2")
+
+    assert [e["id"] for e in outbox.pendentes()] == [nova]
+    linhas = [json.loads(l) for l in path.read_text().splitlines()]
+    assert any(l.get("estado") == "substituida" for l in linhas)
+
+    client = FakeClient()
+    await SubmissionOutbox(path).drenar(client)
+    assert client.registradas == {"a1": "versão 2"}
+
+
+async def test_linha_cortada_e_ignorada(tmp_path):
+    path = tmp_path / "outbox.jsonl"
+    outbox = SubmissionOutbox(path)
+    entrada = outbox.enfileirar("a1", "texto")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"id": "x", "estado": "pend')
+
+    assert [e["id"] for e in SubmissionOutbox(path).pendentes()] == [entrada]
+
+
+async def test_compactacao_preserva_entradas_de_outro_processo(tmp_path):
+    path = tmp_path / "outbox.jsonl"
+    a = SubmissionOutbox(path)
+    minha = a.enfileirar("a1", "resposta de A")
+    b = SubmissionOutbox(path)
+    alheia = b.enfileirar("b1", "resposta de B")
+
+    # A só conhece a própria entrada; a compactação não pode apagar a de B
+    resultado = await a.drenar(FakeClient())
+    assert resultado["enviadas"] == [minha]
+    assert [e["id"] for e in SubmissionOutbox(path).pendentes()] == [alheia]
+    assert not (tmp_path / "outbox.jsonl.lock").exists()
+
+    client = FakeClient(online=False)
+    await b.drenar(client)
+    reaberto = SubmissionOutbox(path).estado(alheia)
+    assert reaberto["uuid"] == "b1" and reaberto["tentativas"] == 1
+
+    await b.drenar(FakeClient(), forcar=True)
+    assert SubmissionOutbox(path).pendentes() == []
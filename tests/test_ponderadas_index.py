@@ -0,0 +1,95 @@
+"""Testes do índice pré-computado de ponderadas (ponderadas.json)."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from adalove_extractor.io.ponderadas import (
+    PONDERADAS_FILENAME,
+    atualizar_avaliacoes,
+    calcular_prazo_ponderada,
+    carregar_ponderadas,
+    extrair_ponderadas,
+    salvar_ponderadas,
+)
+
+EXTRACAO = {
+    "turma": "T1",
+    "extração_timestamp": "2026-03-01T10:00:00",
+    "semanas": {
+        "Semana 01": {
+            "encontros": {
+                "2026-03-26": {
+                    "student_activity_uuid": "enc-1",
+                    "titulo": "Instrução: Testes",
+                    "professor": "Fernando",
+                    "is_ponderada": False,
+                    "autoestudos": {
+                        "Ponderada: Testes": {
+                            "student_activity_uuid": "auto-1",
+                            "descricao": "Escreva testes",
+                            "professor": "Fernando",
+                            "is_ponderada": True,
+                            "avaliacao": {"peso": 2, "respondida": False, "nota": None},
+                        },
+                        "Leitura": {"student_activity_uuid": "auto-2", "is_ponderada": False},
+                    },
+                },
+            },
+            "sem_ancora": [
+                {
+                    "student_activity_uuid": "solto-1",
+                    "titulo": "Projeto",
+                    "is_ponderada": True,
+                    "avaliacao": {"peso": 5, "respondida": True, "nota": 8.0},
+                },
+            ],
+        },
+    },
+}
+
+
+class TestPrazo:
+    def test_prazo_e_sexta_da_semana_do_encontro(self):
+        assert calcular_prazo_ponderada("2026-03-26") == datetime(2026, 3, 27, 23, 59, 59)
+
+    def test_encontro_no_fim_de_semana_vai_para_proxima_sexta(self):
+        assert calcular_prazo_ponderada("2026-03-28") == datetime(2026, 4, 3, 23, 59, 59)
+
+    def test_sem_data(self):
+        assert calcular_prazo_ponderada("sem data") is None
+        assert calcular_prazo_ponderada("26/03/2026") is None
+
+
+class TestIndicePonderadas:
+    def test_lista_plana_com_uuid_e_prazo(self):
+        ponderadas = extrair_ponderadas(EXTRACAO)
+
+        assert [p["student_activity_uuid"] for p in ponderadas] == ["auto-1", "solto-1"]
+        auto = ponderadas[0]
+        assert auto["tipo"] == "autoestudo"
+        assert auto["encontro_titulo"] == "Instrução: Testes"
+        assert auto["descricao"] == "Escreva testes"
+        assert auto["prazo"] == "2026-03-27T23:59:59"
+        assert ponderadas[1]["data_encontro"] == "sem data"
+        assert ponderadas[1]["prazo"] is None
+
+    def test_salvar_e_carregar(self, tmp_path: Path):
+        gravadas = salvar_ponderadas(tmp_path, EXTRACAO)
+
+        assert carregar_ponderadas(tmp_path) == gravadas
+        data = json.loads((tmp_path / PONDERADAS_FILENAME).read_text(encoding="utf-8"))
+        assert data["extracao_timestamp"] == "2026-03-01T10:00:00"
+
+    def test_indice_ausente_ou_de_outra_versao(self, tmp_path: Path):
+        assert carregar_ponderadas(tmp_path) is None
+        (tmp_path / PONDERADAS_FILENAME).write_text(json.dumps({"versao": 0}), encoding="utf-8")
+        assert carregar_ponderadas(tmp_path) is None
+
+    def test_atualizar_avaliacoes_so_das_alteradas(self, tmp_path: Path):
+        salvar_ponderadas(tmp_path, EXTRACAO)
+        nova = {"peso": 2, "respondida": True, "nota": None}
+
+        assert atualizar_avaliacoes(tmp_path, {"auto-1": nova, "desconhecido": nova}) == 1
+        assert atualizar_avaliacoes(tmp_path, {"auto-1": nova}) == 0
+        assert carregar_ponderadas(tmp_path)[0]["avaliacao"] == nova
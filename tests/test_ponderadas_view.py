@@ -0,0 +1,97 @@
+"""Testes do viewer paginado de ponderadas (PonderadasView)."""
+
+import questionary
+
+from adalove_extractor.cli.ponderadas_view import (
+    ANTERIOR,
+    FILTRO_PENDENTES,
+    PROXIMA,
+    VOLTAR,
+    PonderadasView,
+)
+
+
+def _ponderadas(n: int) -> list:
+    return [
+        {
+            "titulo": f"P{i}",
+            "semana": f"Semana {i // 5 + 1:02d}",
+            "avaliacao": {"respondida": i % 2 == 0},
+        }
+        for i in range(n)
+    ]
+
+
+class Render:
+    def __init__(self):
+        self.chamadas = 0
+
+    def __call__(self, pond: dict) -> str:
+        self.chamadas += 1
+        return pond["titulo"]
+
+
+def _valores(choices: list) -> list:
+    return [c.value for c in choices if not isinstance(c, questionary.Separator)]
+
+
+def test_so_monta_rotulos_da_pagina_e_reaproveita_cache():
+    render = Render()
+    view = PonderadasView(_ponderadas(20), render, itens_por_pagina=8)
+
+    valores = _valores(view.choices())
+    assert valores[:8] == list(range(8))
+    assert PROXIMA in valores and ANTERIOR not in valores and VOLTAR in valores
+    assert render.chamadas == 8
+
+    view.choices()
+    assert render.chamadas == 8
+
+    view.atualizar(_ponderadas(20))
+    view.choices()
+    assert render.chamadas == 16
+
+
+def test_paginacao_limitada_nas_bordas():
+    view = PonderadasView(_ponderadas(20), Render(), itens_por_pagina=8)
+    assert view.total_paginas == 3
+
+    view.proxima()
+    view.proxima()
+    view.proxima()
+    assert view.pagina == 2
+    assert view.itens_pagina() == [16, 17, 18, 19]
+    assert PROXIMA not in _valores(view.choices())
+
+    view.anterior()
+    assert view.pagina == 1
+    assert "página 2/3" in view.resumo()
+
+
+def test_filtros_voltam_para_primeira_pagina():
+    view = PonderadasView(_ponderadas(20), Render(), itens_por_pagina=4)
+    view.proxima()
+
+    view.filtrar(pendentes=True)
+    assert view.pagina == 0
+    assert view.indices() == list(range(1, 20, 2))
+
+    view.filtrar(semana="Semana 02")
+    assert view.indices() == [5, 7, 9]
+    assert view.semanas() == ["Semana 01", "Semana 02", "Semana 03", "Semana 04"]
+    assert "só pendentes" in view.resumo() and "Semana 02" in view.resumo()
+
+    view.filtrar(semana=None)
+    assert view.somente_pendentes
+    assert len(view.indices()) == 10
+    assert FILTRO_PENDENTES in _valores(view.choices())
+
+
+def test_atualizar_mantem_pagina_valida():
+    view = PonderadasView(_ponderadas(20), Render(), itens_por_pagina=8)
+    view.proxima()
+    view.proxima()
+
+    view.atualizar(_ponderadas(5))
+    assert view.pagina == 0
+    assert view.itens_pagina() == [0, 1, 2, 3, 4]
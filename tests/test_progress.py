@@ -0,0 +1,145 @@
+"""Testes dos eventos de progresso em JSON lines (ProgressReporter)."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from adalove_extractor.extractors import turma_completa
+from adalove_extractor.io.progress import NULL_REPORTER, ProgressReporter
+
+
+def _ler_tudo(fd: int) -> list:
+    dados = b""
+    while True:
+        bloco = os.read(fd, 65536)
+        if not bloco:
+            break
+        dados += bloco
+    return [json.loads(linha) for linha in dados.decode("utf-8").splitlines()]
+
+
+class TestProgressReporter:
+    def test_eventos_de_turma_com_contagens_e_vazao(self, tmp_path: Path):
+        leitura, escrita = os.pipe()
+        arquivo = tmp_path / "semana_01.json"
+        arquivo.write_text("x" * 100, encoding="utf-8")
+
+        with ProgressReporter(escrita) as progresso:
+            turma = progresso.turma("T1")
+            turma.etapa("autenticacao")
+            turma.lote("Semana 01", atividades=4, total=10)
+            turma.lote("Semana 02", atividades=6, total=10)
+            turma.arquivo(arquivo)
+            turma.fim(sucesso=True)
+        os.close(escrita)
+
+        eventos = _ler_tudo(leitura)
+        os.close(leitura)
+        assert [e["evento"] for e in eventos] == ["etapa", "lote", "lote", "arquivo", "turma_fim"]
+        assert all(e["turma"] == "T1" for e in eventos)
+        assert eventos[2]["atividades_acumuladas"] == 10
+        assert eventos[2]["atividades_por_s"] > 0
+        assert eventos[3]["bytes"] == 100
+        assert eventos[4]["arquivos"] == 1 and eventos[4]["bytes"] == 100
+        assert all("decorrido_s" in e and "ts" in e for e in eventos)
+
+    def test_leitor_lento_nao_bloqueia_emit(self):
+        leitura, escrita = os.pipe()
+        progresso = ProgressReporter(escrita)
+
+        # Bem mais do que cabe no buffer do pipe, sem ninguém lendo
+        inicio = time.monotonic()
+        for i in range(5000):
+            progresso.emit("lote", turma="T1", indice=i, carga="x" * 100)
+        assert time.monotonic() - inicio < 1.0
+
+        lidos = []
+        leitor = threading.Thread(target=lambda: lidos.extend(_ler_tudo(leitura)))
+        leitor.start()
+        progresso.close()
+        os.close(escrita)
+        leitor.join(timeout=5)
+        os.close(leitura)
+        assert [e["indice"] for e in lidos] == list(range(5000))
+
+    def test_desativado_nao_emite(self, tmp_path: Path):
+        turma = NULL_REPORTER.turma("T1")
+        turma.etapa("autenticacao")
+        turma.arquivo(tmp_path / "inexistente.json")
+        turma.fim(sucesso=True)
+        assert not NULL_REPORTER.ativo
+
+    def test_pipe_fechado_pelo_leitor_nao_quebra(self):
+        leitura, escrita = os.pipe()
+        os.close(leitura)
+        progresso = ProgressReporter(escrita)
+        progresso.emit("etapa", turma="T1")
+        progresso.close()
+        os.close(escrita)
+
+
+async def test_extracao_sem_resultado_conta_como_falha(adalove_cli, monkeypatch, capsys):
+    cli = adalove_cli
+
+    class Client:
+        async def __aexit__(self, *args):
+            pass
+
+    async def sections():
+        return [{"caption": "T1"}, {"caption": "T2"}], Client()
+
+    async def extrair(nome, progresso=None):
+        return None if nome == "T2" else {"turma": nome}
+
+    class Eventos:
+        def __init__(self):
+            self.emitidos = []
+
+        def emit(self, evento, **campos):
+            self.emitidos.append({"evento": evento, **campos})
+
+    monkeypatch.setattr(cli, "_carregar_sections_via_api", sections)
+    monkeypatch.setattr(cli, "is_turma_extraida", lambda nome: False)
+    monkeypatch.setattr(turma_completa, "extrair_turma_completa", extrair)
+    progresso = Eventos()
+
+    with pytest.raises(SystemExit):
+        await cli._extrair_com_progresso(["T1", "T2"], False, False, False, 1, progresso)
+
+    fim = progresso.emitidos[-1]
+    assert fim["evento"] == "fim"
+    assert fim["sucesso"] == 1 and fim["falhas"] == ["T2"]
+    saida = capsys.readouterr()
+    assert "✅ T2" not in saida.out
+    assert "Concluído: 1/2" in saida.out
+
+
+class TestArgumentoProgressJson:
+    def test_fd_aberto_e_aceito(self, adalove_cli):
+        leitura, escrita = os.pipe()
+        try:
+            args, _ = adalove_cli._parse_args(["--extrair", "T1", "--progress-json", str(escrita)])
+            assert args.progress_json == escrita
+        finally:
+            os.close(leitura)
+            os.close(escrita)
+
+    @pytest.mark.parametrize("fd", ["1", "2"])
+    def test_stdout_e_stderr_sao_recusados(self, adalove_cli, capsys, fd):
+        with pytest.raises(SystemExit) as saida:
+            adalove_cli._parse_args(["--extrair", "T1", "--progress-json", fd])
+        assert saida.value.code == 2
+        assert ">= 3" in capsys.readouterr().err
+
+    def test_fd_fechado_vira_erro_de_uso(self, adalove_cli, capsys):
+        leitura, escrita = os.pipe()
+        os.close(leitura)
+        os.close(escrita)
+        with pytest.raises(SystemExit) as saida:
+            adalove_cli._parse_args(["--extrair", "T1", "--progress-json", str(escrita)])
+        assert saida.value.code == 2
+        assert "não está aberto" in capsys.readouterr().err
@@ -0,0 +1,143 @@
+"""
+Testes do lock entre processos do cache de token.
+
+Cobre o `FileLock` (espera, lock abandonado, timeout) e o protocolo do
+autenticador: com o cache vencido, só um "processo" faz login e os demais
+esperam e reaproveitam o token gravado por ele.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from adalove_extractor.api.auth import CognitoAuthenticator, parse_token_cache
+from adalove_extractor.utils.lock import FileLock
+from jwt_helpers import make_jwt
+
+
+def _pid_encerrado() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+class TestFileLock:
+    async def test_segundo_dono_espera_a_liberacao(self, tmp_path):
+        path = tmp_path / "x.lock"
+        primeiro = FileLock(path, poll_interval=0.01)
+        segundo = FileLock(path, poll_interval=0.01)
+        assert primeiro.try_acquire()
+
+        espera = asyncio.create_task(segundo.acquire())
+        await asyncio.sleep(0.05)
+        assert not espera.done()
+
+        primeiro.release()
+        await asyncio.wait_for(espera, timeout=1)
+        assert segundo.held
+        assert segundo.owner()["pid"] == os.getpid()
+        segundo.release()
+        assert not path.exists()
+
+    async def test_timeout(self, tmp_path):
+        path = tmp_path / "x.lock"
+        assert FileLock(path).try_acquire()
+        with pytest.raises(TimeoutError):
+            await FileLock(path, poll_interval=0.01).acquire(timeout=0.05)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="sondagem de PID só em POSIX")
+    def test_lock_de_processo_morto_e_tomado(self, tmp_path):
+        path = tmp_path / "x.lock"
+        dono = {"pid": _pid_encerrado(), "host": socket.gethostname(), "ts": time.time(), "id": "morto"}
+        path.write_text(json.dumps(dono))
+
+        lock = FileLock(path)
+        assert lock.try_acquire()
+        assert lock.owner()["pid"] == os.getpid()
+
+    def test_lock_antigo_demais_e_tomado(self, tmp_path):
+        path = tmp_path / "x.lock"
+        dono = {"pid": os.getpid(), "host": socket.gethostname(), "ts": time.time() - 120, "id": "velho"}
+        path.write_text(json.dumps(dono))
+
+        assert not FileLock(path, stale_after=600).try_acquire()
+        assert FileLock(path, stale_after=60).try_acquire()
+
+    def test_release_nao_remove_lock_alheio(self, tmp_path):
+        path = tmp_path / "x.lock"
+        lock = FileLock(path, stale_after=0)
+        assert lock.try_acquire()
+        time.sleep(0.01)
+        # Considerado abandonado, o lock foi tomado por outro dono
+        outro = FileLock(path, stale_after=0)
+        assert outro.try_acquire()
+
+        lock.release()
+        assert path.exists()
+        assert outro.owner()["id"] == outro._id
+
+
+async def test_so_um_processo_faz_login_e_os_demais_reaproveitam(tmp_path):
+    cache = tmp_path / ".token_cache"
+    cache.write_text(json.dumps({"access_token": make_jwt(-60)}))
+    novo = make_jwt(3600, marca="novo")
+    logins = []
+
+    def autenticador():
+        auth = CognitoAuthenticator(token_file=cache)
+
+        async def login_lento(login, senha, timeout_seconds):
+            logins.append(auth)
+            await asyncio.sleep(0.2)
+            auth.token = novo
+            auth.save_token(novo)
+            return novo
+
+        auth._perform_oauth_login = login_lento
+        return auth
+
+    processos = [autenticador() for _ in range(3)]
+    tokens = await asyncio.gather(*[a.authenticate_google_oauth("u", "s") for a in processos])
+
+    assert tokens == [novo] * 3
+    assert len(logins) == 1
+    assert not (tmp_path / ".token_cache.lock").exists()
+
+
+async def test_refresh_reaproveita_token_renovado_por_outro_processo(tmp_path):
+    cache = tmp_path / ".token_cache"
+    antigo = make_jwt(1800, marca="antigo")
+    cache.write_text(json.dumps({"access_token": antigo, "refresh_token": "r"}))
+    auth = CognitoAuthenticator(token_file=cache, token_endpoint="http://127.0.0.1:9/nao-usado")
+
+    # Outro processo renovou e gravou o cache; o endpoint nem é consultado
+    novo = make_jwt(3600, marca="novo")
+    cache.write_text(json.dumps({"access_token": novo, "refresh_token": "r"}))
+
+    assert await auth.refresh_access_token() == novo
+
+
+async def test_token_invalidado_nao_volta_do_cache(tmp_path):
+    cache = tmp_path / ".token_cache"
+    recusado = make_jwt(1800, marca="recusado")
+    novo = make_jwt(3600, marca="novo")
+    cache.write_text(json.dumps({"access_token": recusado}))
+    auth = CognitoAuthenticator(token_file=cache)
+    assert auth.token == recusado
+
+    async def login(login, senha, timeout_seconds):
+        auth.token = novo
+        auth.save_token(novo)
+        return novo
+
+    auth._perform_oauth_login = login
+    auth.invalidate_token()
+
+    assert await auth.authenticate_google_oauth("u", "s") == novo
+    assert parse_token_cache(cache.read_text())[0] == novo
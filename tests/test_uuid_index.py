@@ -0,0 +1,169 @@
+"""Testes do índice de UUIDs e das atualizações parciais por semana."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from adalove_extractor.extractors.api.anchor import organize_by_encontros
+from adalove_extractor.io.extraction_cache import ExtractionCache
+from adalove_extractor.io.uuid_index import (
+    INDEX_FILENAME,
+    PENDING_FILENAME,
+    ShardedExtraction,
+    construir_indice,
+    indexar_semana,
+    salvar_indice,
+)
+
+
+def _cards_semana():
+    return [
+        {
+            "student_activity_uuid": "enc-1",
+            "titulo": "Instrução: Testes",
+            "card_type": "encontro_instrucao",
+            "data_hora": "2026-03-26T07:00:00.000Z",
+            "professor": "Fernando",
+            "sort": 1,
+            "is_ponderada": False,
+        },
+        {
+            "student_activity_uuid": "auto-1",
+            "titulo": "Ponderada: Testes",
+            "card_type": "avaliacao",
+            "professor": "Fernando",
+            "sort": 2,
+            "is_ponderada": True,
+            "avaliacao": {"nota": None, "respondida": False},
+        },
+        {
+            "student_activity_uuid": "solto-1",
+            "titulo": "Leitura avulsa",
+            "card_type": "autoestudo",
+            "professor": "Outra",
+            "sort": 90,
+            "is_ponderada": True,
+            "avaliacao": {"nota": None, "respondida": False},
+        },
+    ]
+
+
+def _ler(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def turma_dir(tmp_path: Path) -> Path:
+    """Extração com duas semanas gravada como o extrator grava."""
+    turma_dir = tmp_path / "T1"
+    (turma_dir / "semanas").mkdir(parents=True)
+    extracao = {"turma": "T1", "extração_timestamp": "2026-03-01T10:00:00", "semanas": {}}
+    indice = {}
+    for semana in ("Semana 01", "Semana 02"):
+        organizada = organize_by_encontros(_cards_semana() if semana == "Semana 01" else [])
+        extracao["semanas"][semana] = organizada
+        indice.update(indexar_semana(semana, organizada))
+        shard = {"turma": "T1", "semana": semana, "extração_timestamp": "2026-03-01T10:00:00", **organizada}
+        (turma_dir / "semanas" / f"semana_0{semana[-1]}.json").write_text(json.dumps(shard), encoding="utf-8")
+    (turma_dir / "extracao_completa.json").write_text(json.dumps(extracao), encoding="utf-8")
+    salvar_indice(turma_dir, indice, extracao["extração_timestamp"])
+    return turma_dir
+
+
+def _avaliar(uuid, no):
+    if no["avaliacao"].get("nota") == 9.0:
+        return False
+    no["avaliacao"] = {"nota": 9.0, "respondida": True}
+    return True
+
+
+class TestIndice:
+    def test_organize_preserva_uuid_em_encontros_e_autoestudos(self):
+        organizada = organize_by_encontros(_cards_semana())
+        encontro = organizada["encontros"]["2026-03-26"]
+
+        assert encontro["student_activity_uuid"] == "enc-1"
+        assert encontro["autoestudos"]["Ponderada: Testes"]["student_activity_uuid"] == "auto-1"
+
+    def test_indice_aponta_semana_arquivo_e_caminho(self):
+        indice = indexar_semana("Semana 01", organize_by_encontros(_cards_semana()))
+
+        assert indice["auto-1"] == {
+            "semana": "Semana 01",
+            "arquivo": "semanas/semana_01.json",
+            "caminho": ["encontros", "2026-03-26", "autoestudos", "Ponderada: Testes"],
+            "ponderada": True,
+        }
+        assert indice["solto-1"]["caminho"] == ["sem_ancora", 0]
+        assert indice["enc-1"]["ponderada"] is False
+
+    def test_indice_ausente_e_reconstruido_da_extracao(self, turma_dir):
+        esperado = _ler(turma_dir / INDEX_FILENAME)["atividades"]
+        (turma_dir / INDEX_FILENAME).unlink()
+
+        assert ShardedExtraction(turma_dir).indice() == esperado
+        assert (turma_dir / INDEX_FILENAME).exists()
+        assert construir_indice(_ler(turma_dir / "extracao_completa.json")) == esperado
+
+
+class TestAtualizacaoParcial:
+    def test_regrava_so_o_shard_afetado(self, turma_dir):
+        consolidada_antes = (turma_dir / "extracao_completa.json").read_bytes()
+        semana_02_antes = (turma_dir / "semanas" / "semana_02.json").read_bytes()
+
+        alteradas = ShardedExtraction(turma_dir).aplicar(_avaliar, ["auto-1", "desconhecido"])
+
+        assert alteradas == 1
+        shard = _ler(turma_dir / "semanas" / "semana_01.json")
+        assert shard["encontros"]["2026-03-26"]["autoestudos"]["Ponderada: Testes"]["avaliacao"]["nota"] == 9.0
+        assert (turma_dir / "semanas" / "semana_02.json").read_bytes() == semana_02_antes
+        assert (turma_dir / "extracao_completa.json").read_bytes() == consolidada_antes
+        assert _ler(turma_dir / PENDING_FILENAME) == {"semanas": ["Semana 01"]}
+
+    def test_sem_mudanca_nao_grava_nada(self, turma_dir):
+        ShardedExtraction(turma_dir).aplicar(_avaliar, ["solto-1"])
+        (turma_dir / PENDING_FILENAME).unlink()
+        shard_antes = (turma_dir / "semanas" / "semana_01.json").read_bytes()
+
+        assert ShardedExtraction(turma_dir).aplicar(_avaliar, ["solto-1"]) == 0
+        assert (turma_dir / "semanas" / "semana_01.json").read_bytes() == shard_antes
+        assert not (turma_dir / PENDING_FILENAME).exists()
+
+    def test_leitura_sem_persistir_nao_regrava(self, turma_dir):
+        ShardedExtraction(turma_dir).aplicar(_avaliar, ["solto-1"])
+        consolidada_antes = (turma_dir / "extracao_completa.json").read_bytes()
+
+        data = ShardedExtraction(turma_dir).carregar(persistir=False)
+
+        assert data["semanas"]["Semana 01"]["sem_ancora"][0]["avaliacao"]["nota"] == 9.0
+        assert "turma" not in data["semanas"]["Semana 01"]
+        assert (turma_dir / "extracao_completa.json").read_bytes() == consolidada_antes
+        assert (turma_dir / PENDING_FILENAME).exists()
+
+    def test_shard_ilegivel_continua_pendente(self, turma_dir):
+        # Semana 01 atualizada normalmente; Semana 02 marcada mas com o shard corrompido
+        ShardedExtraction(turma_dir).aplicar(_avaliar, ["auto-1"])
+        (turma_dir / PENDING_FILENAME).write_text(json.dumps({"semanas": ["Semana 01", "Semana 02"]}))
+        (turma_dir / "semanas" / "semana_02.json").write_text("{corrompido", encoding="utf-8")
+
+        data = ShardedExtraction(turma_dir).carregar(persistir=True)
+
+        autoestudo = data["semanas"]["Semana 01"]["encontros"]["2026-03-26"]["autoestudos"]["Ponderada: Testes"]
+        assert autoestudo["avaliacao"]["nota"] == 9.0
+        assert _ler(turma_dir / PENDING_FILENAME) == {"semanas": ["Semana 02"]}
+
+    def test_consolidacao_preguicosa_com_cache(self, turma_dir):
+        cache = ExtractionCache()
+        extracao = ShardedExtraction(turma_dir, cache=cache)
+        extracao.carregar()
+        extracao.aplicar(_avaliar, ["auto-1"])
+
+        data = extracao.carregar()
+
+        autoestudo = data["semanas"]["Semana 01"]["encontros"]["2026-03-26"]["autoestudos"]["Ponderada: Testes"]
+        assert autoestudo["avaliacao"]["nota"] == 9.0
+        assert _ler(turma_dir / "extracao_completa.json") == data
+        assert not (turma_dir / PENDING_FILENAME).exists()
+        assert cache.load(turma_dir / "extracao_completa.json") is data
+        assert not extracao.consolidar()
@@ -0,0 +1,139 @@
+"""Testes do modo watch (ChangeWatcher)."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from adalove_extractor.api.endpoints import Endpoints
+from adalove_extractor.extractors.watch import ChangeWatcher
+
+
+def _atividade(uuid: str, **extra) -> dict:
+    return {
+        "studentActivityUuid": uuid,
+        "caption": f"Atividade {uuid}",
+        "folderCaption": "Semana 01",
+        "date": "2026-03-26T07:00:00.000Z",
+        "gradeResult": "-1.0",
+        "gradeWeight": 0,
+        "blocked": 0,
+        "evaluated": 0,
+        "studyAnswer": "",
+        **extra,
+    }
+
+
+class FakeClient:
+    def __init__(self):
+        self.activities = [_atividade("a1"), _atividade("a2", gradeWeight=3, blocked=1)]
+        self.notificacoes = [{"id": 1, "texto": "antiga"}]
+        self.falhar = False
+        self.chamadas = []
+        self.em_voo = 0
+        self.max_em_voo = 0
+
+    async def get(self, endpoint):
+        self.chamadas.append(endpoint)
+        if self.falhar:
+            raise RuntimeError("API fora do ar")
+        if endpoint == Endpoints.NOTIFICATIONS:
+            return {"notifications": self.notificacoes}
+        if endpoint.startswith("/student-activities/"):
+            self.em_voo += 1
+            self.max_em_voo = max(self.max_em_voo, self.em_voo)
+            await asyncio.sleep(0.01)
+            self.em_voo -= 1
+            return {"contents": [{"caption": "Slides", "reference": "https://x"}]}
+        return {"activities": self.activities}
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+def _watcher(client, tmp_path: Path, eventos: list) -> ChangeWatcher:
+    return ChangeWatcher(client, {"T1": "sec-1"}, tmp_path, intervalo=60, jitter=0.1, emitir=eventos.append)
+
+
+async def test_primeiro_ciclo_so_registra_linha_de_base(client, tmp_path):
+    eventos = []
+    await _watcher(client, tmp_path, eventos).ciclo()
+
+    assert [e["evento"] for e in eventos] == ["inicio"]
+    assert eventos[0]["atividades"] == 2
+    assert (tmp_path / "watch_state.json").exists()
+
+
+async def test_sem_mudancas_custa_uma_requisicao_por_turma(client, tmp_path):
+    await _watcher(client, tmp_path, []).ciclo()
+    client.chamadas.clear()
+
+    eventos = []
+    await _watcher(client, tmp_path, eventos).ciclo()
+
+    assert eventos == []
+    assert sorted(client.chamadas) == sorted([Endpoints.section_userdata("sec-1"), Endpoints.NOTIFICATIONS])
+
+
+async def test_mudancas_geram_eventos_e_buscam_detalhes_so_das_alteradas(client, tmp_path):
+    eventos = []
+    watcher = _watcher(client, tmp_path, eventos)
+    await watcher.ciclo()
+    eventos.clear()
+    client.chamadas.clear()
+
+    client.activities = [
+        _atividade("a2", gradeWeight=3, blocked=0, gradeResult="8.5", studyAnswer="feito"),
+        _atividade("a3"),
+    ]
+    client.notificacoes.append({"id": 2, "texto": "nova"})
+    await watcher.ciclo()
+
+    tipos = sorted(e["evento"] for e in eventos)
+    assert tipos == sorted([
+        "atividade_alterada", "nota_publicada", "resposta_registrada", "desbloqueada",
+        "nova_atividade", "atividade_removida", "notificacao",
+    ])
+    alterada = next(e for e in eventos if e["evento"] == "atividade_alterada")
+    assert alterada["campos"] == ["bloqueada", "nota", "respondida"]
+    assert alterada["conteudos"] == [{"titulo": "Slides", "url": "https://x"}]
+    assert next(e for e in eventos if e["evento"] == "nota_publicada")["nota"] == 8.5
+    assert next(e for e in eventos if e["evento"] == "notificacao")["id"] == "2"
+
+    detalhes = [c for c in client.chamadas if c.startswith("/student-activities/")]
+    assert sorted(detalhes) == sorted([Endpoints.student_activity_data("a2"), Endpoints.student_activity_data("a3")])
+
+
+async def test_busca_de_detalhes_tem_concorrencia_limitada(client, tmp_path):
+    watcher = ChangeWatcher(client, {"T1": "sec-1"}, tmp_path, emitir=[].append, detalhes_paralelo=3)
+    await watcher.ciclo()
+    client.chamadas.clear()
+
+    client.activities = [_atividade(f"n{i}") for i in range(20)]
+    await watcher.ciclo()
+
+    assert len([c for c in client.chamadas if c.startswith("/student-activities/")]) == 20
+    assert client.max_em_voo == 3
+
+
+async def test_falhas_aumentam_intervalo_ate_o_teto(client, tmp_path):
+    eventos = []
+    watcher = _watcher(client, tmp_path, eventos)
+    client.falhar = True
+
+    await watcher.ciclo()
+    await watcher.ciclo()
+
+    assert {e["evento"] for e in eventos} == {"erro"}
+    assert watcher.falhas_consecutivas == 2
+    assert 216 <= watcher.proximo_intervalo() <= 264
+
+    watcher.falhas_consecutivas = 20
+    assert watcher.proximo_intervalo() <= watcher.backoff_max * 1.1
+
+    client.falhar = False
+    await watcher.ciclo()
+    assert watcher.falhas_consecutivas == 0
+    assert 54 <= watcher.proximo_intervalo() <= 66
@@ -0,0 +1,56 @@
+"""Testes unitários para AnswerCache."""
+
+import os
+
+from adalove_extractor.ai.answer_cache import AnswerCache, cache_key, generator_config
+
+
+def test_key_depends_on_prompts_and_generator():
+    base = cache_key("sys", "user", generator_config(["claude", "-p"]))
+
+    assert base == cache_key("sys", "user", generator_config(["claude", "-p"]))
+    assert base != cache_key("sys2", "user", generator_config(["claude", "-p"]))
+    assert base != cache_key("sys", "user2", generator_config(["claude", "-p"]))
+    assert base != cache_key("sys", "user", generator_config(["outro", "-p"]))
+
+
+def test_get_put_and_hit_rate(tmp_path):
+    cache = AnswerCache(tmp_path / "cache")
+    chave = cache_key("s", "u", {})
+
+    assert cache.get(chave) is None
+    cache.put(chave, "texto gerado", titulo="Esqueleto")
+
+    # Outra sessão lê a mesma entrada do disco
+    outro = AnswerCache(tmp_path / "cache")
+    assert outro.get(chave) == "texto gerado"
+    assert (outro.hits, outro.misses) == (1, 0)
+    assert cache.hit_rate == 0.0
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = AnswerCache(tmp_path, max_entries=2)
+    chaves = [cache_key("s", str(i), {}) for i in range(3)]
+
+    cache.put(chaves[0], "zero")
+    cache.put(chaves[1], "um")
+    # Envelhece as duas entradas e usa a primeira: a segunda vira a menos recente
+    for i, chave in enumerate(chaves[:2]):
+        os.utime(tmp_path / f"{chave}.json", (1000 + i, 1000 + i))
+    assert cache.get(chaves[0]) == "zero"
+
+    cache.put(chaves[2], "dois")
+
+    assert cache.get(chaves[1]) is None
+    assert cache.get(chaves[0]) == "zero"
+    assert cache.get(chaves[2]) == "dois"
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = AnswerCache(tmp_path)
+    chave = cache_key("s", "u", {})
+    (tmp_path / f"{chave}.json").write_text("{quebrado", encoding="utf-8")
+
+    assert cache.get(chave) is None
+    cache.put(chave, "novo")
+    assert cache.get(chave) == "novo"
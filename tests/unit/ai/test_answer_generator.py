@@ -1,4 +1,8 @@
-"""Testes unitários para AnswerGenerator (subprocess mockado)."""
+"""Testes unitários para AnswerGenerator (subprocess mockado / executável falso)."""
+
+import asyncio
+import sys
+import time
 
 import pytest
 from unittest.mock import patch, MagicMock
@@ -67,3 +71,92 @@ def test_generate_passes_system_prompt_in_call():
 
     full_cmd = " ".join(str(x) for x in captured["args"][0])
     assert "SISTEMA_ESPECIAL" in full_cmd
+
+
+# ---------------------------------------------------------------------------
+# Async (executável falso local)
+# ---------------------------------------------------------------------------
+
+
+def _fake_cli(tmp_path, script: str) -> list:
+    """Comando que roda um script Python no lugar do claude CLI (prompt em argv[-1])."""
+    path = tmp_path / "fake_claude.py"
+    path.write_text(script, encoding="utf-8")
+    return [sys.executable, str(path)]
+
+
+ECO_EM_PEDACOS = """
+import sys, time
+for parte in ["Olá, ", "mundo", " — ", sys.argv[-1][:8], "\\n"]:
+    sys.stdout.write(parte)
+    sys.stdout.flush()
+    time.sleep(0.05)
+"""
+
+
+async def test_generate_async_streams_chunks(tmp_path):
+    gen = AnswerGenerator(command=_fake_cli(tmp_path, ECO_EM_PEDACOS))
+    parciais = []
+
+    result = await gen.generate_async(user_prompt="u", system_prompt="s", on_chunk=parciais.append)
+
+    assert result == "Olá, mundo — <system>"
+    assert len(parciais) > 1
+    assert parciais[0] != result
+
+
+async def test_generate_async_raises_on_nonzero_returncode(tmp_path):
+    cmd = _fake_cli(tmp_path, "import sys\nsys.stderr.write('Error: auth')\nsys.exit(3)\n")
+    gen = AnswerGenerator(command=cmd)
+
+    with pytest.raises(RuntimeError, match="código 3: Error: auth"):
+        await gen.generate_async(user_prompt="p", system_prompt="s")
+
+
+async def test_generate_async_raises_claude_not_found(tmp_path):
+    gen = AnswerGenerator(command=[str(tmp_path / "nao-existe")])
+
+    with pytest.raises(ClaudeNotFoundError):
+        await gen.generate_async(user_prompt="p", system_prompt="s")
+
+
+async def test_generate_async_timeout_kills_process(tmp_path):
+    gen = AnswerGenerator(timeout=0.3, command=_fake_cli(tmp_path, "import time\ntime.sleep(30)\n"))
+
+    inicio = time.monotonic()
+    with pytest.raises(RuntimeError, match="tempo limite"):
+        await gen.generate_async(user_prompt="p", system_prompt="s")
+    assert time.monotonic() - inicio < 5
+
+
+async def test_cancel_stops_generation(tmp_path):
+    gen = AnswerGenerator(command=_fake_cli(tmp_path, "import time\ntime.sleep(30)\n"))
+
+    task = asyncio.create_task(gen.generate_async(user_prompt="p", system_prompt="s"))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    # O slot do semáforo foi liberado
+    assert not gen.semaphore.locked()
+
+
+async def test_concurrent_generations_are_bounded(tmp_path):
+    script = """
+import os, sys, time
+marca = os.path.join(sys.argv[1], str(os.getpid()))
+open(marca, "w").close()
+time.sleep(0.2)
+ativos = len(os.listdir(sys.argv[1]))
+os.remove(marca)
+print(ativos)
+"""
+    pasta = tmp_path / "ativos"
+    pasta.mkdir()
+    gen = AnswerGenerator(command=[*_fake_cli(tmp_path, script), str(pasta)], max_concurrent=2)
+
+    results = await asyncio.gather(
+        *[gen.generate_async(user_prompt="p", system_prompt="s") for _ in range(5)]
+    )
+
+    assert max(int(r) for r in results) <= 2
@@ -0,0 +1,112 @@
+"""Testes unitários da geração de rascunhos em lote."""
+
+import asyncio
+import json
+
+import pytest
+
+from adalove_extractor.ai.answer_generator import ClaudeNotFoundError
+from adalove_extractor.ai.batch import CONCLUIDO, ERRO, JobLedger, gerar_rascunhos, job_id
+
+
+class FakeGenerator:
+    command = ["fake"]
+
+    def __init__(self, falhar_em=None, ausente=False):
+        self.chamadas = []
+        self.em_voo = 0
+        self.max_em_voo = 0
+        self.falhar_em = falhar_em
+        self.ausente = ausente
+
+    async def generate_async(self, user_prompt, system_prompt, on_chunk=None):
+        if self.ausente:
+            raise ClaudeNotFoundError("não instalado")
+        self.em_voo += 1
+        self.max_em_voo = max(self.max_em_voo, self.em_voo)
+        await asyncio.sleep(0.01)
+        self.em_voo -= 1
+        esqueleto = "APENAS o **esqueleto" in user_prompt
+        self.chamadas.append("esqueleto" if esqueleto else "resposta")
+        if self.falhar_em and self.falhar_em in user_prompt and not esqueleto:
+            raise RuntimeError("claude CLI retornou código 1: erro")
+        return "esqueleto gerado" if esqueleto else "resposta gerada"
+
+
+def _jobs(n: int) -> list:
+    return [
+        {"turma": "T1", "ponderada": {
+            "titulo": f"Ponderada {i}",
+            "semana": "Semana 01",
+            "data_encontro": "2026-03-26",
+            "student_activity_uuid": f"uuid-{i}",
+            "avaliacao": {"peso": 3, "pergunta": f"Pergunta {i}?"},
+        }}
+        for i in range(n)
+    ]
+
+
+def _rodar(jobs, generator, ledger, salvos, concorrencia=3):
+    def salvar(turma, pond, resposta):
+        salvos.append((turma, pond["titulo"], resposta))
+        return f"/tmp/{pond['titulo']}.md"
+
+    return gerar_rascunhos(
+        jobs,
+        carregar_extracao=lambda turma: {"semanas": {}},
+        salvar=salvar,
+        generator=generator,
+        system_prompt="sys",
+        ledger=ledger,
+        concorrencia=concorrencia,
+    )
+
+
+async def test_gera_em_paralelo_e_registra_no_ledger(tmp_path):
+    gen = FakeGenerator()
+    ledger = JobLedger(tmp_path / "lote.jsonl")
+    salvos = []
+
+    contagem = await _rodar(_jobs(6), gen, ledger, salvos)
+
+    assert contagem == {"concluidos": 6, "pulados": 0, "erros": 0}
+    assert len(salvos) == 6 and all(r == "resposta gerada" for _, _, r in salvos)
+    assert 1 < gen.max_em_voo <= 3
+    linhas = [json.loads(l) for l in (tmp_path / "lote.jsonl").read_text().splitlines()]
+    assert sum(1 for l in linhas if l["estado"] == CONCLUIDO) == 6
+
+
+async def test_retoma_lote_interrompido(tmp_path):
+    jobs = _jobs(3)
+    caminho = tmp_path / "lote.jsonl"
+    ledger = JobLedger(caminho)
+    ledger.registrar(job_id("T1", jobs[0]["ponderada"]), CONCLUIDO, rascunho="/tmp/p0.md")
+    ledger.registrar(job_id("T1", jobs[1]["ponderada"]), "esqueleto", esqueleto="esqueleto salvo")
+    # Linha cortada por uma interrupção no meio da escrita
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write('{"job": "T1:uuid-2", "est')
+
+    gen = FakeGenerator()
+    salvos = []
+    contagem = await _rodar(jobs, gen, JobLedger(caminho), salvos)
+
+    assert contagem == {"concluidos": 2, "pulados": 1, "erros": 0}
+    # Job 1 reaproveitou o esqueleto; job 2 gerou os dois
+    assert sorted(gen.chamadas) == ["esqueleto", "resposta", "resposta"]
+
+
+async def test_erro_em_um_job_nao_para_o_lote(tmp_path):
+    gen = FakeGenerator(falhar_em="Pergunta 1?")
+    ledger = JobLedger(tmp_path / "lote.jsonl")
+
+    contagem = await _rodar(_jobs(3), gen, ledger, [])
+
+    assert contagem == {"concluidos": 2, "pulados": 0, "erros": 1}
+    estado = JobLedger(tmp_path / "lote.jsonl").estado("T1:uuid-1")
+    assert estado["estado"] == ERRO
+    assert estado["esqueleto"] == "esqueleto gerado"
+
+
+async def test_gerador_ausente_aborta(tmp_path):
+    with pytest.raises(ClaudeNotFoundError):
+        await _rodar(_jobs(3), FakeGenerator(ausente=True), JobLedger(tmp_path / "lote.jsonl"), [])
@@ -86,3 +86,38 @@ def test_build_skeleton_mode_requests_structure_only():
     builder = ContextBuilder()
     skeleton = builder.build(POND_FIXTURE, EXTRACAO_FIXTURE, skeleton_mode=True)
     assert "esqueleto" in skeleton.lower() or "estrutura" in skeleton.lower()
+
+
+def _transcricao_longa() -> str:
+    paragrafos = [f"Parágrafo {i} sobre assuntos gerais de organização da turma e avisos." for i in range(60)]
+    paragrafos[42] = "O professor mostrou como o FastAPI implementa um CRUD com rotas e Pydantic."
+    return "\n\n".join(paragrafos)
+
+
+def test_build_sem_orcamento_inclui_transcricao_inteira():
+    builder = ContextBuilder(budget_chars=None)
+    transcript = _transcricao_longa()
+    result = builder.build(POND_FIXTURE, EXTRACAO_FIXTURE, transcript=transcript)
+    assert transcript in result
+
+
+def test_build_respeita_orcamento_com_trechos_mais_relevantes():
+    builder = ContextBuilder(budget_chars=1500, chunk_chars=200)
+    result = builder.build(POND_FIXTURE, EXTRACAO_FIXTURE, transcript=_transcricao_longa())
+
+    assert len(result) <= 1500
+    assert "FastAPI implementa um CRUD" in result
+    assert "Como você implementaria um CRUD com FastAPI?" in result
+    assert "[...]" in result
+    incluidos, total = builder.last_stats["trechos_transcricao"]
+    assert 0 < incluidos < total
+    assert builder.last_stats["chars"] == len(result)
+    assert builder.last_stats["tokens_estimados"] == len(result) // 4
+
+
+def test_build_transcricao_curta_entra_inteira_mesmo_com_orcamento():
+    builder = ContextBuilder(budget_chars=5000)
+    transcript = "Primeira parte.\n\nSegunda parte."
+    result = builder.build(POND_FIXTURE, EXTRACAO_FIXTURE, transcript=transcript)
+    assert transcript in result
+    assert builder.last_stats["trechos_transcricao"] == (1, 1)
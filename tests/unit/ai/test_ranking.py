@@ -0,0 +1,35 @@
+"""Testes unitários do ranqueamento BM25 de trechos."""
+
+from adalove_extractor.ai.ranking import BM25, dividir_trechos, ranquear, tokenizar
+
+
+def test_tokenizar_remove_acentos_e_stopwords():
+    assert tokenizar("A validação de dados com Pydantic é simples") == [
+        "validacao", "dados", "pydantic", "simples",
+    ]
+
+
+def test_dividir_trechos_agrupa_paragrafos_e_quebra_os_longos():
+    texto = "curto um.\n\ncurto dois.\n\n" + "Frase longa demais. " * 20
+    trechos = dividir_trechos(texto, max_chars=100)
+
+    assert trechos[0].startswith("curto um.\ncurto dois.\nFrase longa demais.")
+    assert len(trechos) > 1
+    assert all(len(t) <= 100 for t in trechos)
+    assert "".join(trechos).count("Frase longa demais.") == 20
+
+
+def test_bm25_prefere_documento_com_termo_raro():
+    docs = [tokenizar(t) for t in ["aula sobre banco de dados", "fastapi usa pydantic", "aula sobre git"]]
+    pontuacoes = BM25(docs).pontuar(tokenizar("Como o FastAPI valida com Pydantic?"))
+
+    assert pontuacoes[1] > 0
+    assert pontuacoes[0] == pontuacoes[2] == 0
+
+
+def test_ranquear_mantem_ordem_original_nos_empates():
+    textos = ["nada relevante", "rotas do fastapi", "outra coisa", "fastapi e pydantic no fastapi"]
+    ordem = [i for i, _ in ranquear(textos, "fastapi pydantic")]
+
+    assert ordem[:2] == [3, 1]
+    assert ordem[2:] == [0, 2]
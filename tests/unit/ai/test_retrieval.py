@@ -0,0 +1,101 @@
+"""Testes unitários do índice de busca local (RetrievalIndex)."""
+
+import json
+import os
+from pathlib import Path
+
+from adalove_extractor.ai.context_builder import ContextBuilder
+from adalove_extractor.ai.retrieval import INDEX_DIRNAME, RetrievalIndex, abrir_indice
+
+
+def _gravar_extracao(output_dir: Path, slug: str, encontros: dict) -> Path:
+    turma_dir = output_dir / slug
+    turma_dir.mkdir(parents=True, exist_ok=True)
+    extracao = {"turma": slug, "semanas": {"Semana 01": {"encontros": encontros, "sem_ancora": []}}}
+    path = turma_dir / "extracao_completa.json"
+    path.write_text(json.dumps(extracao), encoding="utf-8")
+    return path
+
+
+def _encontro(titulo: str, autoestudos: dict) -> dict:
+    return {"titulo": titulo, "tipo": "encontro_instrucao", "autoestudos": autoestudos}
+
+
+def _auto(uuid: str, descricao: str, **extra) -> dict:
+    return {"student_activity_uuid": uuid, "descricao": descricao, **extra}
+
+
+def _output(tmp_path: Path) -> Path:
+    output_dir = tmp_path / "api_extraction"
+    _gravar_extracao(output_dir, "T1", {
+        "2026-03-02": _encontro("Introdução a testes", {
+            "Pytest na prática": _auto("t1-a", "Escrevendo testes unitários com pytest e fixtures",
+                                       assuntos_relacionados=["Testes automatizados"],
+                                       conteudos_relacionados=["https://docs.pytest.org"]),
+            "Git básico": _auto("t1-b", "Commits, branches e merge"),
+        }),
+    })
+    _gravar_extracao(output_dir, "T2", {
+        "2026-04-10": _encontro("Banco de dados", {
+            "Modelagem relacional": _auto("t2-a", "Chaves estrangeiras e normalização"),
+        }),
+    })
+    return output_dir
+
+
+def test_busca_retorna_documentos_relevantes_de_todas_as_turmas(tmp_path):
+    output_dir = _output(tmp_path)
+    with abrir_indice(output_dir) as indice:
+        resultados = indice.buscar("como usar fixtures do pytest", k=2)
+        assert resultados[0][0]["titulo"] == "Pytest na prática"
+        assert resultados[0][0]["links"] == ["https://docs.pytest.org"]
+
+        banco = indice.buscar("normalização de tabelas", k=1)
+        assert banco[0][0]["turma"] == "T2"
+
+        assert indice.buscar("pytest", excluir={"t1-a"}) == []
+        assert indice.buscar("termo inexistente") == []
+
+
+def test_atualizacao_incremental_so_reindexa_turmas_alteradas(tmp_path):
+    output_dir = _output(tmp_path)
+    indice = RetrievalIndex(output_dir / INDEX_DIRNAME)
+    assert indice.atualizar(output_dir) is True
+    assert indice.atualizar(output_dir) is False
+
+    cache_t2 = output_dir / INDEX_DIRNAME / "turmas" / "T2.json"
+    mtime_t2 = cache_t2.stat().st_mtime_ns
+
+    path = _gravar_extracao(output_dir, "T1", {
+        "2026-03-02": _encontro("Introdução a testes", {
+            "Docker": _auto("t1-c", "Containers e imagens com Docker"),
+        }),
+    })
+    os.utime(path, ns=(1, 1))
+    assert indice.atualizar(output_dir) is True
+
+    assert cache_t2.stat().st_mtime_ns == mtime_t2
+    assert indice.buscar("docker containers")[0][0]["uuid"] == "t1-c"
+    assert indice.buscar("pytest") == []
+    # Só a geração atual fica no disco
+    assert len(list((output_dir / INDEX_DIRNAME).glob("postings.*.bin"))) == 1
+    indice.close()
+
+
+def test_context_builder_inclui_material_relacionado(tmp_path):
+    output_dir = _output(tmp_path)
+    pond = {
+        "titulo": "Ponderada de testes",
+        "semana": "Semana 05",
+        "data_encontro": "2026-05-01",
+        "student_activity_uuid": "pond-1",
+        "avaliacao": {"pergunta": "Escreva testes unitários com pytest para a API", "peso": 3},
+    }
+    with abrir_indice(output_dir) as indice:
+        builder = ContextBuilder(retriever=indice, retrieval_k=2)
+        prompt = builder.build(pond, {"semanas": {}})
+
+    assert "MATERIAIS RELACIONADOS" in prompt
+    assert "### Pytest na prática" in prompt
+    assert "_T1 · Semana 01_" in prompt
+    assert builder.last_stats["relacionados"] >= 1